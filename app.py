@@ -1,6 +1,6 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import os, datetime, json, logging, asyncio
+import os, datetime, json, logging, asyncio, threading, atexit
 from werkzeug.exceptions import BadRequest
 
 
@@ -17,13 +17,22 @@ from graphiti_client import (
     add_episode, 
     search_graph, 
     get_temporal_context,
+    decode_history_cursor,
+    get_group_stats,
+    resolve_group_id,
+    ensure_graphiti_schema,
+    GroupIdValidationError,
     GRAPHITI_AVAILABLE
 )
 from crawl4ai_source import (
+    CrawlBatchRequest,
     CrawlJobManager,
     CrawlJobRequest,
     CrawlJobResponse,
-    CrawlStatus
+    CrawlStatus,
+    SitemapError,
+    decode_job_cursor,
+    encode_job_cursor
 )
 # - Output folder is consistent for audit and onboarding
 # - Logging is enabled for production safety
@@ -35,7 +44,12 @@ os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 # Initialize CrawlJobManager with Supabase client
 from supabase_client import supabase as supabase_client
-crawl_manager = CrawlJobManager(supabase_client)
+crawl_manager = CrawlJobManager(supabase_client, max_concurrent_jobs=int(os.getenv("CRAWL4AI_MAX_CONCURRENT_JOBS", "5")))
+atexit.register(crawl_manager.shutdown)
+_services_lock = threading.Lock()
+_services_started = False
+CRAWL_BATCH_MAX_URLS = int(os.getenv("CRAWL4AI_BATCH_MAX_URLS", "50000"))
+GRAPHITI_EAGER_SCHEMA_INIT = os.getenv("GRAPHITI_EAGER_SCHEMA_INIT", "true").lower() == "true"
 
 # Configuration directory for bootstrap files (can be mounted as a Docker volume)
 # Default is /data/application but can be overridden with the RAGFLOW_CONFIG_DIR env var.
@@ -155,7 +169,7 @@ def log_output(filename, content):
 
 # Helper to determine the 'app' context from a request:
 def get_app_context_from_request(req) -> str | None:
-    # Priority: X-APP header -> JSON body 'app' -> query param 'app'
+    # Priority: X-APP header -> JSON body 'app' -> form field 'app' -> query param 'app'
     app = req.headers.get("X-APP")
     if app:
         return app
@@ -165,9 +179,16 @@ def get_app_context_from_request(req) -> str | None:
             return j.get("app")
     except Exception:
         pass
-    app = req.args.get("app")
+    app = req.form.get("app") or req.args.get("app")
     return app
 
+def get_graph_group_id(req) -> str | None:
+    # Each app context gets its own Graphiti partition (group_id)
+    try:
+        return resolve_group_id(get_app_context_from_request(req))
+    except GroupIdValidationError as e:
+        raise BadRequest(f"Invalid app context for graph partition: {e}")
+
 # Health check endpoint with LLM provider information
 @app.route("/health", methods=["GET"])
 def health_check():
@@ -206,23 +227,23 @@ def config_view():
         return jsonify({"configs": {}, "message": "No config files found for the provided context."})
     return jsonify({"configs": configs})
 
-# Ollama embedding function (scaffold)
-def get_embedding_ollama(text, model="nomic-embed-text"):
-    """Get embeddings from Ollama API."""
+def embed_text(text):
+    """
+    Embed text with the configured embeddings provider (the one reembed_backfill.py uses).
+
+    Returns:
+        (embedding, "provider:model" tag of the model that produced it); the tag is
+        None for the hash fallback used when the provider fails, so such vectors are
+        never matched against real ones
+    """
     try:
-        import requests
-        ollama_host = os.getenv("OLLAMA_HOST", "http://host.docker.internal:11434")
-        response = requests.post(
-            f"{ollama_host}/api/embeddings",
-            json={"model": model, "prompt": text},
-            timeout=30
-        )
-        response.raise_for_status()
-        return response.json()["embedding"]
+        from llm_provider import embed_texts, llm_config
+        config = llm_config.get_embeddings_config()
+        return embed_texts([text], config)[0], llm_config.get_embedding_model_version(config)
     except Exception as e:
-        logging.error(f"Ollama embedding error: {e}")
-        # Fallback to fake embedding if Ollama fails
-        return [hash(word) % 1000 for word in text.lower().split()][:128]
+        logging.error(f"Embedding error: {e}")
+        # Fallback to fake embedding if the provider fails
+        return [hash(word) % 1000 for word in text.lower().split()][:128], None
 
 
 # API Key configuration - REQUIRED in production
@@ -292,6 +313,7 @@ def ingest():
     if not rate_limit():
         return jsonify({"error": "Rate limit exceeded"}), 429
     try:
+        group_id = get_graph_group_id(request) if GRAPHITI_AVAILABLE else None
         if "file" not in request.files:
             raise BadRequest("No file part in request.")
         file = request.files["file"]
@@ -318,8 +340,10 @@ def ingest():
             raise BadRequest("Unsupported file type. Only .txt and .pdf allowed.")
         
         # Store in Supabase (vector store)
-        embedding = get_embedding_ollama(text)
-        response = add_document_to_supabase(text, metadata={"filename": filename}, embedding=embedding)
+        embedding, embedding_model = embed_text(text)
+        response = add_document_to_supabase(
+            text, metadata={"filename": filename}, embedding=embedding, embedding_model=embedding_model
+        )
         
         # Also add to Graphiti knowledge graph for entity/relationship extraction
         graph_result = {}
@@ -329,9 +353,9 @@ def ingest():
                 logging.info(f"Adding episode to Graphiti: {episode_name}")
                 graph_result = add_episode(
                     name=episode_name,
-                    episode_body=text[:10000],  # Limit text size for graph processing
+                    episode_body=text,  # Long documents are split into chained episodes
                     source_description=f"Document: {filename}",
-                    episode_type="text"
+                    group_id=group_id
                 )
                 logging.info(f"Added document to knowledge graph: {graph_result}")
             except Exception as e:
@@ -369,8 +393,8 @@ def retrieval():
         if top_k < 1 or top_k > 20:
             raise BadRequest("top_k must be between 1 and 20.")
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        query_embedding = get_embedding_ollama(query)
-        docs = search_documents_supabase(query_embedding, top_k=top_k)
+        query_embedding, embedding_model = embed_text(query)
+        docs = search_documents_supabase(query_embedding, top_k=top_k, embedding_model=embedding_model)
         
         # Metadata filtering
         if metadata_filter:
@@ -421,13 +445,16 @@ def graph_search():
         query = str(data.get("query", "")).strip()
         num_results = int(data.get("num_results", 10))
         center_node_uuid = data.get("center_node_uuid")
+        group_id = get_graph_group_id(request)
         
         if not query:
             raise BadRequest("Query is required.")
         if num_results < 1 or num_results > 50:
             raise BadRequest("num_results must be between 1 and 50.")
         
-        results = search_graph(query, num_results=num_results, center_node_uuid=center_node_uuid)
+        results = search_graph(
+            query, num_results=num_results, center_node_uuid=center_node_uuid, group_id=group_id
+        )
         
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         log_output(f"graph_search_{timestamp}.json", json.dumps(results, indent=2))
@@ -458,9 +485,26 @@ def graph_temporal():
         entity_name = str(data.get("entity_name", "")).strip()
         start_time_str = data.get("start_time")
         end_time_str = data.get("end_time")
+        page_size = data.get("page_size", 20)
+        cursor = data.get("cursor") or None
+        group_id = get_graph_group_id(request)
         
         if not entity_name:
             raise BadRequest("entity_name is required.")
+        # bool is an int subclass, so reject it explicitly rather than paging by True/False
+        if isinstance(page_size, bool):
+            raise BadRequest("page_size must be an integer.")
+        try:
+            page_size = int(page_size)
+        except (TypeError, ValueError):
+            raise BadRequest("page_size must be an integer.")
+        if page_size < 1 or page_size > 100:
+            raise BadRequest("page_size must be between 1 and 100.")
+        if cursor:
+            try:
+                decode_history_cursor(str(cursor))
+            except ValueError:
+                raise BadRequest("Invalid cursor.")
         
         # Parse datetime strings if provided
         start_time = None
@@ -476,7 +520,10 @@ def graph_temporal():
             except ValueError:
                 raise BadRequest("end_time must be in ISO format (YYYY-MM-DDTHH:MM:SS)")
         
-        context = get_temporal_context(entity_name, start_time=start_time, end_time=end_time)
+        context = get_temporal_context(
+            entity_name, start_time=start_time, end_time=end_time, page_size=page_size, cursor=cursor,
+            group_id=group_id
+        )
         
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         log_output(f"temporal_context_{timestamp}.json", json.dumps(context, indent=2))
@@ -491,6 +538,33 @@ def graph_temporal():
         return jsonify({"error": "Internal server error."}), 500
 
 
+@app.route("/graph/stats", methods=["GET"])
+def graph_stats():
+    """Get node and edge counts for the request's graph partition."""
+    if not authenticate():
+        return jsonify({"error": "Unauthorized"}), 401
+    if not rate_limit():
+        return jsonify({"error": "Rate limit exceeded"}), 429
+    
+    if not GRAPHITI_AVAILABLE:
+        return jsonify({"error": "Graphiti is not available. Install graphiti-core package."}), 503
+    
+    try:
+        group_id = get_graph_group_id(request)
+        stats = get_group_stats(group_id)
+        if "error" in stats:
+            return jsonify(stats), 502
+        
+        logging.info(f"Graph stats endpoint called for group='{group_id or 'default'}'")
+        return jsonify(stats)
+    except BadRequest as e:
+        logging.warning(f"Bad request: {e}")
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logging.error(f"Internal error: {e}")
+        return jsonify({"error": "Internal server error."}), 500
+
+
 @app.route("/crawl", methods=["POST"])
 def create_crawl_job():
     """Create a new crawl job for web content extraction."""
@@ -503,8 +577,12 @@ def create_crawl_job():
         data = request.get_json(force=True)
         crawl_request = CrawlJobRequest.from_dict(data)
 
-        # Create the job
-        job = asyncio.run(crawl_manager.create_job(crawl_request.url, crawl_request.to_config()))
+        # Create the job; extracted entities go to the request's graph partition
+        config = crawl_request.to_config()
+        config.group_id = get_graph_group_id(request) if GRAPHITI_AVAILABLE else None
+        job = crawl_manager.run_sync(crawl_manager.create_job(
+            crawl_request.url, config, priority=crawl_request.priority or 0
+        ))
 
         response = CrawlJobResponse.from_job(job)
 
@@ -526,6 +604,56 @@ def create_crawl_job():
         return jsonify({"error": "Internal server error."}), 500
 
 
+@app.route("/crawl/batch", methods=["POST"])
+def create_crawl_jobs_batch():
+    """Create crawl jobs for a list of URLs or for every page in a sitemap."""
+    if not authenticate():
+        return jsonify({"error": "Unauthorized"}), 401
+    if not rate_limit():
+        return jsonify({"error": "Rate limit exceeded"}), 429
+
+    try:
+        data = request.get_json(force=True)
+        batch = CrawlBatchRequest.from_dict(data, max_urls=CRAWL_BATCH_MAX_URLS)
+        config = batch.options.to_config()
+        config.group_id = get_graph_group_id(request) if GRAPHITI_AVAILABLE else None
+        priority = batch.options.priority or 0
+
+        if batch.sitemap:
+            jobs, duplicates, rejected = crawl_manager.run_sync(crawl_manager.create_jobs_from_sitemap(
+                batch.sitemap, config, batch.max_urls, priority=priority, start=batch.start
+            ))
+        else:
+            jobs, duplicates, rejected = crawl_manager.run_sync(crawl_manager.create_jobs_bulk(
+                batch.urls[:batch.max_urls], config, priority=priority, start=batch.start
+            ))
+
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_output(f"crawl_batch_created_{timestamp}.json", json.dumps({
+            "source": batch.sitemap or "urls",
+            "jobs_created": len(jobs),
+            "duplicates_skipped": duplicates,
+            "rejected": rejected,
+            "config": config.to_dict()
+        }, indent=2))
+
+        logging.info(f"Created {len(jobs)} crawl jobs from {batch.sitemap or 'URL list'}")
+        return jsonify({
+            "jobs_created": len(jobs),
+            "duplicates_skipped": duplicates,
+            "rejected": rejected,
+            "started": batch.start,
+            "job_ids": [job.id for job in jobs]
+        }), 201
+
+    except (BadRequest, SitemapError) as e:
+        logging.warning(f"Bad request: {e}")
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logging.error(f"Internal error creating crawl jobs: {e}")
+        return jsonify({"error": "Internal server error."}), 500
+
+
 @app.route("/crawl/<job_id>", methods=["GET"])
 def get_crawl_job(job_id: str):
     """Get the status and results of a crawl job."""
@@ -535,7 +663,7 @@ def get_crawl_job(job_id: str):
         return jsonify({"error": "Rate limit exceeded"}), 429
 
     try:
-        job = asyncio.run(crawl_manager.get_job(job_id))
+        job = crawl_manager.run_sync(crawl_manager.get_job(job_id))
         if not job:
             return jsonify({"error": "Job not found"}), 404
 
@@ -549,7 +677,7 @@ def get_crawl_job(job_id: str):
 
 @app.route("/crawl", methods=["GET"])
 def list_crawl_jobs():
-    """List crawl jobs with optional filtering."""
+    """List crawl job summaries (without results), newest first, one cursor-paginated page at a time."""
     if not authenticate():
         return jsonify({"error": "Unauthorized"}), 401
     if not rate_limit():
@@ -558,6 +686,7 @@ def list_crawl_jobs():
     try:
         status_filter = request.args.get("status")
         limit = int(request.args.get("limit", 50))
+        cursor = request.args.get("cursor") or None
 
         if limit < 1 or limit > 100:
             raise BadRequest("limit must be between 1 and 100.")
@@ -569,12 +698,20 @@ def list_crawl_jobs():
             except ValueError:
                 raise BadRequest(f"Invalid status: {status_filter}. Must be one of: {[s.value for s in CrawlStatus]}")
 
-        jobs = asyncio.run(crawl_manager.list_jobs(status=status, limit=limit))
+        if cursor:
+            try:
+                decode_job_cursor(cursor)
+            except ValueError:
+                raise BadRequest("Invalid cursor.")
+
+        jobs = crawl_manager.run_sync(crawl_manager.list_jobs(status=status, limit=limit, cursor=cursor))
         responses = [CrawlJobResponse.from_job(job).__dict__ for job in jobs]
 
         return jsonify({
             "jobs": responses,
-            "count": len(responses)
+            "count": len(responses),
+            # A full page may have more after it; pass this back as ?cursor= for the next page
+            "next_cursor": encode_job_cursor(jobs[-1]) if len(jobs) == limit else None
         })
 
     except BadRequest as e:
@@ -585,6 +722,17 @@ def list_crawl_jobs():
         return jsonify({"error": "Internal server error."}), 500
 
 
+@app.route("/crawl/metrics", methods=["GET"])
+def crawl_metrics():
+    """Get crawl scheduler queue depth and wait/service time metrics."""
+    if not authenticate():
+        return jsonify({"error": "Unauthorized"}), 401
+    if not rate_limit():
+        return jsonify({"error": "Rate limit exceeded"}), 429
+
+    return jsonify(crawl_manager.get_metrics())
+
+
 @app.route("/crawl/<job_id>/start", methods=["POST"])
 def start_crawl_job(job_id: str):
     """Start execution of a pending crawl job."""
@@ -594,7 +742,7 @@ def start_crawl_job(job_id: str):
         return jsonify({"error": "Rate limit exceeded"}), 429
 
     try:
-        success = asyncio.run(crawl_manager.start_job(job_id))
+        success = crawl_manager.run_sync(crawl_manager.start_job(job_id))
         if not success:
             return jsonify({"error": "Failed to start job. It may not exist or not be in pending status."}), 400
 
@@ -615,7 +763,7 @@ def cancel_crawl_job(job_id: str):
         return jsonify({"error": "Rate limit exceeded"}), 429
 
     try:
-        success = asyncio.run(crawl_manager.cancel_job(job_id))
+        success = crawl_manager.run_sync(crawl_manager.cancel_job(job_id))
         if not success:
             return jsonify({"error": "Failed to cancel job. It may not exist or not be cancellable."}), 400
 
@@ -627,6 +775,36 @@ def cancel_crawl_job(job_id: str):
         return jsonify({"error": "Internal server error."}), 500
 
 
+def start_background_services():
+    """
+    Start the crawl manager and the Graphiti schema bootstrap once per process.
+
+    Starting the manager resumes the jobs that were queued or running before a
+    restart and warms up the dedup cache. The schema bootstrap runs in a daemon
+    thread so a slow Neo4j does not hold up startup; with it disabled, the
+    schema is still ensured on the first ingest. Importing this module starts
+    nothing, so tests and tools can import the app without side effects.
+    """
+    global _services_started
+    with _services_lock:
+        if _services_started:
+            return
+        _services_started = True
+    if GRAPHITI_AVAILABLE and GRAPHITI_EAGER_SCHEMA_INIT:
+        threading.Thread(target=ensure_graphiti_schema, name="graphiti-schema-init", daemon=True).start()
+    try:
+        crawl_manager.run_sync(crawl_manager.start())
+    except Exception as e:
+        # The API still serves; the scheduler starts on the first queued job
+        logging.error(f"Crawl manager failed to start, queued jobs were not resumed: {e}")
+
+
+def create_app():
+    """App factory for `flask run` (FLASK_APP="app:create_app()"): starts background services."""
+    start_background_services()
+    return app
+
+
 if __name__ == "__main__":
     # Production-ready: debug=False
-    app.run(debug=False)
+    create_app().run(debug=False)
@@ -6,6 +6,7 @@ enabling automated content extraction and knowledge graph integration.
 """
 
 from .models import (
+    CrawlBatchRequest,
     CrawlConfig,
     CrawlJob,
     CrawlJobRequest,
@@ -14,11 +15,22 @@ from .models import (
     CrawlStatus,
 )
 from .service import CrawlService
-from .manager import CrawlJobManager
-from .deduplicator import ContentDeduplicator, ContentFingerprint
-from .rate_limiter import RateLimiter, RateLimitRule
+from .browser_pool import BrowserPool
+from .manager import CrawlJobManager, decode_job_cursor, encode_job_cursor
+from .job_store import JobStateStore
+from .content_store import ContentStore, FilesystemBackend, S3Backend, SupabaseBackend
+from .scheduler import CrawlScheduler
+from .pipeline import IngestPipeline, PipelineStage
+from .deduplicator import ContentDeduplicator, ContentFingerprint, normalize_url
+from .simhash import SimHashIndex, simhash
+from .bloom import BloomFilter, ScalableBloomFilter
+from .crawl_cache import CacheEntry, CrawlCache
+from .static_fetcher import StaticFetcher
+from .sitemap import SitemapError, iter_sitemap_urls, stream_sitemap_urls
+from .rate_limiter import RateLimitedError, RateLimiter, RateLimitRule
 
 __all__ = [
+    "CrawlBatchRequest",
     "CrawlConfig",
     "CrawlJob",
     "CrawlJobRequest",
@@ -26,9 +38,32 @@ __all__ = [
     "CrawlResult",
     "CrawlStatus",
     "CrawlService",
+    "BrowserPool",
     "CrawlJobManager",
+    "decode_job_cursor",
+    "encode_job_cursor",
+    "JobStateStore",
+    "ContentStore",
+    "FilesystemBackend",
+    "S3Backend",
+    "SupabaseBackend",
+    "CrawlScheduler",
+    "IngestPipeline",
+    "PipelineStage",
     "ContentDeduplicator",
     "ContentFingerprint",
+    "normalize_url",
+    "SimHashIndex",
+    "simhash",
+    "BloomFilter",
+    "ScalableBloomFilter",
+    "CacheEntry",
+    "CrawlCache",
+    "StaticFetcher",
+    "SitemapError",
+    "iter_sitemap_urls",
+    "stream_sitemap_urls",
     "RateLimiter",
     "RateLimitRule",
+    "RateLimitedError",
 ]
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+Bloom filter for Crawl4AI integration.
+
+This module provides a compact probabilistic set used to track URLs that
+have already been seen during a crawl, without keeping every URL in memory.
+"""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Membership tests may return false positives (at roughly error_rate once
+    capacity items were added) but never false negatives. For a frontier that
+    means a small fraction of new URLs may be skipped, and no URL is fetched
+    twice. Uses double hashing of a single blake2b digest to derive the k
+    bit positions.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        """
+        Initialize the filter.
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false positive rate at capacity
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item: str) -> bool:
+        """
+        Add an item to the filter.
+
+        Args:
+            item: Item to add
+
+        Returns:
+            True if the item was not (probably) present before
+        """
+        added = False
+        for position in self._positions(item):
+            byte, bit = divmod(position, 8)
+            mask = 1 << bit
+            if not self._bits[byte] & mask:
+                self._bits[byte] |= mask
+                added = True
+        if added:
+            self._count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position // 8] & (1 << (position % 8)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        """Approximate number of distinct items added."""
+        return self._count
+
+    @property
+    def size_bytes(self) -> int:
+        """Memory used by the bit array."""
+        return len(self._bits)
+
+
+class ScalableBloomFilter:
+    """
+    Bloom filter that grows as items are added.
+
+    Starts with one BloomFilter of initial_capacity; when it is full a new
+    filter with growth times the capacity and a tighter error rate is added,
+    so the overall false positive rate stays below roughly twice error_rate
+    however many items arrive (Almeida et al., "Scalable Bloom Filters").
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 10_000,
+        error_rate: float = 0.001,
+        growth: int = 2,
+        tightening: float = 0.5
+    ):
+        """
+        Initialize the filter.
+
+        Args:
+            initial_capacity: Capacity of the first filter
+            error_rate: Target false positive rate of the first filter
+            growth: Capacity multiplier for each new filter
+            tightening: Error rate multiplier for each new filter
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self._filters = [BloomFilter(initial_capacity, error_rate)]
+
+    def add(self, item: str) -> bool:
+        """
+        Add an item to the filter.
+
+        Args:
+            item: Item to add
+
+        Returns:
+            True if the item was not (probably) present before
+        """
+        if item in self:
+            return False
+        current = self._filters[-1]
+        if len(current) >= current.capacity:
+            current = BloomFilter(current.capacity * self.growth, current.error_rate * self.tightening)
+            self._filters.append(current)
+        return current.add(item)
+
+    def __contains__(self, item: str) -> bool:
+        return any(item in bloom for bloom in self._filters)
+
+    def __len__(self) -> int:
+        """Approximate number of distinct items added."""
+        return sum(len(bloom) for bloom in self._filters)
+
+    @property
+    def size_bytes(self) -> int:
+        """Memory used by all bit arrays."""
+        return sum(bloom.size_bytes for bloom in self._filters)
@@ -0,0 +1,193 @@
+"""
+Browser pool for Crawl4AI integration.
+
+This module provides the BrowserPool class, which keeps several reusable
+AsyncWebCrawler instances (each one browser) warm and recycles them after
+a number of pages or when memory grows too much.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _process_tree_rss_mb() -> Optional[float]:
+    """Resident memory of this process and its children (the browsers), in MB."""
+    if not PSUTIL_AVAILABLE:
+        return None
+    try:
+        process = psutil.Process()
+        rss = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return rss / (1024 * 1024)
+    except Exception:
+        return None
+
+
+@dataclass
+class PooledCrawler:
+    """A crawler in the pool plus its usage counters."""
+    crawler: Any
+    created_at: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    pages_served: int = 0
+    retiring: bool = False
+
+
+class BrowserPool:
+    """
+    Pool of reusable crawler (browser) instances.
+
+    Leases are shared: each lease goes to the least busy crawler, since one
+    browser can render several pages at once. A crawler is retired after
+    max_pages_per_browser pages, or when the process tree's memory has grown by
+    more than max_memory_growth_mb since the pool started. A replacement is
+    added right away and the retired browser is closed once its in-flight
+    pages finish.
+    """
+
+    def __init__(
+        self,
+        crawler_factory: Callable[[], Any],
+        size: int = 1,
+        max_pages_per_browser: int = 200,
+        max_memory_growth_mb: Optional[float] = 1024
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            crawler_factory: Callable returning a new AsyncWebCrawler
+            size: Number of browsers kept in the pool
+            max_pages_per_browser: Pages served before a browser is recycled
+            max_memory_growth_mb: Memory growth (MB) that triggers recycling (None disables)
+        """
+        self.crawler_factory = crawler_factory
+        self.size = max(1, size)
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self._members: List[PooledCrawler] = []
+        self._baseline_rss_mb: Optional[float] = None
+        self._recycled = 0
+        self._closing: List[asyncio.Task] = []
+
+    @property
+    def crawlers(self) -> List[Any]:
+        """Crawlers currently serving leases."""
+        return [member.crawler for member in self._members if not member.retiring]
+
+    async def start(self, warm_up: bool = True) -> None:
+        """
+        Create the pool's crawlers.
+
+        Args:
+            warm_up: Launch every browser now instead of on its first page
+        """
+        if self._members:
+            return
+        self._members = [PooledCrawler(self.crawler_factory()) for _ in range(self.size)]
+        if warm_up:
+            await asyncio.gather(*(self._warm_up(member) for member in self._members))
+        self._baseline_rss_mb = _process_tree_rss_mb()
+
+    async def close(self) -> None:
+        """Close every crawler in the pool."""
+        members, self._members = self._members, []
+        await asyncio.gather(*(self._close(member) for member in members), *self._closing)
+        self._closing = []
+
+    @asynccontextmanager
+    async def lease(self, pages: int = 1) -> AsyncIterator[Any]:
+        """
+        Borrow the least busy crawler.
+
+        Args:
+            pages: Number of pages the caller will fetch with it (for recycling)
+        """
+        active = [member for member in self._members if not member.retiring]
+        if not active:
+            raise RuntimeError("Browser pool is not started")
+        member = min(active, key=lambda m: (m.in_flight, m.pages_served))
+        member.in_flight += 1
+        try:
+            yield member.crawler
+        finally:
+            member.in_flight -= 1
+            member.pages_served += pages
+            self._maybe_recycle(member)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, per-browser usage and recycle count."""
+        rss = _process_tree_rss_mb()
+        return {
+            "size": self.size,
+            "browsers": [
+                {"in_flight": m.in_flight, "pages_served": m.pages_served, "retiring": m.retiring}
+                for m in self._members
+            ],
+            "recycled": self._recycled,
+            "memory_mb": round(rss, 1) if rss is not None else None,
+        }
+
+    async def _warm_up(self, member: PooledCrawler) -> None:
+        try:
+            await member.crawler.start()
+        except Exception as e:
+            # The crawler starts itself on first use; a failed warm-up is not fatal
+            logger.warning(f"Browser warm-up failed, will start on first use: {e}")
+
+    async def _close(self, member: PooledCrawler) -> None:
+        try:
+            await member.crawler.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser: {e}")
+
+    def _recycle_reason(self, member: PooledCrawler) -> Optional[str]:
+        if self.max_pages_per_browser and member.pages_served >= self.max_pages_per_browser:
+            return f"{member.pages_served} pages"
+        if self.max_memory_growth_mb and self._baseline_rss_mb is not None:
+            rss = _process_tree_rss_mb()
+            if rss is not None and rss - self._baseline_rss_mb > self.max_memory_growth_mb:
+                # Start a new growth window so one spike recycles one browser
+                self._baseline_rss_mb = rss
+                return f"memory growth to {rss:.0f}MB"
+        return None
+
+    def _maybe_recycle(self, member: PooledCrawler) -> None:
+        if member.retiring:
+            if member.in_flight == 0:
+                self._retire(member)
+            return
+        if member not in self._members:
+            return
+        reason = self._recycle_reason(member)
+        if reason is None:
+            return
+
+        logger.info(f"Recycling browser after {reason}")
+        member.retiring = True
+        self._recycled += 1
+        self._members.append(PooledCrawler(self.crawler_factory()))
+        if member.in_flight == 0:
+            self._retire(member)
+
+    def _retire(self, member: PooledCrawler) -> None:
+        if member in self._members:
+            self._members.remove(member)
+            self._closing = [task for task in self._closing if not task.done()]
+            self._closing.append(asyncio.ensure_future(self._close(member)))
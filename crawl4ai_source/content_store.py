@@ -0,0 +1,343 @@
+"""
+Content-addressed blob store for Crawl4AI integration.
+
+This module provides the ContentStore class, which keeps each crawled page
+body once, compressed and keyed by its content hash, so jobs can reference
+the hash instead of carrying the markdown in crawl_jobs.result. Storage is
+pluggable: a Supabase table, a local directory, or an S3-compatible bucket.
+"""
+
+import codecs
+import logging
+import os
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    logging.warning("zstandard not installed. Crawled page bodies will be compressed with zlib.")
+
+try:
+    import boto3
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Backend for crawled page bodies: supabase, filesystem, s3, or empty to keep content inline
+CONTENT_STORE_BACKEND = os.getenv("CRAWL4AI_CONTENT_STORE", "supabase").lower()
+CONTENT_STORE_PATH = os.getenv("CRAWL4AI_CONTENT_STORE_PATH", "outputs/crawl_content")
+CONTENT_STORE_BUCKET = os.getenv("CRAWL4AI_CONTENT_STORE_BUCKET", "")
+CONTENT_STORE_ENDPOINT = os.getenv("CRAWL4AI_CONTENT_STORE_ENDPOINT", "")
+CONTENT_STORE_LEVEL = int(os.getenv("CRAWL4AI_CONTENT_STORE_LEVEL", "3"))
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class FilesystemBackend:
+    """Blobs as files under a root directory, fanned out by hash prefix."""
+
+    def __init__(self, root: str):
+        """
+        Initialize the backend.
+
+        Args:
+            root: Directory holding the blobs
+        """
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def put(self, key: str, data: bytes, size: int, codec: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so readers never see a partial blob
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def iter_chunks(self, key: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+        with open(self._path(key), "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class SupabaseBackend:
+    """Blobs as bytea in the crawl_content_blobs table, read back in chunks."""
+
+    def __init__(self, supabase_client, table: str = "crawl_content_blobs"):
+        """
+        Initialize the backend.
+
+        Args:
+            supabase_client: Supabase client
+            table: Table holding the blobs
+        """
+        self.supabase = supabase_client
+        self.table = table
+
+    def exists(self, key: str) -> bool:
+        response = self.supabase.table(self.table).select("content_hash").eq("content_hash", key).limit(1).execute()
+        return bool(response.data)
+
+    def put(self, key: str, data: bytes, size: int, codec: str) -> None:
+        # Same hash means same body, so a concurrent writer's row is as good as ours
+        self.supabase.table(self.table).upsert({
+            "content_hash": key,
+            "codec": codec,
+            "size": size,
+            "compressed_size": len(data),
+            "body": "\\x" + data.hex(),  # bytea hex input format
+        }, ignore_duplicates=True).execute()
+
+    def iter_chunks(self, key: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+        # read_crawl_content_blob slices the body server-side (see its migration)
+        offset = 1
+        while True:
+            response = self.supabase.rpc("read_crawl_content_blob", {
+                "p_content_hash": key, "p_offset": offset, "p_length": chunk_size,
+            }).execute()
+            if response.data is None:
+                if offset == 1:
+                    raise KeyError(key)
+                return
+            chunk = _decode_bytea(response.data)
+            if chunk:
+                yield chunk
+            if len(chunk) < chunk_size:
+                return
+            offset += len(chunk)
+
+    def delete(self, key: str) -> None:
+        self.supabase.table(self.table).delete().eq("content_hash", key).execute()
+
+
+def _decode_bytea(value: str) -> bytes:
+    """Bytes of a bytea value returned by PostgREST in hex format ("\\x...")."""
+    return bytes.fromhex(value[2:] if value.startswith("\\x") else value)
+
+
+class S3Backend:
+    """Blobs as objects in an S3-compatible bucket (AWS S3, MinIO, R2, ...)."""
+
+    def __init__(self, bucket: str, prefix: str = "crawl-content/", client=None, endpoint_url: Optional[str] = None):
+        """
+        Initialize the backend.
+
+        Args:
+            bucket: Bucket name
+            prefix: Key prefix for blobs
+            client: boto3 S3 client (created from the environment if None)
+            endpoint_url: Endpoint of an S3-compatible service
+
+        Raises:
+            ImportError: If no client is given and boto3 is not installed
+        """
+        if client is None:
+            if not BOTO3_AVAILABLE:
+                raise ImportError("boto3 is required for the S3 content store")
+            client = boto3.client("s3", endpoint_url=endpoint_url or None)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)
+            return True
+        except Exception:
+            return False
+
+    def put(self, key: str, data: bytes, size: int, codec: str) -> None:
+        self.client.put_object(
+            Bucket=self.bucket, Key=self.prefix + key, Body=data,
+            Metadata={"codec": codec, "size": str(size)},
+        )
+
+    def iter_chunks(self, key: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+        body = self.client.get_object(Bucket=self.bucket, Key=self.prefix + key)["Body"]
+        yield from body.iter_chunks(chunk_size)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self.prefix + key)
+
+
+class ContentStore:
+    """
+    Compressed, content-addressed store of crawled page bodies.
+
+    put() compresses a body with zstd (zlib when zstandard is not installed)
+    and writes it once per content hash; later puts of the same hash are
+    skipped. Reads detect the codec from the blob's magic bytes, so blobs
+    written with either codec stay readable. iter_text() decompresses
+    chunk by chunk for callers that stream large pages.
+    """
+
+    def __init__(self, backend, level: int = CONTENT_STORE_LEVEL, codec: Optional[str] = None, max_known: int = 100_000):
+        """
+        Initialize the store.
+
+        Args:
+            backend: FilesystemBackend, SupabaseBackend or S3Backend
+            level: Compression level
+            codec: "zstd" or "zlib" (default zstd when available)
+            max_known: Hashes remembered as stored, to skip existence checks
+        """
+        self.backend = backend
+        self.level = level
+        self.codec = codec or ("zstd" if ZSTD_AVAILABLE else "zlib")
+        if self.codec == "zstd" and not ZSTD_AVAILABLE:
+            raise ImportError("zstandard is required for the zstd codec")
+        self.max_known = max_known
+        self._known: "OrderedDict[str, None]" = OrderedDict()
+        self.blobs_written = 0
+        self.duplicates_skipped = 0
+        self.bytes_in = 0
+        self.bytes_stored = 0
+
+    def put(self, content_hash: str, content: str) -> None:
+        """
+        Store a body under its hash unless it is already stored.
+
+        Args:
+            content_hash: SHA-256 of the content (CrawlResult.content_hash)
+            content: Page body
+
+        Raises:
+            Exception: Backend errors
+        """
+        if self.contains(content_hash) or self.backend.exists(content_hash):
+            self.duplicates_skipped += 1
+            self._remember(content_hash)
+            return
+
+        raw = content.encode("utf-8")
+        data = self._compress(raw)
+        self.backend.put(content_hash, data, len(raw), self.codec)
+        self.blobs_written += 1
+        self.bytes_in += len(raw)
+        self.bytes_stored += len(data)
+        self._remember(content_hash)
+
+    def contains(self, content_hash: str) -> bool:
+        """Whether this process stored or saw the hash (no backend call)."""
+        return content_hash in self._known
+
+    def get(self, content_hash: str) -> Optional[str]:
+        """
+        Read a whole body.
+
+        Args:
+            content_hash: Hash the body was stored under
+
+        Returns:
+            The body, or None if it is not stored or cannot be read
+        """
+        try:
+            return "".join(self.iter_text(content_hash))
+        except Exception as e:
+            logger.warning(f"Could not read content {content_hash}: {e}")
+            return None
+
+    def iter_text(self, content_hash: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Stream a body as decoded text chunks.
+
+        Args:
+            content_hash: Hash the body was stored under
+            chunk_size: Compressed bytes read per backend chunk
+
+        Yields:
+            Text chunks in order
+
+        Raises:
+            KeyError/FileNotFoundError: If the body is not stored
+        """
+        # Incremental so multi-byte characters split across chunks decode correctly
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        chunks = self.backend.iter_chunks(content_hash, chunk_size)
+        first = next(chunks, b"")
+        if first.startswith(ZSTD_MAGIC):
+            if not ZSTD_AVAILABLE:
+                raise ImportError("zstandard is required to read zstd-compressed content")
+            decompressor = zstandard.ZstdDecompressor().decompressobj()
+        else:
+            decompressor = zlib.decompressobj()
+
+        for chunk in _prepend(first, chunks):
+            text = decoder.decode(decompressor.decompress(chunk))
+            if text:
+                yield text
+        tail = decoder.decode(decompressor.flush(), True)
+        if tail:
+            yield tail
+
+    def stats(self) -> Dict[str, Any]:
+        """Blob counts and compression ratio of bodies written by this process."""
+        return {
+            "codec": self.codec,
+            "blobs_written": self.blobs_written,
+            "duplicates_skipped": self.duplicates_skipped,
+            "bytes_in": self.bytes_in,
+            "bytes_stored": self.bytes_stored,
+            "compression_ratio": round(self.bytes_in / self.bytes_stored, 2) if self.bytes_stored else None,
+        }
+
+    def _compress(self, raw: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compress(raw)
+        return zlib.compress(raw, min(max(self.level, 1), 9))
+
+    def _remember(self, content_hash: str) -> None:
+        self._known[content_hash] = None
+        self._known.move_to_end(content_hash)
+        while len(self._known) > self.max_known:
+            self._known.popitem(last=False)
+
+
+def _prepend(first: bytes, rest: Iterator[bytes]) -> Iterator[bytes]:
+    if first:
+        yield first
+    yield from rest
+
+
+def create_content_store(supabase_client=None) -> Optional[ContentStore]:
+    """
+    Build the content store configured by CRAWL4AI_CONTENT_STORE.
+
+    Args:
+        supabase_client: Supabase client for the supabase backend
+
+    Returns:
+        ContentStore, or None if disabled or the backend cannot be set up
+    """
+    try:
+        if CONTENT_STORE_BACKEND == "supabase" and supabase_client is not None:
+            return ContentStore(SupabaseBackend(supabase_client))
+        if CONTENT_STORE_BACKEND == "filesystem":
+            return ContentStore(FilesystemBackend(CONTENT_STORE_PATH))
+        if CONTENT_STORE_BACKEND == "s3" and CONTENT_STORE_BUCKET:
+            return ContentStore(S3Backend(CONTENT_STORE_BUCKET, endpoint_url=CONTENT_STORE_ENDPOINT))
+    except Exception as e:
+        logger.warning(f"Content store disabled, page content stays inline in job results: {e}")
+    return None
@@ -0,0 +1,237 @@
+"""
+Recrawl cache for Crawl4AI integration.
+
+This module provides the CrawlCache class, which remembers the HTTP
+validators (ETag/Last-Modified) and content hash of every crawled page so a
+recrawl can ask the server whether the page changed and skip unchanged pages.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .deduplicator import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# URLs per crawl_cache select; keeps the PostgREST query string short
+LOOKUP_BATCH = 50
+
+
+@dataclass
+class CacheEntry:
+    """Validators and fingerprint of the last crawl of one canonical URL."""
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: str = ""
+    content_size: int = 0
+    title: Optional[str] = None
+    links: List[str] = field(default_factory=list)
+    checked_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @property
+    def has_validators(self) -> bool:
+        """Whether a conditional request can be made for this URL."""
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers asking the server to answer 304 if the page is unchanged."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert entry to a crawl_cache row."""
+        return {
+            "url": self.url,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "content_hash": self.content_hash,
+            "content_size": self.content_size,
+            "title": self.title,
+            "links": self.links,
+            "checked_at": self.checked_at.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CacheEntry':
+        """Create entry from a crawl_cache row."""
+        return cls(
+            url=data["url"],
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            content_hash=data.get("content_hash") or "",
+            content_size=data.get("content_size") or 0,
+            title=data.get("title"),
+            links=data.get("links") or [],
+            checked_at=datetime.fromisoformat(data["checked_at"]) if data.get("checked_at") else datetime.now(timezone.utc),
+        )
+
+
+class CrawlCache:
+    """
+    Cache of crawl validators keyed by canonical URL.
+
+    Entries are kept in a bounded in-memory LRU and, when a Supabase client
+    is given, persisted in the crawl_cache table so recurring crawls can use
+    them across restarts. URLs the table has no row for are remembered in the
+    LRU as well, so a first crawl reads each URL from the database only once.
+    The *_async methods run the database calls in the default executor, so
+    lookups never block the event loop. Storage errors are logged and never
+    fail a crawl.
+    """
+
+    def __init__(self, supabase_client=None, max_entries: int = 10_000):
+        """
+        Initialize the cache.
+
+        Args:
+            supabase_client: Optional Supabase client for the crawl_cache table
+            max_entries: Entries (and known misses) kept in memory
+        """
+        self.supabase = supabase_client
+        self.max_entries = max_entries
+        # None marks a URL known to have no crawl_cache row
+        self._entries: "OrderedDict[str, Optional[CacheEntry]]" = OrderedDict()
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """
+        Look up the cache entry for a URL.
+
+        Args:
+            url: URL in any form; it is canonicalized first
+
+        Returns:
+            CacheEntry or None if the URL was never crawled
+        """
+        return self.get_many([url])[url]
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, Optional[CacheEntry]]:
+        """
+        Look up the cache entries for many URLs with batched database reads.
+
+        Args:
+            urls: URLs in any form; they are canonicalized first
+
+        Returns:
+            Entry (or None if never crawled) keyed by each URL as given
+        """
+        urls = list(urls)
+        found, missing = self._recall(urls)
+        if missing:
+            found.update(self._absorb(missing, self._load(missing)))
+        return {url: found.get(normalize_url(url)) for url in urls}
+
+    async def get_async(self, url: str) -> Optional[CacheEntry]:
+        """get() with the database read off the event loop."""
+        return (await self.get_many_async([url]))[url]
+
+    async def get_many_async(self, urls: Iterable[str]) -> Dict[str, Optional[CacheEntry]]:
+        """get_many() with the database reads off the event loop."""
+        urls = list(urls)
+        found, missing = self._recall(urls)
+        if missing:
+            rows = await asyncio.get_running_loop().run_in_executor(None, self._load, missing)
+            found.update(self._absorb(missing, rows))
+        return {url: found.get(normalize_url(url)) for url in urls}
+
+    def put(self, entry: CacheEntry) -> None:
+        """
+        Store or replace the entry for entry.url.
+
+        Args:
+            entry: Entry to store; its URL is canonicalized
+        """
+        self.put_many([entry])
+
+    def put_many(self, entries: Iterable[CacheEntry]) -> None:
+        """
+        Store or replace several entries with one upsert.
+
+        Args:
+            entries: Entries to store; their URLs are canonicalized
+        """
+        rows = self._stage(entries)
+        if rows:
+            self._save(rows)
+
+    async def put_async(self, entry: CacheEntry) -> None:
+        """put() with the database write off the event loop."""
+        await self.put_many_async([entry])
+
+    async def put_many_async(self, entries: Iterable[CacheEntry]) -> None:
+        """put_many() with the database write off the event loop."""
+        rows = self._stage(entries)
+        if rows:
+            await asyncio.get_running_loop().run_in_executor(None, self._save, rows)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _recall(self, urls: List[str]) -> Tuple[Dict[str, Optional[CacheEntry]], List[str]]:
+        """Entries (and known misses) held in memory, and the canonical URLs still to load."""
+        found: Dict[str, Optional[CacheEntry]] = {}
+        missing: Dict[str, None] = {}
+        for url in urls:
+            key = normalize_url(url)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                found[key] = self._entries[key]
+            else:
+                missing[key] = None
+        return found, list(missing)
+
+    def _load(self, keys: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """crawl_cache rows for keys; None if they could not be read."""
+        if self.supabase is None:
+            return None
+        rows = []
+        try:
+            for i in range(0, len(keys), LOOKUP_BATCH):
+                response = self.supabase.table("crawl_cache").select("*").in_("url", keys[i:i + LOOKUP_BATCH]).execute()
+                rows.extend(response.data or [])
+        except Exception as e:
+            logger.warning(f"Error reading crawl cache for {len(keys)} URLs: {e}")
+            return None
+        return rows
+
+    def _absorb(self, keys: List[str], rows: Optional[List[Dict[str, Any]]]) -> Dict[str, Optional[CacheEntry]]:
+        """Turn loaded rows into entries, remembering keys without a row as misses."""
+        found: Dict[str, Optional[CacheEntry]] = dict.fromkeys(keys)
+        if rows is None:
+            # Nothing was read, so absence proves nothing; ask again next time
+            return found
+        for row in rows:
+            entry = CacheEntry.from_dict(row)
+            found[entry.url] = entry
+        for key, entry in found.items():
+            self._remember(key, entry)
+        return found
+
+    def _stage(self, entries: Iterable[CacheEntry]) -> List[Dict[str, Any]]:
+        """Remember entries in memory and return the rows to upsert (one per URL)."""
+        rows = {}
+        for entry in entries:
+            entry.url = normalize_url(entry.url)
+            self._remember(entry.url, entry)
+            rows[entry.url] = entry.to_dict()
+        return list(rows.values()) if self.supabase is not None else []
+
+    def _save(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            self.supabase.table("crawl_cache").upsert(rows).execute()
+        except Exception as e:
+            logger.warning(f"Error writing crawl cache for {len(rows)} URLs: {e}")
+
+    def _remember(self, key: str, entry: Optional[CacheEntry]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -2,19 +2,56 @@
 Content deduplication utilities for Crawl4AI integration.
 
 This module provides utilities for detecting and preventing duplicate
-content from being stored, using content hashing and similarity analysis.
+content from being stored, using content hashing and SimHash-based
+near-duplicate detection.
 """
 
 import hashlib
 import logging
-from typing import List, Optional, Set
+import time
+import urllib.parse
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
 from dataclasses import dataclass
-from difflib import SequenceMatcher
 
 from supabase import Client
 
+from .bloom import ScalableBloomFilter
+from .simhash import SimHashIndex, from_signed64, hamming_distance, simhash, simhash_bands, to_signed64
+
 logger = logging.getLogger(__name__)
 
+# Query parameters that don't affect page content
+TRACKING_PARAMS = {'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'fbclid', 'gclid'}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonicalize a URL so equivalent URLs compare (and hash) equal.
+
+    Drops tracking query parameters and the trailing slash, and lowercases
+    the result.
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL string
+    """
+    parsed = urllib.parse.urlparse(url)
+
+    # Remove query parameters that don't affect content
+    query_params = urllib.parse.parse_qs(parsed.query)
+    filtered_params = {k: v for k, v in query_params.items() if k not in TRACKING_PARAMS}
+
+    # Reconstruct URL
+    parsed = parsed._replace(query=urllib.parse.urlencode(filtered_params, doseq=True))
+
+    # Remove trailing slash
+    normalized = urllib.parse.urlunparse(parsed).rstrip('/')
+
+    return normalized.lower()
+
 
 @dataclass
 class ContentFingerprint:
@@ -23,6 +60,7 @@ class ContentFingerprint:
     url_hash: str
     title_hash: Optional[str]
     similarity_threshold: float = 0.85
+    simhash: Optional[int] = None  # 64-bit SimHash of the content
 
 
 class ContentDeduplicator:
@@ -30,19 +68,49 @@ class ContentDeduplicator:
     Handles content deduplication using multiple strategies:
     - Exact hash matching
     - URL-based deduplication
-    - Content similarity analysis
+    - Near-duplicate detection with SimHash signatures and a banded LSH index
+
+    Near duplicates are looked up in the in-memory SimHashIndex once
+    warm_up() has run, and otherwise through the simhash_band_* columns
+    of crawl_content.
+
+    Exact checks go through an in-process front tier: an LRU of hashes known
+    to exist answers repeat positives, and after warm_up() a scalable Bloom
+    filter of every stored hash answers definite negatives without touching
+    the database. Anything else is resolved with one combined query over
+    the content, URL and title hashes. Rows inserted by other processes
+    after warm_up() are only seen by the database query, so warm up again
+    (or rely on the unique content_hash index) when several writers share
+    the table.
     """
 
-    def __init__(self, supabase_client: Client, similarity_threshold: float = 0.85):
+    def __init__(
+        self,
+        supabase_client: Client,
+        similarity_threshold: float = 0.85,
+        max_hamming_distance: int = 3,
+        num_bands: int = 4,
+        max_recent_hits: int = 10_000
+    ):
         """
         Initialize the deduplicator.
 
         Args:
             supabase_client: Supabase client for database operations
             similarity_threshold: Threshold for content similarity (0.0-1.0)
+            max_hamming_distance: SimHash bits two near-duplicate pages may differ in
+            num_bands: LSH bands per signature (must exceed max_hamming_distance)
+            max_recent_hits: Size of the LRU of hashes known to exist
         """
         self.supabase = supabase_client
         self.similarity_threshold = similarity_threshold
+        self.max_hamming_distance = max_hamming_distance
+        self.index = SimHashIndex(num_bands=num_bands, max_distance=max_hamming_distance)
+        self._index_loaded = False
+        self._known_hashes = ScalableBloomFilter(initial_capacity=100_000)
+        self._recent_hits: "OrderedDict[str, None]" = OrderedDict()
+        self.max_recent_hits = max_recent_hits
+        self._lookups = {"lru_hits": 0, "bloom_negatives": 0, "db_queries": 0}
 
     def generate_content_hash(self, content: str) -> str:
         """
@@ -84,7 +152,13 @@ class ContentDeduplicator:
             return None
         return hashlib.sha256(title.strip().lower().encode('utf-8')).hexdigest()
 
-    def create_fingerprint(self, url: str, content: str, title: Optional[str] = None) -> ContentFingerprint:
+    def create_fingerprint(
+        self,
+        url: str,
+        content: str,
+        title: Optional[str] = None,
+        signature: Optional[int] = None
+    ) -> ContentFingerprint:
         """
         Create a content fingerprint for deduplication checking.
 
@@ -92,6 +166,7 @@ class ContentDeduplicator:
             url: Source URL
             content: Content text
             title: Optional title
+            signature: SimHash computed at crawl time (computed here if None)
 
         Returns:
             ContentFingerprint object
@@ -101,8 +176,129 @@ class ContentDeduplicator:
             url_hash=self.generate_url_hash(url),
             title_hash=self.generate_title_hash(title) if title else None,
             similarity_threshold=self.similarity_threshold,
+            simhash=signature if signature is not None else simhash(content),
         )
 
+    def fingerprint_columns(self, fingerprint: ContentFingerprint) -> Dict[str, Any]:
+        """
+        crawl_content columns storing a fingerprint.
+
+        Args:
+            fingerprint: Fingerprint to store
+
+        Returns:
+            Dict with url_hash, title_hash, simhash and its LSH band columns
+        """
+        has_signature = fingerprint.simhash is not None
+        bands = simhash_bands(fingerprint.simhash, self.index.num_bands) if has_signature else (None,) * self.index.num_bands
+        columns = {
+            "url_hash": fingerprint.url_hash,
+            "title_hash": fingerprint.title_hash,
+            "simhash": to_signed64(fingerprint.simhash) if has_signature else None,
+        }
+        columns.update({f"simhash_band_{band}": value for band, value in enumerate(bands)})
+        return columns
+
+    def register(self, content_id: str, fingerprint: ContentFingerprint) -> None:
+        """
+        Record stored content in the in-memory Bloom filter and near-duplicate index.
+
+        Args:
+            content_id: crawl_content id of the stored content
+            fingerprint: Its fingerprint
+        """
+        for key in self._hash_keys(fingerprint.content_hash, fingerprint.url_hash, fingerprint.title_hash):
+            self._known_hashes.add(key)
+            self._remember_hit(key)
+        if fingerprint.simhash is not None:
+            self.index.add(content_id, fingerprint.simhash)
+
+    def warm_up(self, page_size: int = 5000) -> int:
+        """
+        Load every stored hash and SimHash signature into memory.
+
+        Pages through crawl_content by id so memory stays bounded per request.
+        Until this has run, negative answers still go to the database.
+
+        Args:
+            page_size: Rows fetched per request
+
+        Returns:
+            Number of rows loaded
+        """
+        loaded = 0
+        last_id = ""
+        while True:
+            query = self.supabase.table("crawl_content").select("id,content_hash,url_hash,title_hash,simhash").order("id")
+            if last_id:
+                query = query.gt("id", last_id)
+            rows = query.limit(page_size).execute().data or []
+            for row in rows:
+                for key in self._hash_keys(row.get("content_hash"), row.get("url_hash"), row.get("title_hash")):
+                    self._known_hashes.add(key)
+                if row.get("simhash") is not None:
+                    self.index.add(row["id"], from_signed64(row["simhash"]))
+            loaded += len(rows)
+            if len(rows) < page_size:
+                break
+            last_id = rows[-1]["id"]
+
+        self._index_loaded = True
+        logger.info(
+            f"Dedup cache warmed with {loaded} rows "
+            f"({len(self.index)} SimHash signatures, {self._known_hashes.size_bytes} Bloom bytes)"
+        )
+        return loaded
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Front tier size and how many lookups it answered without the database."""
+        return {
+            "warmed_up": self._index_loaded,
+            "bloom_items": len(self._known_hashes),
+            "bloom_bytes": self._known_hashes.size_bytes,
+            "recent_hits": len(self._recent_hits),
+            "simhash_signatures": len(self.index),
+            **self._lookups,
+        }
+
+    def find_near_duplicates(self, fingerprint: ContentFingerprint) -> List[Dict[str, Any]]:
+        """
+        Find stored content within max_hamming_distance bits of a fingerprint.
+
+        Args:
+            fingerprint: Fingerprint to look up
+
+        Returns:
+            Dicts with content id, hamming distance and similarity, closest first
+        """
+        if fingerprint.simhash is None:
+            return []
+
+        if self._index_loaded:
+            matches = self.index.query(fingerprint.simhash)
+        else:
+            matches = self._query_band_columns(fingerprint.simhash)
+
+        return [
+            {"id": key, "distance": distance, "similarity": self._calculate_similarity(distance)}
+            for key, distance in matches
+        ]
+
+    def _query_band_columns(self, signature: int) -> List[tuple]:
+        """Near-duplicate lookup through the indexed simhash_band_* columns."""
+        bands = simhash_bands(signature, self.index.num_bands)
+        band_filter = ",".join(f"simhash_band_{band}.eq.{value}" for band, value in enumerate(bands))
+        response = self.supabase.table("crawl_content").select("id,simhash").or_(band_filter).limit(1000).execute()
+
+        matches = []
+        for row in response.data or []:
+            if row.get("simhash") is None:
+                continue
+            distance = hamming_distance(signature, from_signed64(row["simhash"]))
+            if distance <= self.max_hamming_distance:
+                matches.append((row["id"], distance))
+        return sorted(matches, key=lambda match: match[1])
+
     async def is_duplicate(self, fingerprint: ContentFingerprint) -> bool:
         """
         Check if content is a duplicate based on fingerprint.
@@ -114,19 +310,9 @@ class ContentDeduplicator:
             True if duplicate found, False otherwise
         """
         try:
-            # Check exact content hash first (fastest)
-            if await self._check_exact_hash(fingerprint.content_hash):
-                logger.debug(f"Exact content hash match: {fingerprint.content_hash}")
-                return True
-
-            # Check URL hash (good for same URL recrawls)
-            if await self._check_url_hash(fingerprint.url_hash):
-                logger.debug(f"URL hash match: {fingerprint.url_hash}")
-                return True
-
-            # Check title hash if available (good for similar content)
-            if fingerprint.title_hash and await self._check_title_hash(fingerprint.title_hash):
-                logger.debug(f"Title hash match: {fingerprint.title_hash}")
+            # Exact content, URL and title hashes (front tier, then one query)
+            if await self._check_hashes(fingerprint):
+                logger.debug(f"Hash match for: {fingerprint.content_hash}")
                 return True
 
             # Check content similarity (slowest, most comprehensive)
@@ -141,80 +327,85 @@ class ContentDeduplicator:
             # On error, allow content (fail open)
             return False
 
-    async def _check_exact_hash(self, content_hash: str) -> bool:
-        """Check for exact content hash match."""
-        try:
-            response = self.supabase.table("crawl_content").select("id").eq("content_hash", content_hash).limit(1).execute()
-            return len(response.data) > 0
-        except Exception as e:
-            logger.error(f"Error checking exact hash: {e}")
-            return False
+    def _hash_keys(self, content_hash: Optional[str], url_hash: Optional[str], title_hash: Optional[str]) -> List[str]:
+        """Column-prefixed keys so equal hashes of different kinds don't collide."""
+        pairs = (("content_hash", content_hash), ("url_hash", url_hash), ("title_hash", title_hash))
+        return [f"{column}:{value}" for column, value in pairs if value]
+
+    def _remember_hit(self, key: str) -> None:
+        self._recent_hits[key] = None
+        self._recent_hits.move_to_end(key)
+        while len(self._recent_hits) > self.max_recent_hits:
+            self._recent_hits.popitem(last=False)
+
+    async def _check_hashes(self, fingerprint: ContentFingerprint) -> bool:
+        """
+        Check the content, URL and title hashes for an exact match.
+
+        Recent positives are answered from the LRU. After warm_up(), hashes the
+        Bloom filter has never seen are definitely absent and skip the
+        database; the remaining ones are checked with a single OR query.
+        """
+        keys = self._hash_keys(fingerprint.content_hash, fingerprint.url_hash, fingerprint.title_hash)
+        for key in keys:
+            if key in self._recent_hits:
+                self._recent_hits.move_to_end(key)
+                self._lookups["lru_hits"] += 1
+                return True
+
+        if self._index_loaded:
+            keys = [key for key in keys if key in self._known_hashes]
+            if not keys:
+                self._lookups["bloom_negatives"] += 1
+                return False
 
-    async def _check_url_hash(self, url_hash: str) -> bool:
-        """Check for URL hash match."""
         try:
-            response = self.supabase.table("crawl_content").select("id").eq("url_hash", url_hash).limit(1).execute()
-            return len(response.data) > 0
+            self._lookups["db_queries"] += 1
+            hash_filter = ",".join(f"{key.replace(':', '.eq.', 1)}" for key in keys)
+            response = self.supabase.table("crawl_content").select(
+                "content_hash,url_hash,title_hash"
+            ).or_(hash_filter).limit(1).execute()
         except Exception as e:
-            logger.error(f"Error checking URL hash: {e}")
+            logger.error(f"Error checking hashes: {e}")
             return False
 
-    async def _check_title_hash(self, title_hash: str) -> bool:
-        """Check for title hash match."""
-        try:
-            response = self.supabase.table("crawl_content").select("id").eq("title_hash", title_hash).limit(1).execute()
-            return len(response.data) > 0
-        except Exception as e:
-            logger.error(f"Error checking title hash: {e}")
+        if not response.data:
             return False
+        row = response.data[0]
+        for key in self._hash_keys(row.get("content_hash"), row.get("url_hash"), row.get("title_hash")):
+            if key in keys:
+                self._remember_hit(key)
+        return True
 
     async def _check_similarity(self, fingerprint: ContentFingerprint) -> bool:
         """
-        Check content similarity against existing content.
+        Check for near-duplicate content via SimHash LSH.
 
-        This is a more expensive operation that compares content
-        against recent crawls to find similar content.
+        Only the signature's band buckets are examined, so the cost does not
+        grow with the number of stored pages.
         """
         try:
-            # Get recent content for comparison (last 1000 entries)
-            response = self.supabase.table("crawl_content").select("content").order("extracted_at", desc=True).limit(1000).execute()
-
-            if not response.data:
-                return False
-
-            # Extract content from results
-            existing_content = []
-            for row in response.data:
-                # Note: In a real implementation, you'd want to store processed content
-                # For now, we'll use a simplified approach
-                if row.get("content"):
-                    existing_content.append(row["content"])
-
-            # Check similarity against each existing content
-            for existing in existing_content:
-                if self._calculate_similarity(fingerprint.content_hash, existing) >= fingerprint.similarity_threshold:
-                    return True
-
-            return False
+            started = time.perf_counter()
+            matches = self.find_near_duplicates(fingerprint)
+            matches = [m for m in matches if m["similarity"] >= fingerprint.similarity_threshold]
+            logger.debug(f"Near-duplicate lookup took {(time.perf_counter() - started) * 1000:.3f}ms")
+            return bool(matches)
 
         except Exception as e:
             logger.error(f"Error checking similarity: {e}")
             return False
 
-    def _calculate_similarity(self, content1: str, content2: str) -> float:
+    def _calculate_similarity(self, distance: int) -> float:
         """
-        Calculate similarity ratio between two content strings.
+        Similarity of two signatures from their Hamming distance.
 
         Args:
-            content1: First content string
-            content2: Second content string
+            distance: Number of differing SimHash bits
 
         Returns:
             Similarity ratio (0.0-1.0)
         """
-        # For simplicity, use sequence matcher
-        # In production, you might want more sophisticated similarity measures
-        return SequenceMatcher(None, content1, content2).ratio()
+        return 1.0 - distance / 64
 
     def _normalize_url(self, url: str) -> str:
         """
@@ -226,51 +417,25 @@ class ContentDeduplicator:
         Returns:
             Normalized URL string
         """
-        # Remove common tracking parameters
-        import urllib.parse
-        parsed = urllib.parse.urlparse(url)
-
-        # Remove query parameters that don't affect content
-        ignore_params = {'utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content', 'fbclid', 'gclid'}
-        query_params = urllib.parse.parse_qs(parsed.query)
-        filtered_params = {k: v for k, v in query_params.items() if k not in ignore_params}
-
-        # Reconstruct URL
-        parsed = parsed._replace(query=urllib.parse.urlencode(filtered_params, doseq=True))
-
-        # Remove trailing slash
-        normalized = urllib.parse.urlunparse(parsed).rstrip('/')
-
-        return normalized.lower()
+        return normalize_url(url)
 
     async def get_duplicate_stats(self) -> dict:
         """
         Get statistics about duplicate content detection.
 
+        Reads the trigger-maintained counters through the
+        get_crawl_content_stats RPC, so the cost does not depend on table size.
+
         Returns:
             Dictionary with duplicate statistics
         """
         try:
-            # Count total content
-            total_response = self.supabase.table("crawl_content").select("id", count="exact").execute()
-            total_count = total_response.count or 0
-
-            # Count unique content hashes
-            unique_response = self.supabase.table("crawl_content").select("content_hash").execute()
-            unique_hashes = set(row["content_hash"] for row in unique_response.data)
-            unique_count = len(unique_hashes)
-
-            # Count unique URLs
-            unique_url_response = self.supabase.table("crawl_content").select("url_hash").execute()
-            unique_url_hashes = set(row["url_hash"] for row in unique_url_response.data)
-            unique_url_count = len(unique_url_hashes)
+            response = self.supabase.rpc("get_crawl_content_stats").execute()
+            row = response.data[0] if isinstance(response.data, list) and response.data else response.data or {}
 
             return {
-                "total_content": total_count,
-                "unique_content": unique_count,
-                "unique_urls": unique_url_count,
-                "duplicate_content": total_count - unique_count,
-                "duplicate_urls": total_count - unique_url_count,
+                key: int(row.get(key) or 0)
+                for key in ("total_content", "unique_content", "unique_urls", "duplicate_content", "duplicate_urls")
             }
 
         except Exception as e:
@@ -0,0 +1,225 @@
+"""
+Write-behind job state store for Crawl4AI integration.
+
+This module provides the JobStateStore class, which buffers crawl job rows
+and writes them to the crawl_jobs table in batched upserts, so the several
+status transitions of a job cost one database write instead of one each.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from .models import CrawlJob
+
+logger = logging.getLogger(__name__)
+
+# Flush buffered job rows at least this often (seconds), or once this many jobs are buffered
+JOB_FLUSH_INTERVAL = float(os.getenv("CRAWL4AI_JOB_FLUSH_INTERVAL", "1.0"))
+JOB_FLUSH_BATCH = int(os.getenv("CRAWL4AI_JOB_FLUSH_BATCH", "100"))
+# Rows per INSERT when creating jobs in bulk
+JOB_INSERT_BATCH = int(os.getenv("CRAWL4AI_JOB_INSERT_BATCH", "1000"))
+
+
+def job_to_row(job: CrawlJob, content_store=None) -> Dict[str, Any]:
+    """
+    Convert a job to a crawl_jobs row.
+
+    Args:
+        job: Job to convert
+        content_store: ContentStore holding page bodies; a result whose body
+            is stored there is saved without it (only content_hash is kept)
+
+    Returns:
+        Row dict with config and result serialized as JSON
+    """
+    result = job.result.to_dict() if job.result else None
+    if result and result["content"] and content_store is not None and content_store.contains(job.result.content_hash):
+        del result["content"]
+    return {
+        "id": job.id,
+        "url": job.url,
+        "status": job.status.value,
+        "created_at": job.created_at.isoformat(),
+        "updated_at": job.updated_at.isoformat(),
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "config": json.dumps(job.config.to_dict()),
+        "result": json.dumps(result) if result else None,
+        "error_message": job.error_message,
+        "priority": job.priority,
+        "queued_at": job.queued_at.isoformat() if job.queued_at else None,
+    }
+
+
+class JobStateStore:
+    """
+    Write-behind buffer in front of the crawl_jobs table.
+
+    write() keeps only the latest row per job, so transitions made between
+    flushes coalesce into one upsert. Buffered rows are flushed as one
+    batched upsert every flush_interval seconds, or as soon as max_batch jobs
+    are buffered. write_now() flushes immediately and is used for states
+    that must be durable before the caller moves on (creation and terminal
+    states). A failed flush puts its rows back unless a newer row for the
+    same job arrived meanwhile, and they are retried on the next flush.
+    """
+
+    def __init__(
+        self,
+        supabase_client,
+        flush_interval: float = JOB_FLUSH_INTERVAL,
+        max_batch: int = JOB_FLUSH_BATCH,
+        content_store=None
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            supabase_client: Supabase client for the crawl_jobs table
+            flush_interval: Seconds between background flushes
+            max_batch: Buffered jobs that trigger an early flush
+            content_store: ContentStore whose bodies are left out of result JSON
+        """
+        self.supabase = supabase_client
+        self.flush_interval = flush_interval
+        self.max_batch = max(1, max_batch)
+        self.content_store = content_store
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self.writes = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.rows_inserted = 0
+
+    def pending_row(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The buffered (not yet flushed) row for a job, if any."""
+        return self._pending.get(job_id)
+
+    def pending_rows(self) -> List[Dict[str, Any]]:
+        """All buffered (not yet flushed) rows."""
+        return list(self._pending.values())
+
+    async def write(self, job: CrawlJob) -> None:
+        """
+        Buffer the job's current state for the next batched flush.
+
+        Args:
+            job: Job to persist
+        """
+        self.writes += 1
+        if job.id in self._pending:
+            self.coalesced += 1
+        self._pending[job.id] = job_to_row(job, self.content_store)
+        self._ensure_flusher()
+        if len(self._pending) >= self.max_batch:
+            self._wake.set()
+
+    async def write_now(self, job: CrawlJob) -> None:
+        """
+        Persist the job's state immediately, together with everything buffered.
+
+        Args:
+            job: Job to persist
+
+        Raises:
+            Exception: If the upsert fails (the rows stay buffered for retry)
+        """
+        self.writes += 1
+        self._pending[job.id] = job_to_row(job, self.content_store)
+        await self.flush(raise_errors=True)
+
+    async def insert_many(self, jobs: List[CrawlJob], batch_size: int = JOB_INSERT_BATCH) -> int:
+        """
+        Insert new jobs directly, batch_size rows per request.
+
+        Unlike write(), this bypasses the buffer: the rows are new, so a
+        plain INSERT is enough and nothing needs coalescing.
+
+        Args:
+            jobs: Jobs not yet in crawl_jobs
+            batch_size: Rows per INSERT
+
+        Returns:
+            Number of rows inserted
+
+        Raises:
+            Exception: If an insert fails (earlier batches stay inserted)
+        """
+        batch_size = max(1, batch_size)
+        inserted = 0
+        for start in range(0, len(jobs), batch_size):
+            rows = [job_to_row(job, self.content_store) for job in jobs[start:start + batch_size]]
+            self.supabase.table("crawl_jobs").insert(rows).execute()
+            inserted += len(rows)
+        self.rows_inserted += inserted
+        return inserted
+
+    async def flush(self, raise_errors: bool = False) -> int:
+        """
+        Upsert every buffered row in one request.
+
+        Args:
+            raise_errors: Re-raise a failed upsert instead of only logging it
+
+        Returns:
+            Number of rows written
+        """
+        if not self._pending:
+            return 0
+        rows: List[Dict[str, Any]] = list(self._pending.values())
+        self._pending = {}
+        try:
+            self.supabase.table("crawl_jobs").upsert(rows).execute()
+        except Exception as e:
+            # Keep newer rows written while this batch was in flight
+            for row in rows:
+                self._pending.setdefault(row["id"], row)
+            logger.error(f"Error flushing {len(rows)} crawl job rows: {e}")
+            if raise_errors:
+                raise
+            return 0
+        self.flushes += 1
+        self.rows_flushed += len(rows)
+        return len(rows)
+
+    async def close(self) -> None:
+        """Stop the background flusher and flush what is left."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            if self._flusher.get_loop() is asyncio.get_running_loop():
+                await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        """Write, coalescing and flush counts."""
+        return {
+            "writes": self.writes,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "rows_flushed": self.rows_flushed,
+            "rows_inserted": self.rows_inserted,
+            "pending": len(self._pending),
+        }
+
+    def _ensure_flusher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._flusher is None or self._flusher.done() or self._flusher.get_loop() is not loop:
+            self._wake = asyncio.Event()
+            self._flusher = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Flush on the interval, or early when the size trigger fires."""
+        while True:
+            # asyncio.wait rather than wait_for: wait_for can swallow a cancel that races the wake-up
+            wake = asyncio.ensure_future(self._wake.wait())
+            try:
+                await asyncio.wait([wake], timeout=self.flush_interval)
+            finally:
+                wake.cancel()
+            self._wake.clear()
+            await self.flush()
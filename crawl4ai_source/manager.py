@@ -6,16 +6,38 @@ of crawl jobs, including persistence, queuing, and execution management.
 """
 
 import asyncio
+import base64
+import functools
 import json
 import logging
+import threading
+import uuid
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterable, Coroutine, Dict, Iterable, List, Optional, Tuple, Union
 from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
 
 from supabase import Client
 
 from .models import CrawlJob, CrawlStatus, CrawlConfig, CrawlResult
 from .service import CrawlService
+from .crawl_cache import CrawlCache
+from .deduplicator import ContentDeduplicator, normalize_url
+from .job_store import JOB_INSERT_BATCH, JobStateStore
+from .content_store import create_content_store
+from .scheduler import CrawlScheduler
+from .sitemap import stream_sitemap_urls
+from .pipeline import (
+    IngestPipeline,
+    PipelineItem,
+    PipelineStage,
+    PIPELINE_EMBED_WORKERS,
+    PIPELINE_GRAPH_DROP_WHEN_FULL,
+    PIPELINE_GRAPH_QUEUE_SIZE,
+    PIPELINE_GRAPH_WORKERS,
+    PIPELINE_QUEUE_SIZE,
+    PIPELINE_VECTOR_WORKERS,
+)
 
 # Import Graphiti integration
 try:
@@ -37,15 +59,81 @@ except ImportError:
 
 # Import embedding function
 try:
-    from app import get_embedding_ollama
+    from app import embed_text
     EMBEDDING_AVAILABLE = True
 except ImportError:
     EMBEDDING_AVAILABLE = False
-    get_embedding_ollama = None
+    embed_text = None
     logging.warning("Embedding function not available. Vector embeddings will be disabled.")
 
 logger = logging.getLogger(__name__)
 
+# crawl_jobs columns for status listings: everything except the config and result JSON
+JOB_SUMMARY_COLUMNS = "id,url,status,created_at,updated_at,completed_at,error_message,priority,queued_at"
+# Columns needed to run a job: the summary plus its config, still without the result
+JOB_STATE_COLUMNS = f"{JOB_SUMMARY_COLUMNS},config"
+
+
+def encode_job_cursor(job: CrawlJob) -> str:
+    """
+    Encode the keyset position after a job in a listing.
+
+    Args:
+        job: Last job of a page
+
+    Returns:
+        Opaque cursor for the next page
+    """
+    position = f"{job.created_at.isoformat()}|{job.id}"
+    return base64.urlsafe_b64encode(position.encode("utf-8")).decode("ascii")
+
+
+def decode_job_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a cursor from encode_job_cursor.
+
+    Args:
+        cursor: Cursor returned with a previous page
+
+    Returns:
+        (created_at ISO timestamp, job id) of the last job already listed
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, job_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|", 1)
+        datetime.fromisoformat(created_at)
+        # Both parts end up in a PostgREST filter string, so only well-formed values pass
+        job_id = str(uuid.UUID(job_id))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return created_at, job_id
+
+
+async def _aiter(items: Union[Iterable[Any], AsyncIterable[Any]]):
+    """Iterate a sync or async iterable asynchronously."""
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def _is_crawlable_url(url: Any, allowed_host: Optional[str] = None) -> bool:
+    """Whether url is an absolute http(s) URL, on allowed_host when one is given."""
+    if not isinstance(url, str):
+        return False
+    try:
+        parsed = urlparse(url)
+        host = parsed.hostname
+    except ValueError:
+        return False
+    if parsed.scheme not in ("http", "https") or not parsed.netloc or not host:
+        return False
+    return allowed_host is None or host == allowed_host.lower()
+
 
 class CrawlJobManager:
     """
@@ -53,6 +141,14 @@ class CrawlJobManager:
 
     Handles creating, updating, and executing crawl jobs with proper
     persistence to Supabase and integration with the CrawlService.
+    Started jobs are queued in a CrawlScheduler and run by a fixed pool of
+    max_concurrent_jobs workers, so starting a job never fails for capacity.
+    Job state goes through a write-behind JobStateStore: intermediate
+    transitions are batched, while creation and terminal states are written
+    before the call returns. Crawled pages are handed to an IngestPipeline
+    (embed -> vector write, and graph extraction in parallel), so a job is
+    completed once its pages are crawled and stored, while embeddings and
+    graph episodes follow asynchronously.
     """
 
     def __init__(self, supabase_client: Client, max_concurrent_jobs: int = 5):
@@ -61,13 +157,36 @@ class CrawlJobManager:
 
         Args:
             supabase_client: Supabase client for database operations
-            max_concurrent_jobs: Maximum number of concurrent crawl jobs
+            max_concurrent_jobs: Number of scheduler workers running jobs concurrently
         """
         self.supabase = supabase_client
         self.max_concurrent_jobs = max_concurrent_jobs
         self._executor = ThreadPoolExecutor(max_workers=max_concurrent_jobs)
         self._active_jobs: Dict[str, asyncio.Task] = {}
         self._crawl_service: Optional[CrawlService] = None
+        self._crawl_cache = CrawlCache(supabase_client)
+        self._deduplicator = ContentDeduplicator(supabase_client)
+        # Page bodies are stored once per content hash; job results reference the hash
+        self._content_store = create_content_store(supabase_client)
+        self._job_store = JobStateStore(supabase_client, content_store=self._content_store)
+        self._scheduler = CrawlScheduler(self._run_scheduled_job, num_workers=max_concurrent_jobs)
+        self._pipeline = IngestPipeline(
+            [
+                PipelineStage("embed", self._embed_stage, PIPELINE_EMBED_WORKERS, PIPELINE_QUEUE_SIZE,
+                              downstream=("vector_store",)),
+                PipelineStage("vector_store", self._vector_store_stage, PIPELINE_VECTOR_WORKERS, PIPELINE_QUEUE_SIZE),
+                # Graph extraction is the slow LLM stage: its own branch with a deep queue. Once
+                # that queue is full it throttles crawling, unless configured to drop pages
+                PipelineStage("graph", self._graph_stage, PIPELINE_GRAPH_WORKERS, PIPELINE_GRAPH_QUEUE_SIZE,
+                              drop_when_full=PIPELINE_GRAPH_DROP_WHEN_FULL),
+            ],
+            entry=("embed", "graph"),
+        )
+
+        # Long-lived loop for callers without one (e.g. Flask request handlers)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -79,15 +198,26 @@ class CrawlJobManager:
         await self.stop()
 
     async def start(self) -> None:
-        """Start the job manager and crawl service."""
-        self._crawl_service = CrawlService()
+        """Start the job manager, crawl service and scheduler workers."""
+        self._crawl_service = CrawlService(cache=self._crawl_cache)
         await self._crawl_service.start()
+        await self._pipeline.start()
+        await self._scheduler.start()
+
+        # Load stored content hashes into the deduplicator's in-process front tier
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._deduplicator.warm_up)
+        except Exception as e:
+            logger.warning(f"Dedup cache warm-up failed, lookups will use the database: {e}")
 
         # Resume any pending jobs from database
         await self._resume_pending_jobs()
 
     async def stop(self) -> None:
         """Stop the job manager and cleanup resources."""
+        # Stop taking new work; queued jobs remain queued in the database
+        await self._scheduler.stop()
+
         # Cancel all active jobs
         for task in self._active_jobs.values():
             if not task.done():
@@ -97,90 +227,343 @@ class CrawlJobManager:
         if self._active_jobs:
             await asyncio.gather(*self._active_jobs.values(), return_exceptions=True)
 
+        # Let pages already crawled finish embedding and graph extraction
+        await self._pipeline.stop()
+
         # Stop crawl service
         if self._crawl_service:
             await self._crawl_service.stop()
 
+        # Write out job states still buffered
+        await self._job_store.close()
+
         # Shutdown executor
         self._executor.shutdown(wait=True)
 
-    async def create_job(self, url: str, config: CrawlConfig) -> CrawlJob:
+    def run_sync(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """
+        Run a manager coroutine on the manager's background event loop.
+
+        Scheduler workers and job tasks live on this loop, so they keep running
+        after a synchronous caller (such as a Flask view) returns.
+
+        Args:
+            coro: Coroutine to run, e.g. manager.start_job(job_id)
+            timeout: Seconds to wait for the result
+
+        Returns:
+            The coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result(timeout)
+
+    def shutdown(self) -> None:
+        """Stop the manager and its background event loop, if one was started."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop, self._loop_thread = None, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self.stop(), loop).result(timeout=60)
+        except Exception as e:
+            logger.error(f"Error stopping crawl job manager: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=10)
+        loop.close()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="crawl-manager-loop", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get scheduler and fetcher metrics.
+
+        Returns:
+            Dict with queue depth, in-flight jobs and wait/service time statistics,
+            job state write batching under 'job_store', per-stage ingest queues under
+            'pipeline', content store compression under 'content_store', plus browser
+            pool, static fast path and rate limiter usage under 'fetch'
+        """
+        metrics = self._scheduler.metrics()
+        metrics['job_store'] = self._job_store.stats()
+        metrics['pipeline'] = self._pipeline.metrics()
+        if self._content_store is not None:
+            metrics['content_store'] = self._content_store.stats()
+        if self._crawl_service is not None:
+            metrics['fetch'] = self._crawl_service.fetch_stats()
+        return metrics
+
+    async def create_job(self, url: str, config: CrawlConfig, priority: int = 0) -> CrawlJob:
         """
         Create a new crawl job.
 
         Args:
             url: URL to crawl
             config: Crawling configuration
+            priority: Scheduling priority (higher runs first)
 
         Returns:
             Created CrawlJob object
         """
-        job = CrawlJob(url=url, config=config)
+        job = CrawlJob(url=url, config=config, priority=priority)
 
-        # Persist to database
-        await self._persist_job(job)
+        # Persist to database before handing the ID out
+        await self._persist_job(job, flush=True)
 
         logger.info(f"Created crawl job {job.id} for URL: {url}")
         return job
 
-    async def get_job(self, job_id: str) -> Optional[CrawlJob]:
+    async def create_jobs_bulk(
+        self,
+        urls: Union[Iterable[str], AsyncIterable[str]],
+        config: CrawlConfig,
+        priority: int = 0,
+        start: bool = True,
+        batch_size: int = JOB_INSERT_BATCH,
+        allowed_host: Optional[str] = None
+    ) -> Tuple[List[CrawlJob], int, int]:
+        """
+        Create one job per URL with batched inserts.
+
+        URLs are consumed as they arrive (an async iterable such as a
+        sitemap stream works), so jobs of the first batch are inserted and
+        queued while later URLs are still being read. URLs that normalize to
+        one already seen in this call are skipped, and so are URLs that are
+        not http(s) or whose host is not allowed_host.
+
+        Args:
+            urls: URLs to crawl
+            config: Crawling configuration shared by all jobs
+            priority: Scheduling priority (higher runs first)
+            start: Queue the jobs for execution as they are inserted
+            batch_size: Rows per INSERT
+            allowed_host: Only accept URLs on this host (None accepts any host)
+
+        Returns:
+            (created jobs, number of duplicate URLs skipped, number of invalid URLs rejected)
+
+        Raises:
+            Exception: If an insert fails (jobs of earlier batches stay created)
+        """
+        jobs: List[CrawlJob] = []
+        batch: List[CrawlJob] = []
+        seen = set()
+        duplicates = 0
+        rejected = 0
+
+        async def insert(batch: List[CrawlJob]) -> None:
+            await self._job_store.insert_many(batch, batch_size)
+            jobs.extend(batch)
+            if start:
+                for job in batch:
+                    await self._enqueue(job)
+
+        async for url in _aiter(urls):
+            if not _is_crawlable_url(url, allowed_host):
+                rejected += 1
+                logger.debug(f"Rejected URL for bulk crawl: {url!r}")
+                continue
+            key = normalize_url(url)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            job = CrawlJob(url=url, config=config, priority=priority)
+            if start:
+                # queued_at in the inserted row lets a restart resume the job
+                job.mark_queued()
+            batch.append(job)
+            if len(batch) >= batch_size:
+                await insert(batch)
+                batch = []
+        if batch:
+            await insert(batch)
+
+        logger.info(
+            f"Created {len(jobs)} crawl jobs in bulk "
+            f"({duplicates} duplicate URLs skipped, {rejected} invalid URLs rejected)"
+        )
+        return jobs, duplicates, rejected
+
+    async def create_jobs_from_sitemap(
+        self,
+        sitemap_url: str,
+        config: CrawlConfig,
+        max_urls: int,
+        priority: int = 0,
+        start: bool = True
+    ) -> Tuple[List[CrawlJob], int, int]:
+        """
+        Create one job per page listed in a sitemap or sitemap index.
+
+        The sitemap is parsed while it downloads and jobs are inserted in
+        batches along the way, see create_jobs_bulk(). As the sitemap
+        protocol requires, only pages on the sitemap's own host are accepted;
+        other entries are counted as rejected.
+
+        Args:
+            sitemap_url: Sitemap or sitemap index URL
+            config: Crawling configuration shared by all jobs
+            max_urls: Stop after this many page URLs
+            priority: Scheduling priority (higher runs first)
+            start: Queue the jobs for execution as they are inserted
+
+        Returns:
+            (created jobs, number of duplicate URLs skipped, number of invalid URLs rejected)
+
+        Raises:
+            SitemapError: If the sitemap cannot be fetched or parsed
+        """
+        urls = stream_sitemap_urls(sitemap_url, max_urls, config.user_agent, config.timeout_seconds)
+        return await self.create_jobs_bulk(
+            urls, config, priority=priority, start=start, allowed_host=urlparse(sitemap_url).hostname
+        )
+
+    async def get_job(self, job_id: str, include_result: bool = True) -> Optional[CrawlJob]:
         """
         Get a job by ID.
 
         Args:
             job_id: Job ID to retrieve
+            include_result: Load the result JSON (page content); status checks can skip it
 
         Returns:
             CrawlJob object if found, None otherwise
         """
+        # A buffered state is newer than the stored row
+        pending = self._job_store.pending_row(job_id)
+        if pending is not None:
+            return await self._load_content(self._job_from_db_row(pending))
+
         try:
-            response = self.supabase.table("crawl_jobs").select("*").eq("id", job_id).execute()
+            columns = "*" if include_result else JOB_STATE_COLUMNS
+            response = self.supabase.table("crawl_jobs").select(columns).eq("id", job_id).execute()
 
             if not response.data:
                 return None
 
             job_data = response.data[0]
-            return self._job_from_db_row(job_data)
+            return await self._load_content(self._job_from_db_row(job_data))
 
         except Exception as e:
             logger.error(f"Error retrieving job {job_id}: {e}")
             return None
 
-    async def list_jobs(self, status: Optional[CrawlStatus] = None, limit: int = 50) -> List[CrawlJob]:
+    async def _load_content(self, job: CrawlJob) -> CrawlJob:
+        """Fill in a result body that was saved in the content store instead of the job row."""
+        result = job.result
+        if result is not None and not result.content and result.content_size and self._content_store is not None:
+            # Store reads are blocking network/disk I/O
+            content = await asyncio.get_running_loop().run_in_executor(
+                None, self._content_store.get, result.content_hash
+            )
+            result.content = content or ""
+        return job
+
+    async def list_jobs(
+        self,
+        status: Optional[CrawlStatus] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> List[CrawlJob]:
         """
-        List crawl jobs with optional filtering.
+        List crawl job summaries with optional filtering, newest first.
+
+        Only summary columns are read, so the jobs have no config or result.
+        Pages are keyset-paginated on (created_at, id): pass the
+        encode_job_cursor() of the previous page's last job as cursor.
 
         Args:
             status: Filter by job status
             limit: Maximum number of jobs to return
+            cursor: Position after which to continue the listing
 
         Returns:
             List of CrawlJob objects
+
+        Raises:
+            ValueError: If the cursor is malformed
         """
+        after = decode_job_cursor(cursor) if cursor else None
+
+        # Buffered transitions are newer than the stored rows; they are merged in memory
+        # below. Over-fetch by their count so rows they move out of the status filter
+        # cannot shorten the page.
+        pending = self._job_store.pending_rows()
+
         try:
-            query = self.supabase.table("crawl_jobs").select("*").order("created_at", desc=True).limit(limit)
+            query = (
+                self.supabase.table("crawl_jobs")
+                .select(JOB_SUMMARY_COLUMNS)
+                .order("created_at", desc=True)
+                .order("id", desc=True)
+                .limit(limit + len(pending))
+            )
 
             if status:
                 query = query.eq("status", status.value)
+            if after:
+                created_at, job_id = after
+                # Rows strictly after the cursor in (created_at DESC, id DESC) order
+                query = query.or_(
+                    f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt."{job_id}")'
+                )
 
             response = query.execute()
-            return [self._job_from_db_row(row) for row in response.data]
+            return self._merge_pending(response.data, pending, status, after, limit)
 
         except Exception as e:
             logger.error(f"Error listing jobs: {e}")
             return []
 
+    def _merge_pending(
+        self,
+        rows: List[Dict[str, Any]],
+        pending: List[Dict[str, Any]],
+        status: Optional[CrawlStatus],
+        after: Optional[Tuple[str, str]],
+        limit: int
+    ) -> List[CrawlJob]:
+        """Overlay buffered job rows on a listing page, keeping its filter and order."""
+        summary_columns = JOB_SUMMARY_COLUMNS.split(",")
+        by_id = {row["id"]: row for row in rows}
+        for row in pending:
+            if row["id"] not in by_id and status and row["status"] != status.value:
+                continue
+            by_id[row["id"]] = {column: row.get(column) for column in summary_columns}
+
+        jobs = [self._job_from_db_row(row) for row in by_id.values()]
+        if status:
+            jobs = [job for job in jobs if job.status == status]
+        if after:
+            position = (datetime.fromisoformat(after[0]), after[1])
+            jobs = [job for job in jobs if (job.created_at, job.id) < position]
+        jobs.sort(key=lambda job: (job.created_at, job.id), reverse=True)
+        return jobs[:limit]
+
     async def start_job(self, job_id: str) -> bool:
         """
-        Start execution of a crawl job.
+        Queue a crawl job for execution.
+
+        The job runs as soon as a scheduler worker is free, in priority order
+        with per-domain fairness. Jobs are queued rather than rejected when all
+        workers are busy.
 
         Args:
             job_id: ID of job to start
 
         Returns:
-            True if job was started successfully, False otherwise
+            True if job was queued (or already is), False otherwise
         """
-        job = await self.get_job(job_id)
+        job = await self.get_job(job_id, include_result=False)
         if not job:
             logger.warning(f"Job {job_id} not found")
             return False
@@ -189,16 +572,15 @@ class CrawlJobManager:
             logger.warning(f"Job {job_id} is not in pending status (current: {job.status.value})")
             return False
 
-        # Check concurrent job limit
-        if len(self._active_jobs) >= self.max_concurrent_jobs:
-            logger.warning(f"Maximum concurrent jobs ({self.max_concurrent_jobs}) reached")
-            return False
+        if self._scheduler.is_queued(job_id):
+            return True
 
-        # Start the job execution
-        task = asyncio.create_task(self._execute_job(job))
-        self._active_jobs[job_id] = task
+        # Persist the queue position so it survives a restart
+        job.mark_queued()
+        await self._persist_job(job)
 
-        logger.info(f"Started execution of job {job_id}")
+        await self._enqueue(job)
+        logger.info(f"Queued job {job_id} (priority {job.priority})")
         return True
 
     async def cancel_job(self, job_id: str) -> bool:
@@ -211,13 +593,16 @@ class CrawlJobManager:
         Returns:
             True if job was cancelled successfully, False otherwise
         """
-        job = await self.get_job(job_id)
+        job = await self.get_job(job_id, include_result=False)
         if not job:
             return False
 
         if job.status not in [CrawlStatus.PENDING, CrawlStatus.RUNNING]:
             return False
 
+        # Drop it from the queue if it has not started yet
+        self._scheduler.cancel(job_id)
+
         # Cancel the task if it's running
         if job_id in self._active_jobs:
             task = self._active_jobs[job_id]
@@ -232,6 +617,28 @@ class CrawlJobManager:
         logger.info(f"Cancelled job {job_id}")
         return True
 
+    async def _enqueue(self, job: CrawlJob) -> None:
+        """Hand a job to the scheduler, starting the worker pool if needed."""
+        if not self._scheduler.running:
+            await self._scheduler.start()
+        await self._scheduler.submit(job.id, job.url, job.priority)
+
+    async def _run_scheduled_job(self, job_id: str) -> None:
+        """Scheduler runner: execute a queued job unless it was cancelled meanwhile."""
+        job = await self.get_job(job_id, include_result=False)
+        if not job or job.status != CrawlStatus.PENDING:
+            logger.info(f"Skipping queued job {job_id}: no longer pending")
+            return
+
+        if not self._crawl_service:
+            self._crawl_service = CrawlService(cache=self._crawl_cache)
+            await self._crawl_service.start()
+
+        # Run in its own task so cancel_job() does not cancel the worker
+        task = asyncio.create_task(self._execute_job(job))
+        self._active_jobs[job_id] = task
+        await asyncio.wait([task])
+
     async def _execute_job(self, job: CrawlJob) -> None:
         """
         Execute a crawl job.
@@ -248,19 +655,34 @@ class CrawlJobManager:
             if not self._crawl_service:
                 raise RuntimeError("Crawl service not available")
 
-            result = await self._crawl_service.crawl_url(job.url, job.config)
-
-            # Store the result in database
-            await self._persist_crawl_result(job.id, result)
+            # Crawl up to config.max_depth; each page is stored and sent
+            # downstream as soon as it completes
+            result = None
+            pages_crawled = 0
+            pages_unchanged = 0
+            async for page in self._crawl_service.crawl_site(job.url, job.config):
+                pages_crawled += 1
+                if result is None:
+                    result = page
+
+                if page.unchanged:
+                    pages_unchanged += 1
+                else:
+                    # Store the result in database
+                    await self._persist_crawl_result(job.id, page)
+
+                # Integrate with downstream systems (Graphiti and Supabase)
+                await self._integrate_with_downstream(job, page)
+
+            # The start page is the job result
+            result.metadata['pages_crawled'] = pages_crawled
+            result.metadata['pages_unchanged'] = pages_unchanged
 
             # Mark job as completed
             job.mark_completed(result)
             await self._persist_job(job)
 
-            # Integrate with downstream systems (Graphiti and Supabase)
-            await self._integrate_with_downstream(job, result)
-
-            logger.info(f"Completed job {job.id} successfully")
+            logger.info(f"Completed job {job.id} successfully ({pages_crawled} pages)")
 
         except asyncio.CancelledError:
             # Job was cancelled
@@ -281,52 +703,87 @@ class CrawlJobManager:
 
     async def _integrate_with_downstream(self, job: CrawlJob, result: CrawlResult) -> None:
         """
-        Integrate crawled content with downstream systems (Graphiti and Supabase).
+        Hand crawled content to the downstream pipeline (Supabase vectors and Graphiti).
+
+        Returns once the page is queued; waits only while the pipeline's
+        entry queues are full.
 
         Args:
-            job: The completed crawl job
+            job: The crawl job
             result: The crawl result with content
         """
-        # Integrate with Supabase vector storage
-        await self._integrate_with_supabase(job, result)
+        # Unchanged since the last crawl: embeddings and graph facts are already current
+        if result.unchanged:
+            logger.debug(f"Skipping downstream integration for unchanged page {result.url}")
+            return
 
-        # Integrate with Graphiti for entity extraction
-        await self._integrate_with_graphiti(job, result)
+        await self._pipeline.submit(job, result)
 
-    async def _integrate_with_supabase(self, job: CrawlJob, result: CrawlResult) -> None:
+    async def _embed_stage(self, item: PipelineItem) -> PipelineItem:
+        """Pipeline stage: compute the page embedding off the event loop."""
+        if EMBEDDING_AVAILABLE and embed_text:
+            item.data["embedding"], item.data["embedding_model"] = await asyncio.get_running_loop().run_in_executor(
+                None, embed_text, item.result.content
+            )
+        return item
+
+    async def _vector_store_stage(self, item: PipelineItem) -> None:
+        """Pipeline stage: write the page and its embedding to Supabase vector storage."""
+        await self._integrate_with_supabase(
+            item.job, item.result, embedding=item.data.get("embedding"), embedding_model=item.data.get("embedding_model")
+        )
+
+    async def _graph_stage(self, item: PipelineItem) -> None:
+        """Pipeline stage: extract entities into the Graphiti knowledge graph."""
+        await self._integrate_with_graphiti(item.job, item.result)
+
+    async def _integrate_with_supabase(
+        self,
+        job: CrawlJob,
+        result: CrawlResult,
+        embedding: Optional[List[float]] = None,
+        embedding_model: Optional[str] = None
+    ) -> None:
         """
         Store crawled content in Supabase vector storage for semantic search.
 
         Args:
             job: The completed crawl job
             result: The crawl result with content
+            embedding: Precomputed embedding of the content (computed here if None)
+            embedding_model: Version tag of the model that produced embedding (None if untagged)
+
+        Raises:
+            Exception: Embedding or storage errors, counted as failures by the pipeline stage
         """
-        if not SUPABASE_AVAILABLE or not add_document_to_supabase or not EMBEDDING_AVAILABLE or not get_embedding_ollama:
+        if not SUPABASE_AVAILABLE or not add_document_to_supabase or not EMBEDDING_AVAILABLE or not embed_text:
             logger.debug("Supabase vector storage not available, skipping")
             return
 
-        try:
-            # Generate embedding for the crawled content
-            embedding = get_embedding_ollama(result.content)
-
-            # Create metadata for the crawled content
-            metadata = {
-                "source_url": result.url,
-                "crawl_job_id": job.id,
-                "title": result.title or "Crawled Content",
-                "content_hash": result.content_hash,
-                "extracted_at": result.extracted_at.isoformat(),
-                "content_size": result.content_size,
-            }
+        # Generate embedding for the crawled content unless the embed stage already did
+        loop = asyncio.get_running_loop()
+        if embedding is None:
+            embedding, embedding_model = await loop.run_in_executor(None, embed_text, result.content)
 
-            # Store in Supabase vector storage
-            response = add_document_to_supabase(result.content, metadata=metadata, embedding=embedding)
+        # Create metadata for the crawled content
+        metadata = {
+            "source_url": result.url,
+            "crawl_job_id": job.id,
+            "title": result.title or "Crawled Content",
+            "content_hash": result.content_hash,
+            "extracted_at": result.extracted_at.isoformat(),
+            "content_size": result.content_size,
+        }
 
-            logger.info(f"Successfully stored crawled content from {result.url} in Supabase vector storage")
+        # Store in Supabase vector storage
+        await loop.run_in_executor(
+            None, functools.partial(
+                add_document_to_supabase, result.content, metadata=metadata, embedding=embedding,
+                embedding_model=embedding_model
+            )
+        )
 
-        except Exception as e:
-            logger.error(f"Error storing content in Supabase: {e}")
-            # Don't fail the job if Supabase storage fails
+        logger.info(f"Successfully stored crawled content from {result.url} in Supabase vector storage")
 
     async def _integrate_with_graphiti(self, job: CrawlJob, result: CrawlResult) -> None:
         """
@@ -335,78 +792,84 @@ class CrawlJobManager:
         Args:
             job: The completed crawl job
             result: The crawl result with content
+
+        Raises:
+            RuntimeError: If Graphiti does not report success; counted as a failure by the pipeline stage
         """
         if not GRAPHITI_AVAILABLE or not add_episode:
             logger.debug("Graphiti not available, skipping entity extraction")
             return
 
-        try:
-            # Create a unique episode name based on job ID and URL
-            episode_name = f"crawl_{job.id}_{hash(result.url) % 10000}"
-
-            # Use the crawled content for entity extraction
-            episode_body = result.content[:10000]  # Limit content size for Graphiti processing
+        # Create a unique episode name based on job ID and URL
+        episode_name = f"crawl_{job.id}_{hash(result.url) % 10000}"
 
-            # Create source description
-            source_description = f"Crawled content from {result.url}"
+        # Use the full crawled content; graphiti_client splits long pages into chained episodes
+        episode_body = result.content
 
-            # Add to Graphiti knowledge graph
-            graph_result = await add_episode(
-                name=episode_name,
-                episode_body=episode_body,
-                source_description=source_description,
-                reference_time=result.extracted_at
-            )
+        # Create source description
+        source_description = f"Crawled content from {result.url}"
 
-            if graph_result.get("status") == "success":
-                logger.info(f"Successfully added crawled content from {result.url} to knowledge graph")
-            else:
-                logger.warning(f"Failed to add content to Graphiti: {graph_result.get('error', 'Unknown error')}")
+        # Add to Graphiti knowledge graph
+        graph_result = await add_episode(
+            name=episode_name,
+            episode_body=episode_body,
+            source_description=source_description,
+            reference_time=result.extracted_at,
+            group_id=job.config.group_id
+        )
 
-        except Exception as e:
-            logger.error(f"Error integrating with Graphiti: {e}")
-            # Don't fail the job if Graphiti integration fails
+        if graph_result.get("status") == "success":
+            logger.info(f"Successfully added crawled content from {result.url} to knowledge graph")
+        else:
+            raise RuntimeError(f"Failed to add content to Graphiti: {graph_result.get('error', 'Unknown error')}")
 
     async def _resume_pending_jobs(self) -> None:
-        """Resume any pending or running jobs from the database."""
+        """Re-queue jobs that were queued or running when the service stopped."""
         try:
             # Get jobs that should be running
-            response = self.supabase.table("crawl_jobs").select("*").in_("status", ["pending", "running"]).execute()
+            response = (
+                self.supabase.table("crawl_jobs")
+                .select("*")
+                .in_("status", ["pending", "running"])
+                .order("priority", desc=True)
+                .order("queued_at")
+                .execute()
+            )
 
             for row in response.data:
                 job = self._job_from_db_row(row)
 
                 # Only resume if not already active
-                if job.id not in self._active_jobs:
-                    if job.status == CrawlStatus.RUNNING:
-                        # Job was running when service stopped, restart it
-                        await self.start_job(job.id)
-                    # Pending jobs stay pending
+                if job.id in self._active_jobs or self._scheduler.is_queued(job.id):
+                    continue
+                if job.status == CrawlStatus.RUNNING:
+                    # Job was running when service stopped, run it again
+                    job.status = CrawlStatus.PENDING
+                    job.mark_queued()
+                    await self._persist_job(job)
+                    await self._enqueue(job)
+                elif job.queued_at is not None:
+                    await self._enqueue(job)
+                # Pending jobs that were never started stay pending
 
         except Exception as e:
             logger.error(f"Error resuming pending jobs: {e}")
 
-    async def _persist_job(self, job: CrawlJob) -> None:
+    async def _persist_job(self, job: CrawlJob, flush: bool = False) -> None:
         """
         Persist a job to the database.
 
+        Terminal states are written immediately; other transitions are
+        buffered and coalesced by the job store.
+
         Args:
             job: Job to persist
+            flush: Write immediately even if the job is not finished
         """
-        job_data = {
-            "id": job.id,
-            "url": job.url,
-            "status": job.status.value,
-            "created_at": job.created_at.isoformat(),
-            "updated_at": job.updated_at.isoformat(),
-            "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-            "config": json.dumps(job.config.to_dict()),
-            "result": json.dumps(job.result.to_dict()) if job.result else None,
-            "error_message": job.error_message,
-        }
-
-        # Upsert the job
-        self.supabase.table("crawl_jobs").upsert(job_data).execute()
+        if flush or job.status in (CrawlStatus.COMPLETED, CrawlStatus.FAILED, CrawlStatus.CANCELLED):
+            await self._job_store.write_now(job)
+        else:
+            await self._job_store.write(job)
 
     async def _persist_crawl_result(self, job_id: str, result: CrawlResult) -> None:
         """
@@ -425,10 +888,26 @@ class CrawlJobManager:
             "content_size": result.content_size,
             "extracted_at": result.extracted_at.isoformat(),
         }
+        # Fingerprint columns (URL/title hashes, SimHash and its LSH bands)
+        fingerprint = self._deduplicator.create_fingerprint(
+            result.url, result.content, result.title, signature=result.simhash
+        )
+        content_data.update(self._deduplicator.fingerprint_columns(fingerprint))
+
+        # Store the body first so the job row can reference it by hash
+        if self._content_store is not None and result.content:
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._content_store.put, result.content_hash, result.content
+                )
+            except Exception as e:
+                # The job result keeps the content inline instead
+                logger.warning(f"Error storing content for {result.url}: {e}")
 
         # Insert content (ignore if hash already exists due to unique constraint)
         try:
             self.supabase.table("crawl_content").insert(content_data).execute()
+            self._deduplicator.register(content_data["id"], fingerprint)
         except Exception as e:
             # If it's a duplicate hash, that's fine - content already exists
             if "duplicate key" not in str(e).lower():
@@ -458,4 +937,6 @@ class CrawlJobManager:
             config=config,
             result=result,
             error_message=row.get("error_message"),
+            priority=row.get("priority") or 0,
+            queued_at=datetime.fromisoformat(row["queued_at"]) if row.get("queued_at") else None,
         )
\ No newline at end of file
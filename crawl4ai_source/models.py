@@ -36,6 +36,10 @@ class CrawlConfig:
     user_agent: str = "RAGFlow-Crawler/1.0"
     follow_redirects: bool = True
     extract_metadata: bool = True
+    group_id: Optional[str] = None  # Graphiti partition for extracted entities (None: default partition)
+    # Site-crawl bounds for max_depth > 1 (None: CRAWL4AI_SITE_MAX_PAGES / CRAWL4AI_SITE_CONCURRENCY)
+    max_pages: Optional[int] = None
+    concurrency: Optional[int] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert config to dictionary for JSON serialization."""
@@ -47,6 +51,9 @@ class CrawlConfig:
             "user_agent": self.user_agent,
             "follow_redirects": self.follow_redirects,
             "extract_metadata": self.extract_metadata,
+            "group_id": self.group_id,
+            "max_pages": self.max_pages,
+            "concurrency": self.concurrency,
         }
 
     @classmethod
@@ -60,6 +67,9 @@ class CrawlConfig:
             user_agent=data.get("user_agent", "RAGFlow-Crawler/1.0"),
             follow_redirects=data.get("follow_redirects", True),
             extract_metadata=data.get("extract_metadata", True),
+            group_id=data.get("group_id"),
+            max_pages=data.get("max_pages"),
+            concurrency=data.get("concurrency"),
         )
 
 
@@ -80,6 +90,8 @@ class CrawlResult:
     content_size: int = 0
     crawl_time: float = 0.0
     extracted_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    unchanged: bool = False  # Same content as the previous crawl of this URL
+    simhash: Optional[int] = None  # 64-bit SimHash of content for near-duplicate detection
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert result to dictionary for JSON serialization."""
@@ -93,6 +105,8 @@ class CrawlResult:
             "content_size": self.content_size,
             "crawl_time": self.crawl_time,
             "extracted_at": self.extracted_at.isoformat(),
+            "unchanged": self.unchanged,
+            "simhash": self.simhash,
         }
 
     @classmethod
@@ -108,6 +122,8 @@ class CrawlResult:
             content_size=data.get("content_size", 0),
             crawl_time=data.get("crawl_time", 0.0),
             extracted_at=datetime.fromisoformat(data["extracted_at"]) if "extracted_at" in data else datetime.now(timezone.utc),
+            unchanged=data.get("unchanged", False),
+            simhash=data.get("simhash"),
         )
 
 
@@ -128,6 +144,8 @@ class CrawlJob:
     config: CrawlConfig = field(default_factory=CrawlConfig)
     result: Optional[CrawlResult] = None
     error_message: Optional[str] = None
+    priority: int = 0  # Higher values are scheduled first
+    queued_at: Optional[datetime] = None  # Set while waiting in the scheduler queue
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert job to dictionary for JSON serialization."""
@@ -135,6 +153,8 @@ class CrawlJob:
             "id": self.id,
             "url": self.url,
             "status": self.status.value,
+            "priority": self.priority,
+            "queued_at": self.queued_at.isoformat() if self.queued_at else None,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
@@ -156,8 +176,15 @@ class CrawlJob:
             config=CrawlConfig.from_dict(data["config"]),
             result=CrawlResult.from_dict(data["result"]) if data.get("result") else None,
             error_message=data.get("error_message"),
+            priority=data.get("priority", 0),
+            queued_at=datetime.fromisoformat(data["queued_at"]) if data.get("queued_at") else None,
         )
 
+    def mark_queued(self) -> None:
+        """Record that the job is waiting in the scheduler queue."""
+        self.queued_at = datetime.now(timezone.utc)
+        self.updated_at = datetime.now(timezone.utc)
+
     def mark_running(self) -> None:
         """Mark the job as running."""
         self.status = CrawlStatus.RUNNING
@@ -202,6 +229,9 @@ class CrawlJobRequest:
     user_agent: Optional[str] = "RAGFlow-Crawler/1.0"
     follow_redirects: Optional[bool] = True
     extract_metadata: Optional[bool] = True
+    priority: Optional[int] = 0
+    max_pages: Optional[int] = None
+    concurrency: Optional[int] = None
 
     def to_config(self) -> CrawlConfig:
         """Convert request to a CrawlConfig object."""
@@ -213,6 +243,8 @@ class CrawlJobRequest:
             user_agent=self.user_agent or "RAGFlow-Crawler/1.0",
             follow_redirects=self.follow_redirects if self.follow_redirects is not None else True,
             extract_metadata=self.extract_metadata if self.extract_metadata is not None else True,
+            max_pages=self.max_pages,
+            concurrency=self.concurrency,
         )
 
     @classmethod
@@ -235,6 +267,17 @@ class CrawlJobRequest:
                 raise BadRequest("Invalid URL format")
         except Exception:
             raise BadRequest("Invalid URL format")
+
+        priority = data.get("priority", 0)
+        if priority is None:
+            priority = 0
+        if isinstance(priority, bool) or not isinstance(priority, int) or not -100 <= priority <= 100:
+            raise BadRequest("priority must be an integer between -100 and 100")
+
+        for name in ("max_pages", "concurrency"):
+            value = data.get(name)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 1):
+                raise BadRequest(f"{name} must be a positive integer")
         
         return cls(
             url=url,
@@ -245,6 +288,73 @@ class CrawlJobRequest:
             user_agent=data.get("user_agent"),
             follow_redirects=data.get("follow_redirects"),
             extract_metadata=data.get("extract_metadata"),
+            priority=priority,
+            max_pages=data.get("max_pages"),
+            concurrency=data.get("concurrency"),
+        )
+
+
+@dataclass
+class CrawlBatchRequest:
+    """
+    Input for creating many crawl jobs at once.
+
+    Pages come either from an explicit URL list or from a sitemap (or
+    sitemap index) that is read while it downloads. The other fields are
+    the same as CrawlJobRequest's and apply to every created job.
+    """
+    options: CrawlJobRequest
+    urls: List[str] = field(default_factory=list)
+    sitemap: Optional[str] = None
+    max_urls: int = 50000
+    start: bool = True
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_urls: int = 50000) -> 'CrawlBatchRequest':
+        """
+        Create request from dictionary.
+
+        Args:
+            data: Request body
+            max_urls: Upper bound on jobs per request
+
+        Raises:
+            BadRequest: If the body is invalid
+        """
+        from werkzeug.exceptions import BadRequest
+        from urllib.parse import urlparse
+
+        if not isinstance(data, dict):
+            raise BadRequest("Data must be a dictionary")
+
+        urls = data.get("urls")
+        sitemap = data.get("sitemap")
+        if bool(urls) == bool(sitemap):
+            raise BadRequest("Provide either urls or sitemap")
+
+        if urls is not None:
+            if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+                raise BadRequest("urls must be a list of strings")
+            if len(urls) > max_urls:
+                raise BadRequest(f"At most {max_urls} urls per request")
+            for url in urls:
+                parsed = urlparse(url)
+                if parsed.scheme not in ("http", "https") or not parsed.netloc:
+                    raise BadRequest(f"Invalid URL format: {url}")
+
+        limit = data.get("max_urls", max_urls)
+        if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= max_urls:
+            raise BadRequest(f"max_urls must be an integer between 1 and {max_urls}")
+
+        # Shared job options go through the single-job validation
+        options = CrawlJobRequest.from_dict({**data, "url": sitemap or urls[0]})
+
+        return cls(
+            options=options,
+            urls=urls or [],
+            sitemap=sitemap,
+            max_urls=limit,
+            start=bool(data.get("start", True)),
         )
 
 
@@ -264,6 +374,7 @@ class CrawlJobResponse:
     completed_at: Optional[str]
     result: Optional[Dict[str, Any]]
     error_message: Optional[str]
+    priority: int = 0
 
     @classmethod
     def from_job(cls, job: CrawlJob) -> 'CrawlJobResponse':
@@ -277,4 +388,5 @@ class CrawlJobResponse:
             completed_at=job.completed_at.isoformat() if job.completed_at else None,
             result=job.result.to_dict() if job.result else None,
             error_message=job.error_message,
+            priority=job.priority,
         )
\ No newline at end of file
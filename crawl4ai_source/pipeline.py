@@ -0,0 +1,233 @@
+"""
+Staged ingest pipeline for Crawl4AI integration.
+
+This module provides the IngestPipeline class, which moves crawled pages
+through downstream stages (embedding, vector write, graph extraction), each
+with its own worker pool and bounded queue, so crawl workers hand pages off
+instead of waiting for slow downstream calls.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .scheduler import _Stat
+
+logger = logging.getLogger(__name__)
+
+# Worker and queue sizes per stage; crawl workers block once a stage's queue is full
+PIPELINE_QUEUE_SIZE = int(os.getenv("CRAWL4AI_PIPELINE_QUEUE_SIZE", "100"))
+PIPELINE_EMBED_WORKERS = int(os.getenv("CRAWL4AI_PIPELINE_EMBED_WORKERS", "2"))
+PIPELINE_VECTOR_WORKERS = int(os.getenv("CRAWL4AI_PIPELINE_VECTOR_WORKERS", "2"))
+PIPELINE_GRAPH_WORKERS = int(os.getenv("CRAWL4AI_PIPELINE_GRAPH_WORKERS", "1"))
+PIPELINE_GRAPH_QUEUE_SIZE = int(os.getenv("CRAWL4AI_PIPELINE_GRAPH_QUEUE_SIZE", "1000"))
+# By default a full graph queue makes crawl workers wait, so the graph lags but loses no page;
+# opt in to dropping pages from graph extraction instead of throttling the crawl
+PIPELINE_GRAPH_DROP_WHEN_FULL = os.getenv("CRAWL4AI_PIPELINE_GRAPH_DROP_WHEN_FULL", "false").lower() == "true"
+PIPELINE_DRAIN_SECONDS = float(os.getenv("CRAWL4AI_PIPELINE_DRAIN_SECONDS", "30"))
+
+
+@dataclass
+class PipelineItem:
+    """A crawled page travelling through the pipeline, plus what stages add to it."""
+    job: Any
+    result: Any
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+class PipelineStage:
+    """
+    One pipeline stage: a bounded queue served by a fixed pool of workers.
+
+    The handler receives an item and returns it (possibly enriched) to pass
+    it on to the downstream stages, or None to stop it here. Handler errors
+    are counted and logged; the item is not forwarded. A stage created with
+    drop_when_full skips items that arrive while its queue is full instead
+    of making the producer wait.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[PipelineItem], Awaitable[Optional[PipelineItem]]],
+        workers: int = 1,
+        max_queue: int = PIPELINE_QUEUE_SIZE,
+        downstream: Sequence[str] = (),
+        drop_when_full: bool = False
+    ):
+        """
+        Initialize the stage.
+
+        Args:
+            name: Stage name used in metrics and downstream references
+            handler: Coroutine function processing one item
+            workers: Concurrent handler calls
+            max_queue: Items waiting before producers block
+            downstream: Names of the stages that receive this stage's output
+            drop_when_full: Drop items arriving at a full queue instead of blocking the producer
+        """
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self.downstream = tuple(downstream)
+        self.drop_when_full = drop_when_full
+        self.queue: Optional[asyncio.Queue] = None
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.blocked_puts = 0
+        self.dropped = 0
+        self.wait_time = _Stat()
+        self.service_time = _Stat()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, worker usage, counts and wait/service time statistics."""
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "blocked_puts": self.blocked_puts,  # producers that had to wait for space
+            "dropped": self.dropped,  # items skipped because the queue was full
+            "wait_time": self.wait_time.summary(),
+            "service_time": self.service_time.summary(),
+        }
+
+
+class IngestPipeline:
+    """
+    Directed pipeline of stages connected by bounded queues.
+
+    submit() puts an item on every entry stage's queue and waits while a
+    queue is full, so a stage that falls behind pushes back on its producers
+    only once its own queue is full; stages on other branches keep going.
+    Stages created with drop_when_full never push back: items that find
+    their queue full are counted as dropped and skipped.
+    Workers start lazily on the first submit, on the running event loop.
+    """
+
+    def __init__(self, stages: Sequence[PipelineStage], entry: Sequence[str]):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages, upstream stages first
+            entry: Names of the stages that receive submitted items
+
+        Raises:
+            ValueError: If an entry or downstream name is not a stage
+        """
+        self.stages: Dict[str, PipelineStage] = {stage.name: stage for stage in stages}
+        self.entry = tuple(entry)
+        for name in self.entry + tuple(n for stage in stages for n in stage.downstream):
+            if name not in self.stages:
+                raise ValueError(f"Unknown pipeline stage: {name}")
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the stage workers are active."""
+        return any(not worker.done() for worker in self._workers)
+
+    async def start(self) -> None:
+        """Create the queues and start every stage's workers on the current event loop."""
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        self._loop = loop
+        for stage in self.stages.values():
+            stage.queue = asyncio.Queue(maxsize=stage.max_queue)
+        self._workers = [
+            asyncio.create_task(self._worker(stage, index), name=f"pipeline-{stage.name}-{index}")
+            for stage in self.stages.values()
+            for index in range(stage.workers)
+        ]
+        logger.info("Ingest pipeline started: " + ", ".join(
+            f"{stage.name} x{stage.workers}" for stage in self.stages.values()
+        ))
+
+    async def submit(self, job: Any, result: Any) -> None:
+        """
+        Hand a crawled page to the pipeline, waiting while a blocking entry queue is full.
+
+        Args:
+            job: Job the page belongs to
+            result: CrawlResult of the page
+        """
+        if not self.running or self._loop is not asyncio.get_running_loop():
+            await self.start()
+        item = PipelineItem(job=job, result=result)
+        for name in self.entry:
+            await self._put(self.stages[name], item)
+
+    async def join(self) -> None:
+        """Wait until every submitted item has passed through all stages."""
+        # Upstream stages first: their output lands in downstream queues before those are joined
+        for stage in self.stages.values():
+            if stage.queue is not None:
+                await stage.queue.join()
+
+    async def stop(self, drain_seconds: float = PIPELINE_DRAIN_SECONDS) -> None:
+        """
+        Stop the workers, first giving queued items up to drain_seconds to finish.
+
+        Args:
+            drain_seconds: Time allowed for draining (0 stops immediately)
+        """
+        if not self._workers:
+            return
+        if drain_seconds > 0:
+            try:
+                await asyncio.wait_for(self.join(), timeout=drain_seconds)
+            except asyncio.TimeoutError:
+                left = {name: stage.queue.qsize() for name, stage in self.stages.items() if stage.queue is not None}
+                logger.warning(f"Ingest pipeline stopped before draining, items left: {left}")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage metrics keyed by stage name."""
+        return {name: stage.metrics() for name, stage in self.stages.items()}
+
+    async def _put(self, stage: PipelineStage, item: PipelineItem) -> None:
+        entry: Tuple[float, PipelineItem] = (time.monotonic(), item)
+        try:
+            stage.queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            if stage.drop_when_full:
+                stage.dropped += 1
+                logger.warning(f"Pipeline stage {stage.name} queue full, dropping {item.result.url}")
+                return
+            stage.blocked_puts += 1
+            await stage.queue.put(entry)
+
+    async def _worker(self, stage: PipelineStage, index: int) -> None:
+        while True:
+            enqueued_at, item = await stage.queue.get()
+            started = time.monotonic()
+            stage.wait_time.add(started - enqueued_at)
+            stage.in_flight += 1
+            try:
+                output = await stage.handler(item)
+                stage.processed += 1
+                if output is not None:
+                    for name in stage.downstream:
+                        await self._put(self.stages[name], output)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stage.failed += 1
+                logger.error(f"Pipeline stage {stage.name} worker {index} failed on {item.result.url}: {e}")
+            finally:
+                stage.in_flight -= 1
+                stage.service_time.add(time.monotonic() - started)
+                stage.queue.task_done()
@@ -6,15 +6,41 @@ policies and prevent overwhelming target servers during crawling.
 """
 
 import asyncio
+import heapq
+import json
 import logging
+import os
 import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Callable, Deque, Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+# Default rule for domains without a specific one
+DEFAULT_REQUESTS_PER_MINUTE = int(os.getenv("CRAWL4AI_RATE_LIMIT_PER_MINUTE", "30"))
+DEFAULT_BURST_LIMIT = int(os.getenv("CRAWL4AI_RATE_LIMIT_BURST", "5"))
+
+# Adaptive (AIMD) rates and where learned rates are kept between restarts
+ADAPTIVE_RATE_LIMITS = os.getenv("CRAWL4AI_RATE_LIMIT_ADAPTIVE", "true").lower() == "true"
+RATE_LIMIT_STATE_PATH = os.getenv("CRAWL4AI_RATE_LIMIT_STATE_PATH", "")
+
+# Bounds on per-domain state: at most this many domains (0 = no cap), idle ones dropped after this long
+RATE_LIMIT_MAX_DOMAINS = int(os.getenv("CRAWL4AI_RATE_LIMIT_MAX_DOMAINS", "100000"))
+RATE_LIMIT_IDLE_SECONDS = float(os.getenv("CRAWL4AI_RATE_LIMIT_IDLE_SECONDS", "3600"))
+
+
+class RateLimitedError(Exception):
+    """Raised by fetchers when a server answers 429/503 so the limiter can back off."""
+
+    def __init__(self, url: str, status_code: int, retry_after: Optional[str] = None):
+        super().__init__(f"{url} rate limited (status {status_code})")
+        self.url = url
+        self.status_code = status_code
+        self.retry_after = retry_after
+
 
 @dataclass
 class RateLimitRule:
@@ -22,15 +48,53 @@ class RateLimitRule:
     requests_per_minute: int
     burst_limit: int = 0
     cooldown_seconds: float = 60.0
+    # Bounds for the adaptive rate; default to a quarter of requests_per_minute and
+    # requests_per_minute itself. Set max_requests_per_minute to let a domain go faster.
+    min_requests_per_minute: Optional[int] = None
+    max_requests_per_minute: Optional[int] = None
 
+    def rate_bounds(self) -> Tuple[float, float]:
+        """(min, max) requests per minute the adaptive rate may move between."""
+        low = self.min_requests_per_minute or max(1, self.requests_per_minute // 4)
+        # The configured rate is a ceiling unless the rule opts in to more
+        high = self.max_requests_per_minute or self.requests_per_minute
+        return float(low), float(max(low, high))
 
-@dataclass
+
+@dataclass(slots=True)
 class DomainStats:
-    """Statistics for domain rate limiting."""
+    """
+    Statistics and scheduling state for domain rate limiting.
+
+    Slotted, with the waiter queue created only when a request has to wait,
+    since a broad crawl keeps one of these per host it has touched.
+    """
     request_count: int = 0
     window_start: float = field(default_factory=time.time)
     last_request: float = 0.0
     cooldown_until: float = 0.0
+    tat: float = 0.0  # GCRA theoretical arrival time of the next request
+    waiters: Optional[Deque[asyncio.Future]] = None
+    dispatcher: Optional[asyncio.Task] = None
+    current_rpm: float = 0.0  # adaptive rate; 0 until the domain's first request
+    latency_fast: float = 0.0  # short-term latency EWMA (seconds)
+    latency_baseline: float = 0.0  # long-term latency EWMA (seconds)
+    responses: int = 0
+    last_decrease: float = 0.0
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for a slot."""
+        return len(self.waiters) if self.waiters else 0
+
+    def is_evictable(self, current_time: float) -> bool:
+        """Whether dropping this state loses nothing but counters (no waiters, slot or cooldown pending)."""
+        return (
+            not self.waiters
+            and (self.dispatcher is None or self.dispatcher.done())
+            and self.tat <= current_time
+            and self.cooldown_until <= current_time
+        )
 
 
 class RateLimiter:
@@ -39,17 +103,76 @@ class RateLimiter:
 
     Implements domain-based rate limiting with configurable rules
     and automatic cooldown periods for rate-limited domains.
+
+    Scheduling follows the generic cell rate algorithm (GCRA): each domain
+    keeps a theoretical arrival time (TAT) that advances by the emission
+    interval (60 / requests_per_minute) per request, and a request may go
+    once now >= TAT - burst tolerance. Checking and advancing the TAT happen
+    in one step with no await in between, so concurrent coroutines can never
+    pass the check together. Requests that must wait park in a per-domain
+    FIFO queue served by a single dispatcher task, so waiters hold no worker
+    or browser slot and a cooldown set by a 429 applies to everyone queued.
+
+    With adaptive rates on, each domain's rate follows AIMD: it grows by
+    increase_step requests per minute for every healthy response and is
+    multiplied by decrease_factor on a 429, a 5xx, a failed request or a
+    latency spike (short-term latency above latency_spike_ratio times the
+    long-term baseline), at most once per decrease_holdoff seconds so one
+    burst of errors counts once. The rate stays within the rule's
+    rate_bounds(), so by default it only ever backs off below the configured
+    requests_per_minute and recovers up to it. Learned rates are saved to state_path and reloaded on
+    start.
+
+    Domain state is kept in an LRU: on each new domain, state idle for
+    idle_seconds is dropped and, if max_domains is set, the least recently
+    used domains beyond it are too. Domains with queued requests, a pending
+    GCRA slot or an active cooldown are never dropped, and a dropped
+    domain's learned rate is kept, so eviction cannot loosen any limit.
     """
 
-    def __init__(self):
-        """Initialize the rate limiter."""
-        self._domain_stats: Dict[str, DomainStats] = {}
-        self._default_rule = RateLimitRule(requests_per_minute=30, burst_limit=5)
+    increase_step = 1.0
+    decrease_factor = 0.5
+    spike_decrease_factor = 0.75
+    latency_spike_ratio = 2.0
+    latency_warmup = 5  # responses before latency spikes are judged
+    decrease_holdoff = 5.0
+    save_interval = 30.0
+
+    def __init__(
+        self,
+        adaptive: Optional[bool] = None,
+        state_path: Optional[str] = None,
+        max_domains: Optional[int] = None,
+        idle_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            adaptive: Adjust per-domain rates from responses (default CRAWL4AI_RATE_LIMIT_ADAPTIVE)
+            state_path: JSON file for learned rates (default CRAWL4AI_RATE_LIMIT_STATE_PATH; empty disables)
+            max_domains: Domains kept in memory, 0 for no cap (default CRAWL4AI_RATE_LIMIT_MAX_DOMAINS)
+            idle_seconds: Idle time before a domain's state is dropped (default CRAWL4AI_RATE_LIMIT_IDLE_SECONDS)
+        """
+        self.adaptive = ADAPTIVE_RATE_LIMITS if adaptive is None else adaptive
+        self.state_path = RATE_LIMIT_STATE_PATH if state_path is None else state_path
+        self.max_domains = RATE_LIMIT_MAX_DOMAINS if max_domains is None else max_domains
+        self.idle_seconds = RATE_LIMIT_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        # Least recently used first
+        self._domain_stats: "OrderedDict[str, DomainStats]" = OrderedDict()
+        self._evicted = 0
+        self._default_rule = RateLimitRule(
+            requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, burst_limit=DEFAULT_BURST_LIMIT
+        )
         self._domain_rules: Dict[str, RateLimitRule] = {}
 
         # Pre-configured rules for common domains
         self._setup_default_rules()
 
+        self._learned_rates: "OrderedDict[str, float]" = OrderedDict(self._load_state() if self.adaptive else {})
+        self._last_save = time.time()
+        self._dirty = False
+
     def _setup_default_rules(self) -> None:
         """Setup default rate limiting rules for common domains."""
         # Conservative rules for major platforms
@@ -93,6 +216,8 @@ class RateLimiter:
         """
         Wait if necessary to respect rate limits for the given URL.
 
+        Returns once a request slot for the URL's domain has been reserved.
+
         Args:
             url: URL to check rate limits for
         """
@@ -103,23 +228,47 @@ class RateLimiter:
         rule = self.get_domain_rule(domain)
         stats = self._get_domain_stats(domain)
 
-        current_time = time.time()
-
-        # Check if in cooldown
-        if current_time < stats.cooldown_until:
-            wait_time = stats.cooldown_until - current_time
-            logger.debug(f"Rate limited for {domain}, waiting {wait_time:.2f}s")
-            await asyncio.sleep(wait_time)
+        # Fast path: nobody queued and a slot is free right now
+        if not stats.waiters and self._calculate_wait_time(stats, rule, time.time()) <= 0:
+            self._update_stats(stats, rule, time.time())
             return
 
-        # Check if we need to wait for rate limit
-        wait_time = self._calculate_wait_time(stats, rule, current_time)
-        if wait_time > 0:
-            logger.debug(f"Rate limiting {domain}, waiting {wait_time:.2f}s")
-            await asyncio.sleep(wait_time)
+        waiter = asyncio.get_running_loop().create_future()
+        if stats.waiters is None:
+            stats.waiters = deque()
+        stats.waiters.append(waiter)
+        if stats.dispatcher is None or stats.dispatcher.done():
+            stats.dispatcher = asyncio.create_task(self._dispatch(domain))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if stats.waiters and waiter in stats.waiters:
+                stats.waiters.remove(waiter)
+            raise
+
+    async def _dispatch(self, domain: str) -> None:
+        """Release a domain's queued waiters in FIFO order as GCRA slots open up."""
+        stats = self._get_domain_stats(domain)
+        while stats.waiters:
+            head = stats.waiters[0]
+            if head.done():
+                # Cancelled while queued
+                stats.waiters.popleft()
+                continue
 
-        # Update stats
-        self._update_stats(stats, current_time)
+            rule = self.get_domain_rule(domain)
+            wait_time = self._calculate_wait_time(stats, rule, time.time())
+            if wait_time > 0:
+                logger.debug(f"Rate limiting {domain}, next slot in {wait_time:.2f}s ({len(stats.waiters)} queued)")
+                # Re-check after sleeping: a 429 may have extended the cooldown meanwhile
+                await asyncio.sleep(wait_time)
+                continue
+
+            self._update_stats(stats, rule, time.time())
+            stats.waiters.popleft()
+            head.set_result(None)
+        # Free the empty queue so idle domains stay small
+        stats.waiters = None
 
     def _extract_domain(self, url: str) -> Optional[str]:
         """
@@ -145,7 +294,7 @@ class RateLimiter:
 
     def _get_domain_stats(self, domain: str) -> DomainStats:
         """
-        Get or create domain statistics.
+        Get or create domain statistics, marking the domain as recently used.
 
         Args:
             domain: Domain name
@@ -153,9 +302,47 @@ class RateLimiter:
         Returns:
             DomainStats object
         """
-        if domain not in self._domain_stats:
-            self._domain_stats[domain] = DomainStats()
-        return self._domain_stats[domain]
+        stats = self._domain_stats.get(domain)
+        if stats is not None:
+            self._domain_stats.move_to_end(domain)
+            return stats
+
+        self._evict(time.time())
+        stats = DomainStats()
+        if domain in self._learned_rates:
+            low, high = self.get_domain_rule(domain).rate_bounds()
+            stats.current_rpm = min(max(self._learned_rates[domain], low), high)
+        self._domain_stats[domain] = stats
+        return stats
+
+    def _evict(self, current_time: float) -> None:
+        """Drop idle domains and, over max_domains, the least recently used evictable ones."""
+        excess = len(self._domain_stats) + 1 - self.max_domains if self.max_domains else 0
+        # Walk from the LRU end without copying the keys; each entry is looked at once at most
+        for _ in range(len(self._domain_stats)):
+            domain, stats = next(iter(self._domain_stats.items()))
+            idle = current_time - max(stats.last_request, stats.window_start) >= self.idle_seconds
+            if excess <= 0 and not idle:
+                # Entries are in use order, so the rest were used more recently
+                break
+            if stats.is_evictable(current_time):
+                self._domain_stats.popitem(last=False)
+                self._evicted += 1
+                excess -= 1
+            else:
+                # Waiters or a pending slot mean the domain is in use: treat it as recently used
+                self._domain_stats.move_to_end(domain)
+
+    def _current_rate(self, stats: DomainStats, rule: RateLimitRule) -> float:
+        """Requests per minute currently allowed for a domain."""
+        if self.adaptive and stats.current_rpm > 0:
+            return stats.current_rpm
+        return float(rule.requests_per_minute)
+
+    def _emission_interval(self, rule: RateLimitRule, stats: Optional[DomainStats] = None) -> float:
+        """Seconds between requests at the sustained rate."""
+        rate = self._current_rate(stats, rule) if stats is not None else rule.requests_per_minute
+        return 60.0 / max(rate, 1)
 
     def _calculate_wait_time(self, stats: DomainStats, rule: RateLimitRule, current_time: float) -> float:
         """
@@ -169,40 +356,22 @@ class RateLimiter:
         Returns:
             Wait time in seconds (0 if no wait needed)
         """
-        # Reset window if needed
-        window_duration = 60.0  # 1 minute window
-        if current_time - stats.window_start >= window_duration:
-            stats.request_count = 0
-            stats.window_start = current_time
-
-        # Check burst limit first
-        if rule.burst_limit > 0 and stats.request_count >= rule.burst_limit:
-            # Calculate time until next window
-            time_to_next_window = window_duration - (current_time - stats.window_start)
-            return max(0, time_to_next_window)
-
-        # Check rate limit
-        if stats.request_count >= rule.requests_per_minute:
-            # Calculate time until next window
-            time_to_next_window = window_duration - (current_time - stats.window_start)
-            return max(0, time_to_next_window)
-
-        # Check minimum interval between requests
-        min_interval = 60.0 / rule.requests_per_minute
-        time_since_last = current_time - stats.last_request
-        if time_since_last < min_interval:
-            return min_interval - time_since_last
-
-        return 0.0
-
-    def _update_stats(self, stats: DomainStats, current_time: float) -> None:
+        interval = self._emission_interval(rule, stats)
+        # burst_limit requests may go back to back; 0 means no burst beyond one
+        tolerance = interval * (max(rule.burst_limit, 1) - 1)
+        allowed_at = max(stats.tat - tolerance, stats.cooldown_until)
+        return max(0.0, allowed_at - current_time)
+
+    def _update_stats(self, stats: DomainStats, rule: RateLimitRule, current_time: float) -> None:
         """
-        Update domain statistics after a request.
+        Reserve the current slot: advance the domain's TAT by one emission interval.
 
         Args:
             stats: Domain statistics to update
+            rule: Rate limiting rule
             current_time: Current timestamp
         """
+        stats.tat = max(stats.tat, current_time) + self._emission_interval(rule, stats)
         stats.request_count += 1
         stats.last_request = current_time
 
@@ -238,35 +407,175 @@ class RateLimiter:
         else:
             cooldown = rule.cooldown_seconds
 
-        stats.cooldown_until = time.time() + cooldown
+        cooldown = max(cooldown, 0.0)
+        stats.cooldown_until = max(stats.cooldown_until, time.time() + cooldown)
         logger.warning(f"Rate limited by {domain} (status {status_code}), cooling down for {cooldown:.2f}s")
+        if self.adaptive:
+            self._decrease(domain, stats, rule, self.decrease_factor, f"status {status_code}")
+
+    def record_response(self, url: str, status_code: Optional[int], latency: Optional[float] = None) -> None:
+        """
+        Feed a response back into the domain's adaptive rate.
 
-    def get_stats(self) -> Dict[str, dict]:
+        Args:
+            url: URL that was fetched
+            status_code: HTTP status, or None if the request failed (timeout, connection error)
+            latency: Seconds the request took, if measured
+        """
+        if not self.adaptive:
+            return
+        domain = self._extract_domain(url)
+        if not domain:
+            return
+
+        stats = self._get_domain_stats(domain)
+        rule = self.get_domain_rule(domain)
+        spike = latency is not None and self._observe_latency(stats, latency)
+
+        if status_code is None or status_code == 429 or status_code >= 500:
+            self._decrease(domain, stats, rule, self.decrease_factor,
+                           f"status {status_code}" if status_code else "request failure")
+        elif spike:
+            self._decrease(domain, stats, rule, self.spike_decrease_factor,
+                           f"latency {stats.latency_fast:.2f}s vs baseline {stats.latency_baseline:.2f}s")
+        elif status_code < 400:
+            low, high = rule.rate_bounds()
+            stats.current_rpm = min(max(self._current_rate(stats, rule) + self.increase_step, low), high)
+            self._remember_rate(domain, stats)
+
+    def _observe_latency(self, stats: DomainStats, latency: float) -> bool:
+        """Update the latency averages; True if the short-term average spiked above the baseline."""
+        stats.responses += 1
+        if stats.responses == 1:
+            stats.latency_fast = stats.latency_baseline = latency
+            return False
+        stats.latency_fast += 0.3 * (latency - stats.latency_fast)
+        spike = (
+            stats.responses > self.latency_warmup
+            and stats.latency_fast > self.latency_spike_ratio * stats.latency_baseline
+        )
+        # A spike does not move the baseline, so a slow server cannot teach us that slow is normal
+        if not spike:
+            stats.latency_baseline += 0.05 * (latency - stats.latency_baseline)
+        return spike
+
+    def _decrease(self, domain: str, stats: DomainStats, rule: RateLimitRule, factor: float, reason: str) -> None:
+        """Multiplicatively lower a domain's rate, once per decrease_holdoff."""
+        now = time.time()
+        if now - stats.last_decrease < self.decrease_holdoff:
+            return
+        stats.last_decrease = now
+        low, high = rule.rate_bounds()
+        previous = self._current_rate(stats, rule)
+        stats.current_rpm = min(max(previous * factor, low), high)
+        logger.info(f"Lowering {domain} to {stats.current_rpm:.1f} req/min (was {previous:.1f}): {reason}")
+        self._remember_rate(domain, stats)
+
+    def _remember_rate(self, domain: str, stats: DomainStats) -> None:
+        """Record a learned rate and save the state file at most every save_interval seconds."""
+        if self._learned_rates.get(domain) == stats.current_rpm:
+            return
+        self._learned_rates[domain] = stats.current_rpm
+        self._learned_rates.move_to_end(domain)
+        # Learned rates outlive evicted domain state, but are capped the same way
+        while self.max_domains and len(self._learned_rates) > self.max_domains:
+            self._learned_rates.popitem(last=False)
+        self._dirty = True
+        if time.time() - self._last_save >= self.save_interval:
+            self.save_state()
+
+    def _load_state(self) -> Dict[str, float]:
+        """Learned rates saved by a previous run, or {} if there are none."""
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {domain: float(rate) for domain, rate in data.get("rates", {}).items()}
+        except Exception as e:
+            logger.warning(f"Could not load learned rate limits from {self.state_path}: {e}")
+            return {}
+
+    def save_state(self) -> None:
+        """Write learned rates to state_path (atomically), if configured and changed."""
+        self._last_save = time.time()
+        if not self.state_path or not self._dirty:
+            return
+        tmp_path = f"{self.state_path}.tmp"
+        try:
+            directory = os.path.dirname(self.state_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"rates": {d: round(r, 3) for d, r in self._learned_rates.items()},
+                           "saved_at": datetime.now().isoformat()}, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.state_path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning(f"Could not save learned rate limits to {self.state_path}: {e}")
+
+    # Orderings get_stats(top_n=...) can rank domains by
+    _STATS_ORDER: Dict[str, Callable[[DomainStats], float]] = {
+        "request_count": lambda stats: stats.request_count,
+        "last_request": lambda stats: stats.last_request,
+        "queued": lambda stats: stats.queued,
+        "cooldown_until": lambda stats: stats.cooldown_until,
+    }
+
+    def get_stats(self, top_n: Optional[int] = None, sort_by: str = "request_count") -> Dict[str, dict]:
         """
         Get current rate limiting statistics.
 
+        Args:
+            top_n: Only report the top_n domains by sort_by (all domains if None)
+            sort_by: One of request_count, last_request, queued, cooldown_until
+
         Returns:
             Dictionary of domain statistics
+
+        Raises:
+            ValueError: If sort_by is not a supported ordering
         """
         current_time = time.time()
-        stats = {}
-
-        for domain, domain_stats in self._domain_stats.items():
-            rule = self.get_domain_rule(domain)
-            stats[domain] = {
-                "requests_this_window": domain_stats.request_count,
-                "window_start": domain_stats.window_start,
-                "last_request": domain_stats.last_request,
-                "cooldown_until": domain_stats.cooldown_until,
-                "is_cooling_down": current_time < domain_stats.cooldown_until,
-                "rule": {
-                    "requests_per_minute": rule.requests_per_minute,
-                    "burst_limit": rule.burst_limit,
-                    "cooldown_seconds": rule.cooldown_seconds,
-                }
+        if top_n is None:
+            domains = self._domain_stats.items()
+        else:
+            if sort_by not in self._STATS_ORDER:
+                raise ValueError(f"Cannot sort domain stats by {sort_by!r}")
+            order = self._STATS_ORDER[sort_by]
+            # Selects with a size-top_n heap instead of sorting every domain
+            domains = heapq.nlargest(top_n, self._domain_stats.items(), key=lambda item: order(item[1]))
+
+        return {domain: self._domain_summary(domain, domain_stats, current_time) for domain, domain_stats in domains}
+
+    def get_summary(self) -> Dict[str, int]:
+        """Counts describing the limiter's memory use: tracked, evicted and learned domains."""
+        return {
+            "tracked_domains": len(self._domain_stats),
+            "evicted_domains": self._evicted,
+            "learned_rates": len(self._learned_rates),
+            "max_domains": self.max_domains,
+        }
+
+    def _domain_summary(self, domain: str, domain_stats: DomainStats, current_time: float) -> dict:
+        """Reported statistics of one domain."""
+        rule = self.get_domain_rule(domain)
+        return {
+            "requests_this_window": domain_stats.request_count,  # total requests since reset
+            "window_start": domain_stats.window_start,
+            "last_request": domain_stats.last_request,
+            "cooldown_until": domain_stats.cooldown_until,
+            "is_cooling_down": current_time < domain_stats.cooldown_until,
+            "queued": domain_stats.queued,
+            "next_slot_in": round(self._calculate_wait_time(domain_stats, rule, current_time), 3),
+            "current_requests_per_minute": round(self._current_rate(domain_stats, rule), 2),
+            "latency_avg": round(domain_stats.latency_baseline, 3),
+            "rule": {
+                "requests_per_minute": rule.requests_per_minute,
+                "burst_limit": rule.burst_limit,
+                "cooldown_seconds": rule.cooldown_seconds,
             }
-
-        return stats
+        }
 
     def reset_domain(self, domain: str) -> None:
         """
@@ -277,6 +586,8 @@ class RateLimiter:
         """
         if domain in self._domain_stats:
             del self._domain_stats[domain]
+            if self._learned_rates.pop(domain, None) is not None:
+                self._dirty = True
             logger.info(f"Reset rate limiting stats for {domain}")
 
     def reset_all(self) -> None:
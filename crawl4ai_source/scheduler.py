@@ -0,0 +1,250 @@
+"""
+Crawl Job Scheduler for RAGFlow Slim
+
+This module provides the CrawlScheduler class, a priority queue of pending
+crawl jobs served by a fixed pool of async workers with per-domain fairness.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(order=True)
+class ScheduledJob:
+    """A crawl job waiting in the scheduler queue."""
+    sort_key: tuple = field(init=False, repr=False)
+    job_id: str = field(compare=False)
+    domain: str = field(compare=False)
+    priority: int = field(default=0, compare=False)
+    sequence: int = field(default=0, compare=False)
+    enqueued_at: float = field(default_factory=time.monotonic, compare=False)
+
+    def __post_init__(self):
+        # Higher priority first, then FIFO within a priority level
+        self.sort_key = (-self.priority, self.sequence)
+
+
+class _Stat:
+    """Running count/mean plus a bounded window for percentiles."""
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.total = 0.0
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.samples.append(value)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0
+        return {
+            "count": self.count,
+            "avg_seconds": round(self.total / self.count, 4) if self.count else 0.0,
+            "p95_seconds": round(p95, 4),
+            "max_seconds": round(ordered[-1], 4) if ordered else 0.0,
+        }
+
+
+class CrawlScheduler:
+    """
+    Priority scheduler for crawl jobs with per-domain fairness.
+
+    Jobs are grouped by domain. A worker always takes the highest priority
+    available, and among domains whose next job has that priority it rotates
+    round-robin, so a site with thousands of queued pages cannot starve a
+    site with one. A per-domain in-flight cap keeps a single host from
+    occupying the whole worker pool.
+    """
+
+    def __init__(
+        self,
+        runner: Callable[[str], Awaitable[None]],
+        num_workers: int = 5,
+        max_in_flight_per_domain: Optional[int] = None
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            runner: Coroutine function executing one job by ID
+            num_workers: Size of the fixed worker pool
+            max_in_flight_per_domain: Max concurrently running jobs per domain
+                (defaults to half the pool, at least 1)
+        """
+        self.runner = runner
+        self.num_workers = num_workers
+        self.max_in_flight_per_domain = max_in_flight_per_domain or max(1, num_workers // 2)
+
+        self._queues: Dict[str, List[ScheduledJob]] = {}
+        self._rotation: Deque[str] = deque()
+        self._queued: Dict[str, ScheduledJob] = {}
+        self._in_flight: Dict[str, int] = {}
+        self._running: Set[str] = set()
+        self._sequence = itertools.count()
+        self._condition: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+
+        self._wait_time = _Stat()
+        self._service_time = _Stat()
+        self._failed = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker pool is active."""
+        return any(not worker.done() for worker in self._workers)
+
+    async def start(self) -> None:
+        """Start the worker pool on the current event loop."""
+        if self.running:
+            return
+        self._condition = asyncio.Condition()
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"crawl-worker-{index}")
+            for index in range(self.num_workers)
+        ]
+        logger.info(f"Crawl scheduler started with {self.num_workers} workers")
+
+    async def stop(self) -> None:
+        """Stop the worker pool; queued jobs stay queued."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, job_id: str, url: str, priority: int = 0) -> bool:
+        """
+        Queue a job for execution.
+
+        Args:
+            job_id: ID of the job to run
+            url: Job URL, used for per-domain fairness
+            priority: Higher values are served first
+
+        Returns:
+            True if queued, False if the job is already queued or running
+        """
+        if job_id in self._queued or job_id in self._running:
+            return False
+
+        domain = urlparse(url).netloc.lower()
+        entry = ScheduledJob(job_id=job_id, domain=domain, priority=priority, sequence=next(self._sequence))
+        self._queued[job_id] = entry
+        queue = self._queues.setdefault(domain, [])
+        if not queue:
+            self._rotation.append(domain)
+        heapq.heappush(queue, entry)
+
+        if self._condition is not None:
+            async with self._condition:
+                self._condition.notify()
+        return True
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Remove a queued job.
+
+        Returns:
+            True if the job was waiting in the queue
+        """
+        entry = self._queued.pop(job_id, None)
+        if entry is None:
+            return False
+        queue = self._queues.get(entry.domain, [])
+        queue.remove(entry)
+        heapq.heapify(queue)
+        if not queue:
+            self._drop_domain(entry.domain)
+        return True
+
+    def is_queued(self, job_id: str) -> bool:
+        """Whether a job is waiting in the queue."""
+        return job_id in self._queued
+
+    def metrics(self) -> Dict[str, object]:
+        """Queue depth, in-flight counts and wait/service time statistics."""
+        now = time.monotonic()
+        oldest = min((entry.enqueued_at for entry in self._queued.values()), default=None)
+        return {
+            "workers": self.num_workers,
+            "queue_depth": len(self._queued),
+            "queue_depth_by_domain": {domain: len(queue) for domain, queue in self._queues.items()},
+            "in_flight": len(self._running),
+            "in_flight_by_domain": dict(self._in_flight),
+            "oldest_wait_seconds": round(now - oldest, 4) if oldest is not None else 0.0,
+            "wait_time": self._wait_time.summary(),
+            "service_time": self._service_time.summary(),
+            "failed": self._failed,
+        }
+
+    def _drop_domain(self, domain: str) -> None:
+        self._queues.pop(domain, None)
+        try:
+            self._rotation.remove(domain)
+        except ValueError:
+            pass
+
+    def _pop_next(self) -> Optional[ScheduledJob]:
+        """Take the next job: best priority first, round-robin across domains within it."""
+        eligible = [
+            domain for domain in self._rotation
+            if self._in_flight.get(domain, 0) < self.max_in_flight_per_domain
+        ]
+        if not eligible:
+            return None
+
+        best = min(self._queues[domain][0].sort_key[0] for domain in eligible)
+        domain = next(d for d in eligible if self._queues[d][0].sort_key[0] == best)
+        entry = heapq.heappop(self._queues[domain])
+        del self._queued[entry.job_id]
+
+        # Served domains move to the back of the rotation
+        self._rotation.remove(domain)
+        if self._queues[domain]:
+            self._rotation.append(domain)
+        else:
+            del self._queues[domain]
+        return entry
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            async with self._condition:
+                entry = self._pop_next()
+                while entry is None:
+                    await self._condition.wait()
+                    entry = self._pop_next()
+                self._in_flight[entry.domain] = self._in_flight.get(entry.domain, 0) + 1
+                self._running.add(entry.job_id)
+
+            started = time.monotonic()
+            self._wait_time.add(started - entry.enqueued_at)
+            try:
+                await self.runner(entry.job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._failed += 1
+                logger.error(f"Crawl worker {index} failed running job {entry.job_id}: {e}")
+            finally:
+                self._service_time.add(time.monotonic() - started)
+                self._running.discard(entry.job_id)
+                remaining = self._in_flight.get(entry.domain, 1) - 1
+                if remaining:
+                    self._in_flight[entry.domain] = remaining
+                else:
+                    self._in_flight.pop(entry.domain, None)
+                # A domain under its cap may have become eligible again
+                if self._condition is not None and not asyncio.current_task().cancelling():
+                    async with self._condition:
+                        self._condition.notify_all()
@@ -7,13 +7,50 @@ content from web pages and return structured results.
 
 import asyncio
 import hashlib
+import logging
+import os
 import time
-from typing import Optional
-from urllib.parse import urlparse
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+from urllib.parse import urldefrag, urljoin, urlparse
 
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+from .bloom import BloomFilter
+from .browser_pool import BrowserPool
+from .crawl_cache import CacheEntry, CrawlCache
+from .static_fetcher import ACCEPT, StaticFetcher
+from .deduplicator import normalize_url
 from .models import CrawlConfig, CrawlResult
+from .rate_limiter import RateLimitedError, RateLimiter
+from .simhash import simhash
+
+logger = logging.getLogger(__name__)
+
+# Browser pool settings
+BROWSER_POOL_SIZE = int(os.getenv("CRAWL4AI_BROWSER_POOL_SIZE", "2"))
+BROWSER_MAX_PAGES = int(os.getenv("CRAWL4AI_BROWSER_MAX_PAGES", "200"))  # pages before a browser is recycled
+BROWSER_MAX_MEMORY_GROWTH_MB = float(os.getenv("CRAWL4AI_BROWSER_MAX_MEMORY_GROWTH_MB", "1024"))
+BROWSER_WARMUP = os.getenv("CRAWL4AI_BROWSER_WARMUP", "true").lower() == "true"
+BATCH_PAGES_PER_BROWSER = int(os.getenv("CRAWL4AI_BATCH_PAGES_PER_BROWSER", "5"))  # concurrent pages per browser in crawl_urls
+SITE_MAX_PAGES = int(os.getenv("CRAWL4AI_SITE_MAX_PAGES", "500"))  # pages per crawl_site job unless its config sets max_pages
+SITE_CONCURRENCY = int(os.getenv("CRAWL4AI_SITE_CONCURRENCY", "4"))  # pages in flight per crawl_site job unless its config sets concurrency
+
+# Plain-HTTP fast path settings
+STATIC_FAST_PATH = os.getenv("CRAWL4AI_STATIC_FAST_PATH", "true").lower() == "true"
+HTTP_MAX_CONNECTIONS = int(os.getenv("CRAWL4AI_HTTP_MAX_CONNECTIONS", "50"))
+
+# Per-domain politeness
+RATE_LIMIT_ENABLED = os.getenv("CRAWL4AI_RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_RETRIES = int(os.getenv("CRAWL4AI_RATE_LIMIT_RETRIES", "2"))  # refetches after a 429/503
+RATE_LIMIT_STATUSES = (429, 503)
 
 
 class CrawlService:
@@ -21,12 +58,57 @@ class CrawlService:
     Service for crawling web pages using Crawl4AI.
 
     Provides async methods for crawling URLs with configurable parameters,
-    content extraction, and result processing.
+    content extraction, and result processing. Pages are fetched through a
+    pool of reusable browsers (see BrowserPool) so browser launch cost is paid
+    once, and concurrent crawls spread across several browsers.
+
+    With a CrawlCache, pages crawled before are first revalidated with a
+    conditional GET (If-None-Match/If-Modified-Since); a 304 answer, or a
+    re-rendered page whose content hash did not change, is returned with
+    unchanged=True so callers can skip reprocessing it.
+
+    When started with the static fast path enabled, pages are first fetched
+    over plain HTTP and converted to markdown in-process (see StaticFetcher);
+    only pages that look JavaScript-rendered go to a browser. Either way the
+    result has the same CrawlResult shape, with metadata['fetch_mode'] set to
+    'http' or 'browser'.
+
+    Every fetch first reserves a slot from the per-domain RateLimiter, before
+    any browser is leased, and 429/503 answers are fed back to it so the
+    whole domain backs off for Retry-After before the page is retried.
     """
 
-    def __init__(self):
-        """Initialize the crawl service."""
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        max_pages_per_browser: Optional[int] = None,
+        warm_up: Optional[bool] = None,
+        cache: Optional[CrawlCache] = None,
+        static_fast_path: Optional[bool] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        """
+        Initialize the crawl service.
+
+        Args:
+            pool_size: Number of browsers in the pool (default CRAWL4AI_BROWSER_POOL_SIZE)
+            max_pages_per_browser: Pages before a browser is recycled (default CRAWL4AI_BROWSER_MAX_PAGES)
+            warm_up: Launch the browsers in start() (default CRAWL4AI_BROWSER_WARMUP)
+            cache: Recrawl cache enabling conditional requests (disabled if None)
+            static_fast_path: Try plain HTTP before the browser (default CRAWL4AI_STATIC_FAST_PATH)
+            rate_limiter: Per-domain rate limiter (start() creates one if CRAWL4AI_RATE_LIMIT_ENABLED)
+        """
+        self.pool_size = pool_size or BROWSER_POOL_SIZE
+        self.max_pages_per_browser = max_pages_per_browser or BROWSER_MAX_PAGES
+        self.warm_up = BROWSER_WARMUP if warm_up is None else warm_up
+        # Primary crawler; a crawler assigned here directly is used without a pool
         self._crawler: Optional[AsyncWebCrawler] = None
+        self._pool: Optional[BrowserPool] = None
+        self.cache = cache
+        self.static_fast_path = STATIC_FAST_PATH if static_fast_path is None else static_fast_path
+        self._http = None  # pooled httpx.AsyncClient, created on first use
+        self._static: Optional[StaticFetcher] = None
+        self.rate_limiter = rate_limiter
 
     async def __aenter__(self):
         """Async context manager entry."""
@@ -38,20 +120,83 @@ class CrawlService:
         await self.stop()
 
     async def start(self) -> None:
-        """Start the crawler service."""
+        """Start the crawler service and warm up the browser pool."""
         if self._crawler is None:
             # Configure browser for headless operation
             browser_config = BrowserConfig(
                 headless=True,
                 # Additional browser config can be added here
             )
-            self._crawler = AsyncWebCrawler(config=browser_config)
+            self._pool = BrowserPool(
+                lambda: AsyncWebCrawler(config=browser_config),
+                size=self.pool_size,
+                max_pages_per_browser=self.max_pages_per_browser,
+                max_memory_growth_mb=BROWSER_MAX_MEMORY_GROWTH_MB,
+            )
+            await self._pool.start(warm_up=self.warm_up)
+            self._crawler = self._pool.crawlers[0]
+            if self.static_fast_path and HTTPX_AVAILABLE:
+                self._static = StaticFetcher()
+            if self.rate_limiter is None and RATE_LIMIT_ENABLED:
+                self.rate_limiter = RateLimiter()
 
     async def stop(self) -> None:
         """Stop the crawler service."""
-        if self._crawler is not None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        elif self._crawler is not None:
             await self._crawler.close()
-            self._crawler = None
+        self._crawler = None
+        self._static = None
+        if self.rate_limiter is not None:
+            self.rate_limiter.save_state()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    @asynccontextmanager
+    async def _lease(self, pages: int = 1) -> AsyncIterator[AsyncWebCrawler]:
+        """Borrow a crawler from the pool (or the directly assigned crawler)."""
+        if self._pool is not None:
+            async with self._pool.lease(pages) as crawler:
+                yield crawler
+        elif self._crawler is not None:
+            yield self._crawler
+        else:
+            raise RuntimeError("Crawler service not started. Use async context manager or call start() first.")
+
+    def fetch_stats(self) -> dict:
+        """Browser pool usage, static fast path hit counts and the busiest rate-limited domains."""
+        rate_limits = {}
+        if self.rate_limiter is not None:
+            rate_limits = {
+                **self.rate_limiter.get_summary(),
+                "busiest_domains": self.rate_limiter.get_stats(top_n=10),
+            }
+        return {
+            "browser_pool": self._pool.stats() if self._pool is not None else {},
+            "static_fast_path": self._static.stats() if self._static is not None else {},
+            "rate_limits": rate_limits,
+        }
+
+    def _http_client(self):
+        """Shared connection-pooled HTTP client for conditional and static fetches."""
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS)
+            )
+        return self._http
+
+    def _static_eligible(self, url: str) -> bool:
+        """Whether the plain-HTTP fast path will make a request for this URL."""
+        return self._static is not None and self._static.should_try(url)
+
+    async def _fetch_static(self, url: str, config: CrawlConfig):
+        """Try the plain-HTTP fast path; None means the browser must render the page."""
+        if not self._static_eligible(url):
+            return None
+        return await self._static.fetch(self._http_client(), url, config)
 
     async def crawl_url(self, url: str, config: CrawlConfig) -> CrawlResult:
         """
@@ -71,55 +216,22 @@ class CrawlService:
             raise RuntimeError("Crawler service not started. Use async context manager or call start() first.")
 
         start_time = time.time()
+        cached = await self.cache.get_async(url) if self.cache is not None else None
 
         try:
-            # Configure the crawl run
-            run_config = CrawlerRunConfig(
-                cache_mode=CacheMode.BYPASS,  # Don't use cache for fresh content
-                # Set timeout
-                # Note: Crawl4AI uses different timeout configuration
-                # We'll handle timeout at the service level
-            )
-
-            # Perform the crawl
-            result = await self._crawler.arun(
-                url=url,
-                config=run_config,
-            )
-
-            crawl_time = time.time() - start_time
-
-            # Extract content and metadata
-            content = ""
-            if hasattr(result, 'markdown') and result.markdown:
-                content = result.markdown.raw_markdown if hasattr(result.markdown, 'raw_markdown') else str(result.markdown)
-            elif hasattr(result, 'markdown_v2') and result.markdown_v2:
-                content = result.markdown_v2.raw_markdown if hasattr(result.markdown_v2, 'raw_markdown') else str(result.markdown_v2)
-            else:
-                # Fallback to HTML content
-                content = result.html if hasattr(result, 'html') and result.html else ""
-            title = self._extract_title(result)
-            metadata = self._extract_metadata(result, config)
-            links = self._extract_links(result)
-
-            # Generate content hash for deduplication
-            content_hash = self._generate_content_hash(content)
-
-            # Create result object
-            crawl_result = CrawlResult(
-                url=result.url or url,  # Use final URL if redirected
-                title=title,
-                content=content,
-                metadata=metadata,
-                links=links,
-                content_hash=content_hash,
-                content_size=len(content.encode('utf-8')),
-                crawl_time=crawl_time,
-            )
-
-            return crawl_result
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                try:
+                    return await self._fetch_page(url, config, cached, start_time)
+                except RateLimitedError as e:
+                    self._on_rate_limited(e)
+                    if attempt == RATE_LIMIT_RETRIES:
+                        raise
+                    logger.info(f"Retrying {url} after rate limit ({attempt + 1}/{RATE_LIMIT_RETRIES})")
 
         except Exception as e:
+            if not isinstance(e, RateLimitedError):
+                # Timeouts and connection errors count against the domain's adaptive rate
+                self._record_response(url, None)
             crawl_time = time.time() - start_time
             # Create a minimal result for failed crawls
             crawl_result = CrawlResult(
@@ -131,6 +243,381 @@ class CrawlService:
             )
             raise e
 
+    async def crawl_urls(self, urls: List[str], config: CrawlConfig) -> List[CrawlResult]:
+        """
+        Crawl many URLs, spread across the browser pool.
+
+        URLs go through the conditional GET / plain-HTTP fast path first. The
+        rest are split into one batch per pooled browser; each batch holds one
+        lease and fetches up to BATCH_PAGES_PER_BROWSER pages at a time, every
+        page waiting for its domain's rate limit slot right before its fetch.
+
+        Args:
+            urls: URLs to crawl
+            config: Crawling configuration parameters
+
+        Returns:
+            CrawlResults for the pages that were crawled successfully, in input order
+        """
+        if self._crawler is None:
+            raise RuntimeError("Crawler service not started. Use async context manager or call start() first.")
+        if not urls:
+            return []
+
+        start_time = time.time()
+        # One batched lookup, off the event loop
+        cached = await self.cache.get_many_async(urls) if self.cache is not None else {}
+
+        async def fast_path(url: str) -> Optional[CrawlResult]:
+            # Revalidation and plain-HTTP fetch; None leaves the URL to the browser batch.
+            # Each request reserves its own per-domain slot.
+            entry = cached.get(url)
+            try:
+                page, static_checked = None, False
+                if entry is not None and self._can_revalidate(entry):
+                    await self._throttle(url)
+                    fetch_started = time.time()
+                    not_modified, page, static_checked = await self._revalidate(url, entry, config)
+                    if not_modified:
+                        self._record_response(url, 304, time.time() - fetch_started)
+                        return self._unchanged_result(url, entry, time.time() - start_time)
+                if page is None and not static_checked and self._static_eligible(url):
+                    await self._throttle(url)
+                    fetch_started = time.time()
+                    page = await self._fetch_static(url, config)
+            except RateLimitedError as e:
+                self._on_rate_limited(e)
+                return None
+            if page is None:
+                return None
+            self._record_response(url, page.status_code, time.time() - fetch_started)
+            crawl_result = self._build_result(page, url, config, time.time() - start_time)
+            crawl_result.metadata['fetch_mode'] = 'http'
+            await self._update_cache(url, page, crawl_result, entry)
+            return crawl_result
+
+        fast_results = await asyncio.gather(*(fast_path(url) for url in urls))
+        by_url = {url: result for url, result in zip(urls, fast_results) if result is not None}
+
+        pending = [url for url in urls if url not in by_url]
+        browsers = len(self._pool.crawlers) if self._pool is not None else 1
+        batches = [pending[i::browsers] for i in range(browsers) if pending[i::browsers]]
+
+        async def run_batch(batch: List[str]) -> list:
+            pages = asyncio.Semaphore(BATCH_PAGES_PER_BROWSER)
+            async with self._lease(pages=len(batch)) as crawler:
+                async def fetch(url: str):
+                    async with pages:
+                        # Throttle at dispatch time, so the limiter's spacing reaches the server
+                        await self._throttle(url)
+                        return await crawler.arun(url=url, config=self._run_config())
+
+                return await asyncio.gather(*(fetch(url) for url in batch), return_exceptions=True)
+
+        batch_results = await asyncio.gather(*(run_batch(batch) for batch in batches), return_exceptions=True)
+        crawl_time = time.time() - start_time
+
+        cache_entries = []
+        for batch, results in zip(batches, batch_results):
+            if isinstance(results, Exception):
+                logger.warning(f"Batch of {len(batch)} URLs failed: {results}")
+                continue
+            for url, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    self._record_response(url, None)
+                    logger.warning(f"Skipping {url}: {result}")
+                    continue
+                rate_limited = self._rate_limit_error(url, result)
+                if rate_limited is not None:
+                    self._on_rate_limited(rate_limited)
+                    logger.warning(f"Skipping {url}: {rate_limited}")
+                    continue
+                # Pages in a batch overlap, so only the status is fed back, not the latency
+                self._record_response(url, self._response_status(result))
+                if not getattr(result, 'success', True):
+                    logger.warning(f"Skipping {url}: {getattr(result, 'error_message', 'crawl failed')}")
+                    continue
+                by_url[url] = self._build_result(result, url, config, crawl_time)
+                by_url[url].metadata['fetch_mode'] = 'browser'
+                if self.cache is not None:
+                    cache_entries.append(self._cache_entry(url, result, by_url[url], cached.get(url)))
+
+        if cache_entries:
+            await self.cache.put_many_async(cache_entries)
+        return [by_url[url] for url in urls if url in by_url]
+
+    async def _fetch_page(
+        self,
+        url: str,
+        config: CrawlConfig,
+        cached: Optional[CacheEntry],
+        start_time: float
+    ) -> CrawlResult:
+        """
+        Fetch one page: conditional revalidation, then plain HTTP, then the browser.
+
+        Each of these requests reserves its own per-domain rate limit slot,
+        so a page that needs all three counts as three requests.
+
+        Raises:
+            RateLimitedError: If the server answered 429/503
+        """
+        # Skip the browser entirely if the server confirms the page is unchanged
+        result, static_checked = None, False
+        if cached is not None and self._can_revalidate(cached):
+            await self._throttle(url)
+            fetch_started = time.time()
+            not_modified, result, static_checked = await self._revalidate(url, cached, config)
+            if not_modified:
+                self._record_response(url, 304, time.time() - fetch_started)
+                return self._unchanged_result(url, cached, time.time() - start_time)
+
+        # Static pages are fetched over plain HTTP; the rest are rendered in a browser
+        if result is None and not static_checked and self._static_eligible(url):
+            await self._throttle(url)
+            fetch_started = time.time()
+            result = await self._fetch_static(url, config)
+        fetch_mode = 'http'
+        if result is None:
+            fetch_mode = 'browser'
+            # Reserve the slot before taking a browser from the pool
+            await self._throttle(url)
+            fetch_started = time.time()
+            async with self._lease() as crawler:
+                result = await crawler.arun(
+                    url=url,
+                    config=self._run_config(),
+                )
+            rate_limited = self._rate_limit_error(url, result)
+            if rate_limited is not None:
+                raise rate_limited
+        self._record_response(url, self._response_status(result), time.time() - fetch_started)
+
+        crawl_result = self._build_result(result, url, config, time.time() - start_time)
+        crawl_result.metadata['fetch_mode'] = fetch_mode
+        await self._update_cache(url, result, crawl_result, cached)
+        return crawl_result
+
+    async def _throttle(self, url: str) -> None:
+        """Wait for the URL's domain to have a free request slot."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.wait_if_needed(url)
+
+    def _on_rate_limited(self, error: RateLimitedError) -> None:
+        """Start the domain's cooldown from a 429/503 answer."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.handle_rate_limit_response(error.url, error.status_code, error.retry_after)
+
+    def _record_response(self, url: str, status_code: Optional[int], latency: Optional[float] = None) -> None:
+        """Feed a response's status and latency into the domain's adaptive rate."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.record_response(url, status_code, latency)
+
+    def _response_status(self, result) -> Optional[int]:
+        """HTTP status of a fetch result; None for a failed fetch without one."""
+        status_code = getattr(result, 'status_code', None)
+        if status_code is None and getattr(result, 'success', True):
+            return 200
+        return status_code
+
+    def _rate_limit_error(self, url: str, result) -> Optional[RateLimitedError]:
+        """RateLimitedError for a browser result answered with 429/503, else None."""
+        status_code = getattr(result, 'status_code', None)
+        if status_code not in RATE_LIMIT_STATUSES:
+            return None
+        headers = {k.lower(): v for k, v in (getattr(result, 'response_headers', None) or {}).items()}
+        return RateLimitedError(url, status_code, headers.get('retry-after'))
+
+    def _can_revalidate(self, cached: CacheEntry) -> bool:
+        """Whether a conditional request can be made for a cached page."""
+        return HTTPX_AVAILABLE and cached.has_validators
+
+    async def _revalidate(self, url: str, cached: CacheEntry, config: CrawlConfig):
+        """
+        Revalidate a cached page with a conditional GET.
+
+        A 200 answer's body is handed to the static fetcher instead of being
+        discarded, so a changed static page is downloaded once. Any error
+        falls back to a full crawl.
+
+        Returns:
+            (not_modified, page, static_checked): not_modified is True on a
+            304; page is the StaticPage built from a 200 body, or None;
+            static_checked is True if the static fetcher already saw the body
+
+        Raises:
+            RateLimitedError: If the server answered 429/503 to a static-eligible URL
+        """
+        headers = {"User-Agent": config.user_agent, "Accept": ACCEPT, **cached.conditional_headers()}
+        try:
+            async with self._http_client().stream(
+                "GET", url, headers=headers,
+                follow_redirects=config.follow_redirects, timeout=config.timeout_seconds
+            ) as response:
+                if response.status_code == 304:
+                    return True, None, False
+                if self._static is None or not self._static.should_try(url):
+                    return False, None, False
+                return False, await self._static.from_response(response, url, config), True
+        except RateLimitedError:
+            raise
+        except Exception as e:
+            logger.debug(f"Conditional request for {url} failed, crawling in full: {e}")
+            return False, None, False
+
+    def _unchanged_result(self, url: str, cached: CacheEntry, crawl_time: float) -> CrawlResult:
+        """Result for a page the server reported as not modified, rebuilt from the cache."""
+        return CrawlResult(
+            url=url,
+            title=cached.title,
+            links=list(cached.links),
+            metadata={"not_modified": True},
+            content_hash=cached.content_hash,
+            # Size and hash let the body be loaded from the content store
+            content_size=cached.content_size,
+            crawl_time=crawl_time,
+            unchanged=True,
+        )
+
+    async def _update_cache(self, url: str, result, crawl_result: CrawlResult, cached: Optional[CacheEntry]) -> None:
+        """Record the page's validators and hash, flagging it unchanged if the hash matches."""
+        if self.cache is None:
+            return
+        await self.cache.put_async(self._cache_entry(url, result, crawl_result, cached))
+
+    def _cache_entry(self, url: str, result, crawl_result: CrawlResult, cached: Optional[CacheEntry]) -> CacheEntry:
+        """Cache entry for a fetched page; flags the result unchanged if its hash matches the cached one."""
+        if cached is not None and cached.content_hash == crawl_result.content_hash:
+            crawl_result.unchanged = True
+
+        headers = {k.lower(): v for k, v in (getattr(result, 'response_headers', None) or {}).items()}
+        return CacheEntry(
+            url=url,
+            etag=headers.get('etag'),
+            last_modified=headers.get('last-modified'),
+            content_hash=crawl_result.content_hash,
+            content_size=crawl_result.content_size,
+            title=crawl_result.title,
+            links=crawl_result.links,
+        )
+
+    def _run_config(self) -> CrawlerRunConfig:
+        """Crawl4AI run configuration shared by single and batch crawls."""
+        return CrawlerRunConfig(
+            cache_mode=CacheMode.BYPASS,  # Don't use cache for fresh content
+            # Set timeout
+            # Note: Crawl4AI uses different timeout configuration
+            # We'll handle timeout at the service level
+        )
+
+    def _build_result(self, result, url: str, config: CrawlConfig, crawl_time: float) -> CrawlResult:
+        """Convert a Crawl4AI result into a CrawlResult."""
+        # Extract content and metadata
+        content = ""
+        if hasattr(result, 'markdown') and result.markdown:
+            content = result.markdown.raw_markdown if hasattr(result.markdown, 'raw_markdown') else str(result.markdown)
+        elif hasattr(result, 'markdown_v2') and result.markdown_v2:
+            content = result.markdown_v2.raw_markdown if hasattr(result.markdown_v2, 'raw_markdown') else str(result.markdown_v2)
+        else:
+            # Fallback to HTML content
+            content = result.html if hasattr(result, 'html') and result.html else ""
+        title = self._extract_title(result)
+        metadata = self._extract_metadata(result, config)
+        links = self._extract_links(result)
+
+        # Generate content hash and SimHash signature for deduplication
+        content_hash = self._generate_content_hash(content)
+        signature = simhash(content)
+
+        # Create result object
+        return CrawlResult(
+            url=result.url or url,  # Use final URL if redirected
+            title=title,
+            content=content,
+            metadata=metadata,
+            links=links,
+            content_hash=content_hash,
+            content_size=len(content.encode('utf-8')),
+            crawl_time=crawl_time,
+            simhash=signature,
+        )
+
+    async def crawl_site(
+        self,
+        start_url: str,
+        config: CrawlConfig
+    ) -> AsyncIterator[CrawlResult]:
+        """
+        Crawl a site breadth-first up to config.max_depth, yielding pages as they complete.
+
+        The start page is depth 0; same-domain links found on a page at depth d
+        are followed while d + 1 < max_depth, so max_depth=1 fetches only the
+        start page. URLs are canonicalized with normalize_url() and tracked in a
+        Bloom filter, so each page is fetched at most once. At most
+        config.max_pages pages are fetched, config.concurrency at a time
+        (CRAWL4AI_SITE_MAX_PAGES and CRAWL4AI_SITE_CONCURRENCY when unset).
+
+        Args:
+            start_url: URL to start from
+            config: Crawling configuration parameters
+
+        Yields:
+            CrawlResult for each successfully crawled page, in completion order
+
+        Raises:
+            Exception: If the start page cannot be crawled
+        """
+        max_pages = config.max_pages or SITE_MAX_PAGES
+        concurrency = config.concurrency or SITE_CONCURRENCY
+        domain = urlparse(start_url).netloc.lower()
+        seen = BloomFilter(capacity=max(max_pages * 20, 1000))
+        seen.add(normalize_url(urldefrag(start_url)[0]))
+        frontier = deque([(start_url, 0)])
+        in_flight = {}
+        fetched = 0
+
+        try:
+            while frontier or in_flight:
+                # Fill the per-crawl concurrency window in FIFO (breadth-first) order
+                while frontier and len(in_flight) < concurrency and fetched < max_pages:
+                    url, depth = frontier.popleft()
+                    task = asyncio.create_task(self.crawl_url(url, config))
+                    in_flight[task] = (url, depth)
+                    fetched += 1
+                if not in_flight:
+                    break
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    url, depth = in_flight.pop(task)
+                    try:
+                        page = task.result()
+                    except Exception as e:
+                        if depth == 0:
+                            raise
+                        logger.warning(f"Skipping {url}: {e}")
+                        continue
+
+                    page.metadata['depth'] = depth
+                    if depth + 1 < config.max_depth:
+                        for link in self._same_domain_links(page, domain):
+                            if seen.add(normalize_url(link)):
+                                frontier.append((link, depth + 1))
+                    yield page
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    def _same_domain_links(self, page: CrawlResult, domain: str) -> list[str]:
+        """Resolve a page's links against its URL and keep http(s) links on domain."""
+        links = []
+        for href in page.links:
+            url = urldefrag(urljoin(page.url, href))[0]
+            parsed = urlparse(url)
+            if parsed.scheme in ('http', 'https') and parsed.netloc.lower() == domain:
+                links.append(url)
+        return sorted(links)
+
     def _extract_title(self, result) -> Optional[str]:
         """Extract page title from crawl result."""
         try:
@@ -191,9 +678,13 @@ class CrawlService:
 
         try:
             if hasattr(result, 'links') and result.links:
-                # result.links might be a list of link objects or strings
-                if isinstance(result.links, list):
-                    for link in result.links:
+                # result.links is a list of link objects or strings, or (Crawl4AI)
+                # a dict of such lists keyed by "internal"/"external"
+                groups = result.links.values() if isinstance(result.links, dict) else [result.links]
+                for group in groups:
+                    if not isinstance(group, list):
+                        continue
+                    for link in group:
                         if isinstance(link, str):
                             links.append(link)
                         elif isinstance(link, dict) and 'href' in link:
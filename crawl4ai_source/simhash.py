@@ -0,0 +1,174 @@
+"""
+SimHash signatures and LSH index for Crawl4AI integration.
+
+This module computes 64-bit SimHash signatures of page text and provides
+SimHashIndex, a banded locality-sensitive hash index answering "is there a
+stored page within k bits of this one?" by looking at a handful of bucket
+candidates instead of scanning every page. Normalization, shingling and
+blake2b hashing follow graphiti_core's dedup_helpers.
+"""
+
+import re
+from collections import Counter, defaultdict
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3  # words per shingle
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase, keep alphanumerics and collapse whitespace so formatting changes don't matter."""
+    normalized = re.sub(r"[^a-z0-9' ]", " ", re.sub(r"\s+", " ", text.lower()))
+    return re.sub(r"\s+", " ", normalized).strip()
+
+
+def _shingles(normalized: str) -> Counter:
+    """Word n-gram shingles with their counts."""
+    words = normalized.split()
+    if len(words) < SHINGLE_SIZE:
+        return Counter([" ".join(words)]) if words else Counter()
+    return Counter(" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+
+
+def _hash_shingle(shingle: str) -> int:
+    return int.from_bytes(blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> Optional[int]:
+    """
+    Compute the 64-bit SimHash of a text.
+
+    Each shingle's hash votes +weight/-weight on every bit; the signature
+    keeps the bits with a positive total. Similar texts get signatures that
+    differ in few bits.
+
+    Args:
+        text: Text to fingerprint
+
+    Returns:
+        Unsigned 64-bit signature, or None for text without words
+    """
+    shingles = _shingles(_normalize_text(text))
+    if not shingles:
+        return None
+
+    votes = [0] * SIMHASH_BITS
+    for shingle, weight in shingles.items():
+        value = _hash_shingle(shingle)
+        for bit in range(SIMHASH_BITS):
+            votes[bit] += weight if value >> bit & 1 else -weight
+
+    return sum(1 << bit for bit, vote in enumerate(votes) if vote > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two signatures."""
+    return bin(a ^ b).count("1")
+
+
+def simhash_bands(signature: int, num_bands: int = 4) -> Tuple[int, ...]:
+    """Split a signature into num_bands equal bit bands (low bits first)."""
+    width = SIMHASH_BITS // num_bands
+    mask = (1 << width) - 1
+    return tuple((signature >> (band * width)) & mask for band in range(num_bands))
+
+
+def to_signed64(value: int) -> int:
+    """Map an unsigned 64-bit signature into Postgres BIGINT range."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def from_signed64(value: int) -> int:
+    """Inverse of to_signed64."""
+    return value + (1 << 64) if value < 0 else value
+
+
+class SimHashIndex:
+    """
+    Banded LSH index over SimHash signatures.
+
+    Signatures are split into num_bands bands and each band value is a bucket
+    key. Two signatures within max_distance bits must agree exactly on at
+    least one band when num_bands > max_distance (pigeonhole), so querying
+    the signature's num_bands buckets finds every near duplicate; candidates
+    are then confirmed by Hamming distance.
+    """
+
+    def __init__(self, num_bands: int = 4, max_distance: int = 3):
+        """
+        Initialize the index.
+
+        Args:
+            num_bands: Bands per signature (must exceed max_distance)
+            max_distance: Maximum Hamming distance counted as a near duplicate
+        """
+        if num_bands <= max_distance:
+            raise ValueError("num_bands must be greater than max_distance")
+        if SIMHASH_BITS % num_bands:
+            raise ValueError(f"num_bands must divide {SIMHASH_BITS}")
+        self.num_bands = num_bands
+        self.max_distance = max_distance
+        self._buckets: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+        self._signatures: Dict[str, int] = {}
+
+    def add(self, key: str, signature: int) -> None:
+        """
+        Index a signature under a key (e.g. the crawl_content id).
+
+        Args:
+            key: Identifier returned by query()
+            signature: SimHash signature
+        """
+        if key in self._signatures:
+            self.remove(key)
+        self._signatures[key] = signature
+        for band, value in enumerate(simhash_bands(signature, self.num_bands)):
+            self._buckets[(band, value)].add(key)
+
+    def add_many(self, items: Iterable[Tuple[str, int]]) -> None:
+        """Index several (key, signature) pairs."""
+        for key, signature in items:
+            self.add(key, signature)
+
+    def remove(self, key: str) -> None:
+        """Remove a key from the index."""
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, value in enumerate(simhash_bands(signature, self.num_bands)):
+            bucket = self._buckets.get((band, value))
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[(band, value)]
+
+    def query(self, signature: int, max_distance: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Find indexed signatures near a signature.
+
+        Args:
+            signature: SimHash signature to look up
+            max_distance: Override of the index's max_distance (recall is only
+                guaranteed up to num_bands - 1)
+
+        Returns:
+            (key, distance) pairs within max_distance, closest first
+        """
+        limit = self.max_distance if max_distance is None else max_distance
+        candidates: Set[str] = set()
+        for band, value in enumerate(simhash_bands(signature, self.num_bands)):
+            candidates |= self._buckets.get((band, value), set())
+
+        matches = []
+        for key in candidates:
+            distance = hamming_distance(signature, self._signatures[key])
+            if distance <= limit:
+                matches.append((key, distance))
+        return sorted(matches, key=lambda match: match[1])
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._signatures
@@ -0,0 +1,268 @@
+"""
+Plain-HTTP fetcher for Crawl4AI integration.
+
+This module provides the StaticFetcher class, which downloads a page over
+HTTP and converts it to markdown in-process, so static pages do not need a
+browser tab. Pages that look like they need JavaScript to render are left
+to the browser.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+from urllib.parse import urldefrag, urljoin, urlparse
+
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+from .rate_limiter import RateLimitedError
+
+logger = logging.getLogger(__name__)
+
+ACCEPT = "text/html,application/xhtml+xml,text/plain"
+
+# Markers of client-rendered apps whose server HTML is an empty shell
+SPA_SHELL_PATTERN = re.compile(
+    r'<div[^>]+id=["\'](?:root|app|__next|__nuxt)["\'][^>]*>\s*</div>'
+    r'|<noscript>[^<]*enable javascript',
+    re.IGNORECASE,
+)
+
+
+class _PageScanner(HTMLParser):
+    """Single pass over the HTML collecting title, meta tags, links and script size."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.meta: Dict[str, str] = {}
+        self.language: Optional[str] = None
+        self.hrefs: List[str] = []
+        self.script_chars = 0
+        self.text_chars = 0
+        self._in_title = False
+        self._in_script = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "title":
+            self._in_title = True
+        elif tag in ("script", "style"):
+            self._in_script = True
+        elif tag == "a" and attrs.get("href"):
+            self.hrefs.append(attrs["href"])
+        elif tag == "meta" and attrs.get("name") and attrs.get("content"):
+            self.meta[attrs["name"].lower()] = attrs["content"]
+        elif tag == "html" and attrs.get("lang"):
+            self.language = attrs["lang"]
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag in ("script", "style"):
+            self._in_script = False
+
+    def handle_data(self, data):
+        if self._in_script:
+            self.script_chars += len(data)
+        elif self._in_title:
+            self.title += data
+        else:
+            self.text_chars += len(data.strip())
+
+
+@dataclass
+class StaticPage:
+    """A page fetched over plain HTTP, shaped like a Crawl4AI result."""
+    url: str
+    html: str
+    markdown: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    links: Dict[str, List[Dict[str, str]]] = field(default_factory=dict)
+    response_headers: Dict[str, str] = field(default_factory=dict)
+    status_code: int = 200
+    success: bool = True
+
+
+class StaticFetcher:
+    """
+    Fast path for static pages.
+
+    fetch() returns a StaticPage, or None when the page should be rendered
+    by the browser: non-HTML responses, errors, oversized bodies, too little
+    text, script-heavy HTML or an empty single-page-app shell. Domains that
+    keep needing the browser are learned and skipped after
+    js_domain_threshold consecutive fallbacks; a static success resets them.
+    """
+
+    def __init__(
+        self,
+        min_text_chars: int = 200,
+        max_script_ratio: float = 0.5,
+        js_domain_threshold: int = 3
+    ):
+        """
+        Initialize the fetcher.
+
+        Args:
+            min_text_chars: Minimum visible text for a page to count as static
+            max_script_ratio: Maximum share of script/style characters in the HTML
+            js_domain_threshold: Consecutive fallbacks before a domain goes straight to the browser
+        """
+        self.min_text_chars = min_text_chars
+        self.max_script_ratio = max_script_ratio
+        self.js_domain_threshold = js_domain_threshold
+        self._markdown = DefaultMarkdownGenerator()
+        self._fallbacks: Dict[str, int] = {}
+        self.static_pages = 0
+        self.browser_fallbacks = 0
+
+    def should_try(self, url: str) -> bool:
+        """Whether the fast path is worth trying for this URL's domain."""
+        return self._fallbacks.get(urlparse(url).netloc.lower(), 0) < self.js_domain_threshold
+
+    async def fetch(self, client, url: str, config) -> Optional[StaticPage]:
+        """
+        Fetch a page over HTTP and convert it to markdown.
+
+        Args:
+            client: httpx.AsyncClient to fetch with
+            url: URL to fetch
+            config: CrawlConfig (user agent, timeout, redirects, size limit)
+
+        Returns:
+            StaticPage, or None if the page needs a browser render
+
+        Raises:
+            RateLimitedError: If the server answered 429/503
+        """
+        return await self._settle(url, self._fetch(client, url, config))
+
+    async def from_response(self, response, url: str, config) -> Optional[StaticPage]:
+        """
+        Convert an already-open streamed response, e.g. a conditional GET answered 200.
+
+        Args:
+            response: httpx streaming response whose body has not been read yet
+            url: Requested URL
+            config: CrawlConfig (size limit)
+
+        Returns:
+            StaticPage, or None if the page needs a browser render
+
+        Raises:
+            RateLimitedError: If the server answered 429/503
+        """
+        return await self._settle(url, self._read(response, url, config))
+
+    async def _settle(self, url: str, attempt) -> Optional[StaticPage]:
+        """Await a fetch attempt and update the fallback counters."""
+        domain = urlparse(url).netloc.lower()
+        try:
+            page, reason = await attempt
+        except RateLimitedError:
+            raise
+        except Exception as e:
+            page, reason = None, f"request failed: {e}"
+
+        if page is None:
+            self.browser_fallbacks += 1
+            self._fallbacks[domain] = self._fallbacks.get(domain, 0) + 1
+            logger.debug(f"Rendering {url} in the browser: {reason}")
+            return None
+
+        self.static_pages += 1
+        self._fallbacks.pop(domain, None)
+        return page
+
+    def stats(self) -> Dict[str, Any]:
+        """Fast path hit counts and domains currently sent to the browser."""
+        return {
+            "static_pages": self.static_pages,
+            "browser_fallbacks": self.browser_fallbacks,
+            "browser_domains": sorted(
+                domain for domain, count in self._fallbacks.items() if count >= self.js_domain_threshold
+            ),
+        }
+
+    async def _fetch(self, client, url: str, config):
+        headers = {"User-Agent": config.user_agent, "Accept": ACCEPT}
+        async with client.stream(
+            "GET", url, headers=headers,
+            follow_redirects=config.follow_redirects, timeout=config.timeout_seconds
+        ) as response:
+            return await self._read(response, url, config)
+
+    async def _read(self, response, url: str, config):
+        if response.status_code in (429, 503):
+            raise RateLimitedError(url, response.status_code, response.headers.get("retry-after"))
+        if response.status_code != 200:
+            return None, f"HTTP {response.status_code}"
+        content_type = response.headers.get("content-type", "").lower()
+        if not any(t in content_type for t in ("text/html", "application/xhtml+xml", "text/plain")):
+            return None, f"content type {content_type or 'unknown'}"
+
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > config.max_content_size:
+                return None, "body exceeds max_content_size"
+
+        text = body.decode(response.encoding or "utf-8", errors="replace")
+        final_url = str(response.url)
+        response_headers = dict(response.headers)
+
+        if "text/plain" in content_type:
+            return StaticPage(url=final_url, html="", markdown=text, response_headers=response_headers,
+                              metadata={"content_type": content_type}), None
+
+        scanner = _PageScanner()
+        scanner.feed(text)
+        scanner.close()
+
+        reason = self._needs_render(text, scanner)
+        if reason:
+            return None, reason
+
+        page = StaticPage(
+            url=final_url,
+            html=text,
+            markdown=self._markdown.generate_markdown(text, base_url=final_url).raw_markdown,
+            metadata={
+                "title": scanner.title.strip() or None,
+                "description": scanner.meta.get("description"),
+                "keywords": scanner.meta.get("keywords"),
+                "author": scanner.meta.get("author"),
+                "language": scanner.language,
+                "content_type": content_type,
+            },
+            links=self._classify_links(final_url, scanner.hrefs),
+            response_headers=response_headers,
+        )
+        return page, None
+
+    def _needs_render(self, html: str, scanner: _PageScanner) -> Optional[str]:
+        """Why the HTML should be rendered in a browser, or None if it is static."""
+        if SPA_SHELL_PATTERN.search(html):
+            return "single-page app shell"
+        if scanner.text_chars < self.min_text_chars:
+            return f"only {scanner.text_chars} text characters"
+        if html and scanner.script_chars / len(html) > self.max_script_ratio:
+            return "script-heavy page"
+        return None
+
+    def _classify_links(self, base_url: str, hrefs: List[str]) -> Dict[str, List[Dict[str, str]]]:
+        """Resolve hrefs and split them like Crawl4AI's internal/external links."""
+        domain = urlparse(base_url).netloc.lower()
+        links = {"internal": [], "external": []}
+        seen = set()
+        for href in hrefs:
+            url = urldefrag(urljoin(base_url, href))[0]
+            parsed = urlparse(url)
+            if parsed.scheme not in ("http", "https") or url in seen:
+                continue
+            seen.add(url)
+            kind = "internal" if parsed.netloc.lower() == domain else "external"
+            links[kind].append({"href": url})
+        return links
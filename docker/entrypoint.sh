@@ -6,5 +6,6 @@ if [ -d "/app/.venv" ]; then
     source /app/.venv/bin/activate
 fi
 
-# Start the Flask server
+# Start the Flask server through the app factory, which starts the crawl manager
+export FLASK_APP="${FLASK_APP:-app:create_app()}"
 exec flask run --host=0.0.0.0 --port=5000
@@ -1,9 +1,15 @@
 # Graphiti integration for Ragflow Slim
 # Temporal knowledge graph client for entity and relationship extraction
 import os
+import re
+import atexit
 import asyncio
+import base64
+import json
 import logging
-from datetime import datetime
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
 try:
@@ -11,6 +17,11 @@ try:
     from graphiti_core.nodes import EpisodeType
     from graphiti_core.llm_client import OpenAIClient, LLMConfig
     from graphiti_core.embedder.openai import OpenAIEmbedder, OpenAIEmbedderConfig
+    from graphiti_core.utils.bulk_utils import RawEpisode
+    from graphiti_core.utils.datetime_utils import ensure_utc
+    from graphiti_core.search.search_filters import SearchFilters, DateFilter, ComparisonOperator
+    from graphiti_core.helpers import validate_group_id, get_default_group_id
+    from graphiti_core.errors import GroupIdValidationError
     
     # Try to import GeminiClient
     try:
@@ -35,6 +46,7 @@ except ImportError as e:
     GEMINI_RERANKER_AVAILABLE = False
     GeminiClient = None
     GeminiRerankerClient = None
+    GroupIdValidationError = ValueError
     logging.warning(f"graphiti_core not installed: {e}. Graph features will be disabled.")
 
 try:
@@ -49,9 +61,67 @@ NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "graphiti_password")
 
+# Episode ingestion queue settings
+EPISODE_QUEUE_MAXSIZE = int(os.getenv("GRAPHITI_EPISODE_QUEUE_MAXSIZE", "100"))  # per group_id
+EPISODE_BATCH_SIZE = int(os.getenv("GRAPHITI_EPISODE_BATCH_SIZE", "10"))  # 1 disables add_episode_bulk
+EPISODE_BATCH_WINDOW = float(os.getenv("GRAPHITI_EPISODE_BATCH_WINDOW", "0.5"))  # seconds to coalesce a burst
+# Groups allowed to use add_episode_bulk ("default" is the default partition, "*" is every group)
+EPISODE_BULK_GROUPS = frozenset(g.strip() for g in os.getenv("GRAPHITI_EPISODE_BULK_GROUPS", "").split(",") if g.strip())
+EPISODE_MAX_PARALLEL_GROUPS = int(os.getenv("GRAPHITI_MAX_PARALLEL_GROUPS", "4"))
+EPISODE_MAX_CHARS = int(os.getenv("GRAPHITI_EPISODE_MAX_CHARS", "8000"))  # longer bodies become chained segments
+
 # Global Graphiti instance (initialized lazily)
 _graphiti_instance: Optional[Any] = None
 
+# Dedicated event loop that owns the Graphiti client. The async Neo4j driver binds its
+# connection pool to the loop it first runs on, so every graph call is submitted here
+# instead of running on short-lived per-request loops.
+_graphiti_loop: Optional[asyncio.AbstractEventLoop] = None
+_graphiti_loop_thread: Optional[threading.Thread] = None
+_graphiti_loop_lock = threading.Lock()
+
+
+# Databases whose Graphiti schema is known to exist, keyed by "<uri>/<database>".
+# Schema bootstrap runs at most once per process per database.
+_schema_ready: set = set()
+_schema_lock: Optional[asyncio.Lock] = None
+
+# Per-group episode ingestion queue (created on the Graphiti loop)
+_episode_queue: Optional["EpisodeIngestionQueue"] = None
+
+
+def _get_graphiti_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the background event loop thread that owns the Graphiti client."""
+    global _graphiti_loop, _graphiti_loop_thread
+    with _graphiti_loop_lock:
+        if _graphiti_loop is None or _graphiti_loop.is_closed() or not _graphiti_loop_thread.is_alive():
+            _graphiti_loop = asyncio.new_event_loop()
+            _graphiti_loop_thread = threading.Thread(
+                target=_graphiti_loop.run_forever,
+                name="graphiti-loop",
+                daemon=True
+            )
+            _graphiti_loop_thread.start()
+        return _graphiti_loop
+
+
+def _run_on_graphiti_loop(coro, timeout: Optional[float] = None):
+    """Run a coroutine on the Graphiti loop from synchronous code and wait for its result."""
+    future = asyncio.run_coroutine_threadsafe(coro, _get_graphiti_loop())
+    return future.result(timeout)
+
+
+async def _await_on_graphiti_loop(coro):
+    """Await a coroutine on the Graphiti loop from any other event loop."""
+    loop = _get_graphiti_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
 
 def get_graphiti_client() -> Optional[Any]:
     """Get or create the global Graphiti client instance with multi-provider LLM support."""
@@ -189,7 +259,8 @@ def get_graphiti_client() -> Optional[Any]:
 
         logging.info(f"Graphiti client initialized with Neo4j at {NEO4J_URI}")
 
-        # Note: Database schema will be initialized on first episode addition
+        # Note: Database schema is bootstrapped by ensure_graphiti_schema() at startup,
+        # or on first episode addition
     except Exception as e:
         logging.error(f"Failed to initialize Graphiti client: {e}")
         import traceback
@@ -199,78 +270,556 @@ def get_graphiti_client() -> Optional[Any]:
     return _graphiti_instance
 
 
+def _schema_key(client: Any) -> str:
+    """Identify the database a Graphiti client writes to."""
+    database = getattr(getattr(client, "driver", None), "_database", None) or "default"
+    return f"{NEO4J_URI}/{database}"
+
+
+# Indices Graphiti does not create itself: chronological edge history per group
+# pages on (group_id, valid_at) and falls back to created_at when valid_at is unknown.
+TEMPORAL_INDEX_QUERIES = [
+    'CREATE INDEX relation_group_valid_at IF NOT EXISTS FOR ()-[e:RELATES_TO]-() ON (e.group_id, e.valid_at)',
+    'CREATE INDEX relation_group_created_at IF NOT EXISTS FOR ()-[e:RELATES_TO]-() ON (e.group_id, e.created_at)',
+]
+
+
+def _temporal_index_queries(client: Any) -> List[str]:
+    """Extra temporal index DDL for this provider (Neo4j syntax only)."""
+    from graphiti_core.driver.driver import GraphProvider
+
+    return TEMPORAL_INDEX_QUERIES if client.driver.provider == GraphProvider.NEO4J else []
+
+
+def _expected_index_names(client: Any) -> set:
+    """Names of the indices build_indices_and_constraints() would create, plus our temporal indices."""
+    from graphiti_core.graph_queries import get_fulltext_indices, get_range_indices
+
+    provider = client.driver.provider
+    names = set()
+    for query in get_range_indices(provider) + get_fulltext_indices(provider) + _temporal_index_queries(client):
+        match = re.search(r"INDEX\s+(\w+)", query)
+        if match:
+            names.add(match.group(1))
+    return names
+
+
+async def _schema_exists(client: Any) -> bool:
+    """Check index metadata in a single round-trip instead of re-running the DDL."""
+    expected = _expected_index_names(client)
+    if not expected:
+        return False
+    records, _, _ = await client.driver.execute_query(
+        "SHOW INDEXES YIELD name RETURN collect(name) AS names"
+    )
+    existing = set(records[0]["names"]) if records else set()
+    return expected <= existing
+
+
+async def _ensure_schema(client: Any) -> bool:
+    """
+    Bootstrap the Graphiti indices and constraints once per process and database.
+
+    Returns:
+        True if the schema is known to exist, False if initialization failed
+    """
+    global _schema_lock
+    key = _schema_key(client)
+    if key in _schema_ready:
+        return True
+
+    if _schema_lock is None:
+        _schema_lock = asyncio.Lock()
+    async with _schema_lock:
+        if key in _schema_ready:
+            return True
+        try:
+            try:
+                exists = await _schema_exists(client)
+            except Exception as check_e:
+                logging.debug(f"Index metadata check unavailable, building schema: {check_e}")
+                exists = False
+
+            if exists:
+                logging.info(f"Graphiti database schema already present for {key}")
+            else:
+                logging.info("Initializing Graphiti database schema...")
+                await client.build_indices_and_constraints()
+                for query in _temporal_index_queries(client):
+                    await client.driver.execute_query(query)
+                logging.info("Graphiti database schema initialized")
+            _schema_ready.add(key)
+            return True
+        except Exception as schema_e:
+            logging.warning(f"Schema initialization failed (may already exist): {schema_e}")
+            return False
+
+
+async def _ensure_graphiti_schema() -> bool:
+    client = get_graphiti_client()
+    if not client:
+        return False
+    return await _ensure_schema(client)
+
+
+def ensure_graphiti_schema() -> bool:
+    """
+    Eagerly bootstrap the Graphiti schema (intended as a startup hook).
+
+    Returns:
+        True if the schema is known to exist, False otherwise
+    """
+    try:
+        return _run_on_graphiti_loop(_ensure_graphiti_schema())
+    except Exception as e:
+        logging.error(f"Graphiti schema bootstrap failed: {e}")
+        return False
+
+
 async def add_episode_async(
     name: str,
     episode_body: str,
     source_description: str,
-    reference_time: Optional[datetime] = None
+    reference_time: Optional[datetime] = None,
+    group_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Add an episode (document/event) to the temporal knowledge graph.
+
+    Episodes go through the per-group ingestion queue, so episodes of one group
+    are written sequentially and bursts are coalesced into bulk writes. Bodies
+    longer than GRAPHITI_EPISODE_MAX_CHARS are split on sentence boundaries into
+    segments chained through previous_episode_uuids; a single aggregate result
+    is returned for the whole body.
     
     Args:
         name: Unique name/identifier for the episode
         episode_body: The actual text content to extract entities/relationships from
         source_description: Description of the source (e.g., "PDF document from finance team")
         reference_time: Timestamp for temporal tracking (defaults to now)
+        group_id: Graph partition to write to (defaults to the provider default)
     
     Returns:
         Dict with status and episode details
     """
+    return await _await_on_graphiti_loop(
+        _add_episode(name, episode_body, source_description, reference_time, group_id)
+    )
+
+
+async def _add_episode(
+    name: str,
+    episode_body: str,
+    source_description: str,
+    reference_time: Optional[datetime] = None,
+    group_id: Optional[str] = None
+) -> Dict[str, Any]:
     client = get_graphiti_client()
     if not client:
         return {"error": "Graphiti client not available"}
-    
-    try:
-        # Initialize database schema on first use (idempotent operation)
-        logging.info("Attempting to initialize Graphiti database schema...")
+
+    episode = PendingEpisode(
+        name=name,
+        episode_body=episode_body,
+        source_description=source_description,
+        reference_time=reference_time or datetime.now(),
+        segments=split_episode_body(episode_body, EPISODE_MAX_CHARS)
+    )
+    return await _get_episode_queue().submit(group_id, episode)
+
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+
+
+def split_episode_body(text: str, max_chars: int = EPISODE_MAX_CHARS) -> List[str]:
+    """
+    Split text into ordered segments of at most max_chars, breaking on sentence boundaries.
+
+    Sentences are packed greedily into segments; a single sentence longer than
+    max_chars is split on whitespace (or hard-cut if it has none).
+
+    Args:
+        text: Episode body to split
+        max_chars: Maximum characters per segment
+
+    Returns:
+        List of segments (a single-element list if text already fits)
+    """
+    if len(text) <= max_chars:
+        return [text]
+
+    segments: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_BOUNDARY.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars + 1)
+            if cut <= 0:
+                cut = max_chars
+            if current:
+                segments.append(current)
+                current = ""
+            segments.append(sentence[:cut].rstrip())
+            sentence = sentence[cut:].lstrip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            segments.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        segments.append(current)
+    return segments
+
+
+_QUEUE_SHUTDOWN_RESULT = {"error": "Graphiti episode queue shut down"}
+
+
+@dataclass
+class PendingEpisode:
+    """An episode waiting in the ingestion queue."""
+    name: str
+    episode_body: str
+    source_description: str
+    reference_time: datetime
+    segments: List[str] = field(default_factory=list)
+
+    @property
+    def is_chained(self) -> bool:
+        """Whether the body was split into several chained episodes."""
+        return len(self.segments) > 1
+
+
+class EpisodeIngestionQueue:
+    """
+    Orders episode ingestion per group_id and, for opted-in groups, coalesces bursts into bulk writes.
+
+    Graphiti requires episodes to be added sequentially, so each group_id gets one
+    worker that drains its queue in FIFO order. By default every episode goes
+    through add_episode, which invalidates contradicted edges. add_episode_bulk
+    is faster but skips edge invalidation and temporal contradiction handling,
+    so it is only used for the groups in bulk_groups: there, a backlog of
+    episodes arriving within batch_window of each other is written with a
+    single bulk call. An episode that finds its group's queue empty is written
+    straight away with add_episode, without waiting out the window.
+    Long bodies that were split into segments are never bulk-written: their
+    segments are added one by one, each linked to the previous through
+    previous_episode_uuids.
+    Distinct groups are processed in parallel, up to max_parallel_groups.
+    Each group queue is bounded, so submit() waits when a group falls behind.
+    """
+
+    def __init__(
+        self,
+        max_queue_depth: int = EPISODE_QUEUE_MAXSIZE,
+        batch_size: int = EPISODE_BATCH_SIZE,
+        batch_window: float = EPISODE_BATCH_WINDOW,
+        max_parallel_groups: int = EPISODE_MAX_PARALLEL_GROUPS,
+        idle_timeout: float = 30.0,
+        bulk_groups: Optional[frozenset] = None
+    ):
+        self.max_queue_depth = max_queue_depth
+        self.bulk_groups = EPISODE_BULK_GROUPS if bulk_groups is None else frozenset(bulk_groups)
+        self.batch_size = max(batch_size, 1)
+        self.batch_window = batch_window
+        self.idle_timeout = idle_timeout
+        self._group_slots = asyncio.Semaphore(max_parallel_groups)
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+
+    async def submit(self, group_id: Optional[str], episode: PendingEpisode) -> Dict[str, Any]:
+        """Queue an episode for its group and wait until it has been written."""
+        key = group_id or ""
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self.max_queue_depth)
+            self._queues[key] = queue
+
+        future = asyncio.get_running_loop().create_future()
+        # Blocks while the group's queue is full (backpressure)
+        await queue.put((episode, future))
+
+        worker = self._workers.get(key)
+        if worker is None or worker.done():
+            self._workers[key] = asyncio.create_task(self._run_group(key, group_id, queue))
+        return await future
+
+    def uses_bulk(self, group_id: Optional[str]) -> bool:
+        """Whether bursts for a group may be coalesced into add_episode_bulk calls."""
+        if self.batch_size < 2:
+            return False
+        return "*" in self.bulk_groups or (group_id or "default") in self.bulk_groups
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Current number of queued episodes per group."""
+        return {key: queue.qsize() for key, queue in self._queues.items()}
+
+    async def close(self) -> None:
+        """Stop all group workers."""
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+        # Fail anything still queued so callers are not left waiting
+        for queue in self._queues.values():
+            while not queue.empty():
+                _, future = queue.get_nowait()
+                if not future.done():
+                    future.set_result(_QUEUE_SHUTDOWN_RESULT)
+        self._queues.clear()
+
+    async def _run_group(self, key: str, group_id: Optional[str], queue: asyncio.Queue) -> None:
+        carry = None
         try:
-            await client.build_indices_and_constraints()
-            logging.info("Graphiti database schema initialized")
-        except Exception as schema_e:
-            logging.warning(f"Schema initialization failed (may already exist): {schema_e}")
-        
-        # Add episode to graph
-        await client.add_episode(
-            name=name,
-            episode_body=episode_body,
-            source_description=source_description,
-            reference_time=reference_time or datetime.now()
-        )
-        
-        logging.info(f"Added episode '{name}' to knowledge graph")
+            while True:
+                if carry is not None:
+                    first, carry = carry, None
+                else:
+                    try:
+                        first = await asyncio.wait_for(queue.get(), timeout=self.idle_timeout)
+                    except asyncio.TimeoutError:
+                        if queue.empty():
+                            # Retire the idle group; submit() starts a new worker on demand
+                            self._queues.pop(key, None)
+                            self._workers.pop(key, None)
+                            return
+                        continue
+
+                batch = [first]
+                # Only a backlog is worth waiting on; a lone episode is written right away
+                if not first[0].is_chained and not queue.empty() and self.uses_bulk(group_id):
+                    carry = await self._coalesce(queue, batch)
+
+                # Default result if the worker is cancelled mid-write during shutdown
+                results = [_QUEUE_SHUTDOWN_RESULT] * len(batch)
+                try:
+                    async with self._group_slots:
+                        results = await self._write_batch(group_id, [episode for episode, _ in batch])
+                finally:
+                    for (_, future), result in zip(batch, results):
+                        if not future.done():
+                            future.set_result(result)
+        except asyncio.CancelledError:
+            if carry is not None and not carry[1].done():
+                carry[1].set_result(_QUEUE_SHUTDOWN_RESULT)
+            raise
+
+    async def _coalesce(self, queue: asyncio.Queue, batch: list) -> Optional[tuple]:
+        """
+        Extend batch with episodes arriving within the batch window.
+
+        Returns:
+            A chained episode that ended the batch early (to be written next), or None
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_window
+        while len(batch) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if item[0].is_chained:
+                return item
+            batch.append(item)
+        return None
+
+    async def _write_batch(self, group_id: Optional[str], episodes: List[PendingEpisode]) -> List[Dict[str, Any]]:
+        client = get_graphiti_client()
+        if not client:
+            return [{"error": "Graphiti client not available"} for _ in episodes]
+
+        try:
+            # Initialize database schema on first use (once per process and database)
+            await _ensure_schema(client)
+
+            if len(episodes) == 1:
+                return [await self._write_chain(client, group_id, episodes[0])]
+
+            await client.add_episode_bulk(
+                [
+                    RawEpisode(
+                        name=episode.name,
+                        content=episode.episode_body,
+                        source_description=episode.source_description,
+                        source=EpisodeType.text,
+                        reference_time=episode.reference_time
+                    )
+                    for episode in episodes
+                ],
+                group_id=group_id
+            )
+
+            logging.info(f"Added {len(episodes)} episodes to knowledge graph group '{group_id or 'default'}'")
+            return [
+                {
+                    "status": "success",
+                    "episode_name": episode.name,
+                    "group_id": group_id,
+                    "batch_size": len(episodes),
+                    "segments": 1,
+                    "timestamp": episode.reference_time.isoformat()
+                }
+                for episode in episodes
+            ]
+        except Exception as e:
+            logging.error(f"Failed to add episode to Graphiti: {e}")
+            return [{"error": str(e)} for _ in episodes]
+
+    async def _write_chain(self, client, group_id: Optional[str], episode: PendingEpisode) -> Dict[str, Any]:
+        """Add an episode's segments in order, linking each to the one before it."""
+        segments = episode.segments or [episode.episode_body]
+        episode_uuids: List[str] = []
+        for index, segment in enumerate(segments):
+            name = episode.name if len(segments) == 1 else f"{episode.name} [{index + 1}/{len(segments)}]"
+            try:
+                result = await client.add_episode(
+                    name=name,
+                    episode_body=segment,
+                    source=EpisodeType.text,  # same type as batched episodes in _write_batch
+                    source_description=episode.source_description,
+                    # Offset segments so they stay in document order on the timeline
+                    reference_time=episode.reference_time + timedelta(microseconds=index),
+                    group_id=group_id,
+                    previous_episode_uuids=episode_uuids[-1:] or None
+                )
+            except Exception as e:
+                logging.error(f"Failed to add segment {index + 1}/{len(segments)} of {episode.name}: {e}")
+                return {
+                    "error": str(e),
+                    "episode_name": episode.name,
+                    "segments": len(segments),
+                    "segments_written": index,
+                    "episode_uuids": episode_uuids
+                }
+            segment_uuid = getattr(getattr(result, "episode", None), "uuid", None)
+            if segment_uuid:
+                episode_uuids.append(segment_uuid)
+
+        logging.info(f"Added episode {episode.name} ({len(segments)} segment(s)) to knowledge graph group '{group_id or 'default'}'")
         return {
             "status": "success",
-            "episode_name": name,
-            "timestamp": (reference_time or datetime.now()).isoformat()
+            "episode_name": episode.name,
+            "group_id": group_id,
+            "batch_size": 1,
+            "segments": len(segments),
+            "episode_uuids": episode_uuids,
+            "characters": len(episode.episode_body),
+            "timestamp": episode.reference_time.isoformat()
         }
-    except Exception as e:
-        logging.error(f"Failed to add episode to Graphiti: {e}")
-        return {"error": str(e)}
+
+
+def _get_episode_queue() -> EpisodeIngestionQueue:
+    """Get the ingestion queue; must be called on the Graphiti loop."""
+    global _episode_queue
+    if _episode_queue is None:
+        _episode_queue = EpisodeIngestionQueue()
+    return _episode_queue
 
 
 def add_episode(
     name: str,
     episode_body: str,
     source_description: str,
-    reference_time: Optional[datetime] = None
+    reference_time: Optional[datetime] = None,
+    group_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """Synchronous wrapper for add_episode_async."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    return _run_on_graphiti_loop(
+        _add_episode(name, episode_body, source_description, reference_time, group_id)
+    )
+
+
+def resolve_group_id(app_context: Optional[str]) -> Optional[str]:
+    """
+    Map an app context (X-APP header / 'app' field) to a Graphiti group_id.
+
+    Each app gets its own graph partition so ingestion and search only touch
+    that tenant's nodes and edges. Requests without an app context use the
+    provider default partition, for writes and reads alike: None is never
+    read as "all partitions".
+
+    Args:
+        app_context: App name from the request, or None
+
+    Returns:
+        The validated group_id, or None for the default partition
+
+    Raises:
+        GroupIdValidationError: If the app name is not a valid group_id
+    """
+    group_id = (app_context or "").strip()
+    if not group_id:
+        return None
+    validate_group_id(group_id)
+    return group_id
+
+
+def _read_group_ids(client, group_id: Optional[str]) -> List[str]:
+    """Partitions a read may touch: the given group, or the default one writes go to."""
+    return [group_id or get_default_group_id(client.driver.provider)]
+
+
+# Per-partition counts; each subquery is served by the group_id indexes
+GROUP_STATS_QUERY = """
+CALL { MATCH (n:Episodic) WHERE n.group_id = $group_id RETURN count(n) AS episodes }
+CALL { MATCH (n:Entity) WHERE n.group_id = $group_id RETURN count(n) AS entities }
+CALL { MATCH ()-[e:RELATES_TO]->() WHERE e.group_id = $group_id RETURN count(e) AS facts }
+CALL { MATCH (n:Episodic) WHERE n.group_id = $group_id RETURN max(n.valid_at) AS last_episode_at }
+RETURN episodes, entities, facts, last_episode_at
+"""
+
+
+async def get_group_stats_async(group_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get node/edge counts for one graph partition.
+
+    Args:
+        group_id: Graph partition (defaults to the provider default partition)
+
+    Returns:
+        Dict with episode, entity and fact counts plus queued episodes
+    """
+    return await _await_on_graphiti_loop(_get_group_stats(group_id))
+
+
+async def _get_group_stats(group_id: Optional[str] = None) -> Dict[str, Any]:
+    client = get_graphiti_client()
+    if not client:
+        return {"error": "Graphiti client not available"}
+
     try:
-        result = loop.run_until_complete(
-            add_episode_async(name, episode_body, source_description, reference_time)
-        )
-        return result
-    finally:
-        loop.close()
+        partition = group_id or get_default_group_id(client.driver.provider)
+        records, _, _ = await client.driver.execute_query(GROUP_STATS_QUERY, group_id=partition, routing_="r")
+        row = dict(records[0]) if records else {}
+        last_episode_at = _to_datetime(row.get("last_episode_at"))
+        queue_depths = _episode_queue.queue_depths() if _episode_queue is not None else {}
+        return {
+            "group_id": group_id,
+            "episodes": row.get("episodes", 0),
+            "entities": row.get("entities", 0),
+            "facts": row.get("facts", 0),
+            "last_episode_at": last_episode_at.isoformat() if last_episode_at else None,
+            "queued_episodes": queue_depths.get(group_id or "", 0)
+        }
+    except Exception as e:
+        logging.error(f"Failed to get stats for group '{group_id or 'default'}': {e}")
+        return {"error": str(e)}
+
+
+def get_group_stats(group_id: Optional[str] = None) -> Dict[str, Any]:
+    """Synchronous wrapper for get_group_stats_async."""
+    return _run_on_graphiti_loop(_get_group_stats(group_id))
 
 
 async def search_graph_async(
     query: str,
     num_results: int = 10,
-    center_node_uuid: Optional[str] = None
+    center_node_uuid: Optional[str] = None,
+    group_id: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     Search the temporal knowledge graph.
@@ -279,10 +828,22 @@ async def search_graph_async(
         query: Natural language query
         num_results: Maximum number of results to return
         center_node_uuid: Optional UUID to center search around specific node
+        group_id: Graph partition to search (defaults to the provider default partition)
     
     Returns:
         List of relevant entities and relationships from the graph
     """
+    return await _await_on_graphiti_loop(
+        _search_graph(query, num_results, center_node_uuid, group_id)
+    )
+
+
+async def _search_graph(
+    query: str,
+    num_results: int = 10,
+    center_node_uuid: Optional[str] = None,
+    group_id: Optional[str] = None
+) -> List[Dict[str, Any]]:
     client = get_graphiti_client()
     if not client:
         return [{"error": "Graphiti client not available"}]
@@ -291,11 +852,12 @@ async def search_graph_async(
         results = await client.search(
             query=query,
             num_results=num_results,
-            center_node_uuid=center_node_uuid
+            center_node_uuid=center_node_uuid,
+            group_ids=_read_group_ids(client, group_id)
         )
         
-        logging.info(f"Graph search for '{query}' returned {len(results)} results")
-        return results
+        logging.info(f"Graph search for '{query}' in group '{group_id or 'default'}' returned {len(results)} results")
+        return [_edge_to_dict(edge) for edge in results]
     except Exception as e:
         logging.error(f"Graph search failed: {e}")
         return [{"error": str(e)}]
@@ -304,58 +866,208 @@ async def search_graph_async(
 def search_graph(
     query: str,
     num_results: int = 10,
-    center_node_uuid: Optional[str] = None
+    center_node_uuid: Optional[str] = None,
+    group_id: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """Synchronous wrapper for search_graph_async."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        results = loop.run_until_complete(
-            search_graph_async(query, num_results, center_node_uuid)
-        )
-        return results
-    finally:
-        loop.close()
+    return _run_on_graphiti_loop(
+        _search_graph(query, num_results, center_node_uuid, group_id)
+    )
 
 
 async def get_temporal_context_async(
     entity_name: str,
     start_time: Optional[datetime] = None,
-    end_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None,
+    page_size: int = 20,
+    cursor: Optional[str] = None,
+    group_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Get temporal context for an entity within a time range.
+
+    The time window is pushed into the graph queries: facts are kept when they
+    were valid at some point inside [start_time, end_time]. The entity's edge
+    history is returned oldest first, one page at a time.
     
     Args:
         entity_name: Name of the entity to track
         start_time: Start of time range (optional)
         end_time: End of time range (optional)
+        page_size: Number of history edges per page
+        cursor: next_cursor from a previous page to continue the history
+        group_id: Graph partition to read (defaults to the provider default partition)
     
     Returns:
         Dict with entity history and relationships over time
     """
+    return await _await_on_graphiti_loop(
+        _get_temporal_context(entity_name, start_time, end_time, page_size, cursor, group_id)
+    )
+
+
+def build_time_window_filter(
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None
+) -> Optional["SearchFilters"]:
+    """
+    Build SearchFilters selecting facts valid at some point in [start_time, end_time].
+
+    A fact overlaps the window when it became valid no later than end_time and
+    was not invalidated before start_time (or has not been invalidated at all).
+
+    Args:
+        start_time: Start of time range (optional)
+        end_time: End of time range (optional)
+
+    Returns:
+        SearchFilters for Graphiti search, or None when no bound is given
+    """
+    if start_time is None and end_time is None:
+        return None
+
+    filters = SearchFilters()
+    if end_time is not None:
+        filters.valid_at = [[DateFilter(date=ensure_utc(end_time), comparison_operator=ComparisonOperator.less_than_equal)]]
+    if start_time is not None:
+        filters.invalid_at = [
+            [DateFilter(comparison_operator=ComparisonOperator.is_null)],
+            [DateFilter(date=ensure_utc(start_time), comparison_operator=ComparisonOperator.greater_than_equal)],
+        ]
+    return filters
+
+
+def _encode_history_cursor(row: Dict[str, Any]) -> str:
+    payload = {"t": row["sort_time"].isoformat(), "uuid": row["uuid"]}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def decode_history_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor returned as next_cursor by get_temporal_context.
+
+    Args:
+        cursor: Cursor returned with a previous history page
+
+    Returns:
+        Keyset position {"t": sort time, "uuid": edge uuid} of the last fact already listed
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return {"t": ensure_utc(datetime.fromisoformat(payload["t"])), "uuid": str(payload["uuid"])}
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid history cursor: {cursor!r}") from e
+
+
+# Keyset-paginated edge history for one entity. Edges without a valid_at are
+# placed by created_at so every fact has a position on the timeline.
+ENTITY_HISTORY_QUERY = """
+MATCH (n:Entity {name: $entity_name})-[e:RELATES_TO]-(m:Entity)
+WHERE ($group_ids IS NULL OR e.group_id IN $group_ids)
+  AND ($end_time IS NULL OR e.valid_at <= $end_time)
+  AND ($start_time IS NULL OR e.invalid_at IS NULL OR e.invalid_at >= $start_time)
+WITH DISTINCT e, startNode(e) AS source, endNode(e) AS target, coalesce(e.valid_at, e.created_at) AS sort_time
+WHERE $cursor_time IS NULL OR sort_time > $cursor_time OR (sort_time = $cursor_time AND e.uuid > $cursor_uuid)
+RETURN e.uuid AS uuid, e.name AS name, e.fact AS fact, e.group_id AS group_id,
+       source.name AS source, target.name AS target,
+       e.valid_at AS valid_at, e.invalid_at AS invalid_at, e.created_at AS created_at, sort_time
+ORDER BY sort_time, uuid
+LIMIT $limit
+"""
+
+
+def _to_datetime(value: Any) -> Optional[datetime]:
+    """Convert a neo4j temporal value (or datetime) to a Python datetime."""
+    if value is None or isinstance(value, datetime):
+        return value
+    return value.to_native()
+
+
+def _edge_to_dict(edge: Any) -> Dict[str, Any]:
+    """Serialize an EntityEdge search result for JSON responses."""
+    if isinstance(edge, dict):
+        return edge
+
+    def iso(value):
+        return value.isoformat() if value else None
+
+    return {
+        "uuid": getattr(edge, "uuid", None),
+        "name": getattr(edge, "name", None),
+        "fact": getattr(edge, "fact", None),
+        "group_id": getattr(edge, "group_id", None),
+        "valid_at": iso(getattr(edge, "valid_at", None)),
+        "invalid_at": iso(getattr(edge, "invalid_at", None)),
+    }
+
+
+async def _get_temporal_context(
+    entity_name: str,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    page_size: int = 20,
+    cursor: Optional[str] = None,
+    group_id: Optional[str] = None
+) -> Dict[str, Any]:
     client = get_graphiti_client()
     if not client:
         return {"error": "Graphiti client not available"}
     
     try:
-        # Search for the entity
+        cursor_key = decode_history_cursor(cursor) if cursor else {"t": None, "uuid": None}
+
+        # Ranked facts about the entity, filtered to the window inside the search queries
         search_results = await client.search(
             query=entity_name,
-            num_results=5
+            num_results=5,
+            group_ids=_read_group_ids(client, group_id),
+            search_filter=build_time_window_filter(start_time, end_time)
         )
-        
+
+        records, _, _ = await client.driver.execute_query(
+            ENTITY_HISTORY_QUERY,
+            entity_name=entity_name,
+            group_ids=_read_group_ids(client, group_id),
+            start_time=ensure_utc(start_time),
+            end_time=ensure_utc(end_time),
+            cursor_time=cursor_key["t"],
+            cursor_uuid=cursor_key["uuid"],
+            limit=page_size + 1,
+            routing_="r"
+        )
+        rows = []
+        for record in records:
+            row = dict(record)
+            for key in ("valid_at", "invalid_at", "created_at", "sort_time"):
+                row[key] = _to_datetime(row.get(key))
+            rows.append(row)
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        history = []
+        for row in rows:
+            entry = {key: value for key, value in row.items() if key != "sort_time"}
+            for key in ("valid_at", "invalid_at", "created_at"):
+                entry[key] = row[key].isoformat() if row[key] else None
+            history.append(entry)
+
         # Build temporal context
         context = {
             "entity": entity_name,
+            "group_id": group_id,
             "time_range": {
                 "start": start_time.isoformat() if start_time else None,
                 "end": end_time.isoformat() if end_time else None
             },
-            "results": search_results
+            "results": [_edge_to_dict(edge) for edge in search_results],
+            "history": history,
+            "next_cursor": _encode_history_cursor(rows[-1]) if has_more else None
         }
         
-        logging.info(f"Retrieved temporal context for entity '{entity_name}'")
+        logging.info(f"Retrieved temporal context for entity '{entity_name}' ({len(history)} history edges)")
         return context
     except Exception as e:
         logging.error(f"Failed to get temporal context: {e}")
@@ -365,27 +1077,47 @@ async def get_temporal_context_async(
 def get_temporal_context(
     entity_name: str,
     start_time: Optional[datetime] = None,
-    end_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None,
+    page_size: int = 20,
+    cursor: Optional[str] = None,
+    group_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """Synchronous wrapper for get_temporal_context_async."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            get_temporal_context_async(entity_name, start_time, end_time)
-        )
-        return result
-    finally:
-        loop.close()
+    return _run_on_graphiti_loop(
+        _get_temporal_context(entity_name, start_time, end_time, page_size, cursor, group_id)
+    )
 
 
 def close_graphiti_client():
-    """Close the Graphiti client connection."""
-    global _graphiti_instance
+    """Close the Graphiti client connection and stop its event loop."""
+    global _graphiti_instance, _graphiti_loop, _graphiti_loop_thread, _schema_lock, _episode_queue
+    if _episode_queue is not None:
+        try:
+            _run_on_graphiti_loop(_episode_queue.close(), timeout=30)
+        except Exception as e:
+            logging.error(f"Error stopping episode ingestion queue: {e}")
+        finally:
+            _episode_queue = None
+
     if _graphiti_instance:
         try:
-            # Graphiti cleanup if needed
-            _graphiti_instance = None
+            # Close the driver on the loop that owns its connections
+            _run_on_graphiti_loop(_graphiti_instance.close(), timeout=30)
             logging.info("Graphiti client closed")
         except Exception as e:
             logging.error(f"Error closing Graphiti client: {e}")
+        finally:
+            _graphiti_instance = None
+
+    with _graphiti_loop_lock:
+        if _graphiti_loop is not None and not _graphiti_loop.is_closed():
+            _graphiti_loop.call_soon_threadsafe(_graphiti_loop.stop)
+            if _graphiti_loop_thread is not None:
+                _graphiti_loop_thread.join(timeout=5)
+            _graphiti_loop.close()
+        _graphiti_loop = None
+        _graphiti_loop_thread = None
+        _schema_lock = None
+
+
+atexit.register(close_graphiti_client)
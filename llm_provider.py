@@ -4,7 +4,7 @@ Supports: OpenAI, Google AI (Gemini), Ollama
 """
 import os
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 logger = logging.getLogger(__name__)
 
@@ -108,6 +108,11 @@ class LLMConfig:
         else:
             raise ValueError(f"No embeddings provider available")
     
+    def get_embedding_model_version(self, config: Optional[Dict[str, Any]] = None) -> str:
+        """Get a stable "provider:model" tag identifying an embedding space (the current one by default)."""
+        config = config or self.get_embeddings_config()
+        return f"{config['provider']}:{config['model']}"
+    
     def get_provider_info(self) -> Dict[str, Any]:
         """Get current provider information for logging/debugging."""
         return {
@@ -138,6 +143,47 @@ class LLMConfig:
         return "unknown"
 
 
+def embed_texts(texts: List[str], config: Dict[str, Any]) -> List[List[float]]:
+    """
+    Embed a batch of texts with the configured embeddings provider.
+
+    Args:
+        texts: Texts to embed
+        config: Output of llm_config.get_embeddings_config()
+
+    Returns:
+        One embedding per input text, in order
+    """
+    import requests
+
+    provider = config["provider"]
+    if provider == "ollama":
+        response = requests.post(
+            f"{config['base_url']}/api/embed",
+            json={"model": config["model"], "input": texts},
+            timeout=120,
+        )
+        response.raise_for_status()
+        return response.json()["embeddings"]
+    elif provider == "openai":
+        response = requests.post(
+            "https://api.openai.com/v1/embeddings",
+            headers={"Authorization": f"Bearer {config['api_key']}"},
+            json={"model": config["model"], "input": texts},
+            timeout=120,
+        )
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return [item["embedding"] for item in data]
+    elif provider == "google":
+        import google.generativeai as genai
+        genai.configure(api_key=config["api_key"])
+        result = genai.embed_content(model=f"models/{config['model']}", content=texts)
+        return result["embedding"]
+    else:
+        raise ValueError(f"Unknown embeddings provider: {provider}")
+
+
 # Global configuration instance
 llm_config = LLMConfig()
 
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Re-embedding backfill for RAGFlow Slim
+
+Streams documents out of Supabase, re-embeds them with the provider returned by
+llm_provider.get_embeddings_config() and writes the new vectors back in bulk.
+Each row is tagged with the embedding model version so old and new vectors can
+coexist (and be searched separately) while the cutover is in progress.
+
+Usage:
+    python reembed_backfill.py --batch-size 64 --concurrency 4 --checkpoint backfill_checkpoint.json
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from llm_provider import embed_texts
+from supabase_client import document_resume_token, stream_documents, update_document_embeddings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackfillCheckpoint:
+    """Progress of a backfill run, persisted after every written batch."""
+    target_model: str
+    resume_token: Optional[str] = None
+    processed: int = 0
+    skipped: int = 0
+    elapsed_seconds: float = 0.0
+
+    @classmethod
+    def load(cls, path: str, target_model: str) -> 'BackfillCheckpoint':
+        """Load a checkpoint for target_model, or start fresh if none matches."""
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("target_model") == target_model:
+                return cls(**data)
+            logger.warning(f"Ignoring checkpoint for model {data.get('target_model')}; target is {target_model}")
+        return cls(target_model=target_model)
+
+    def save(self, path: str) -> None:
+        """Atomically write the checkpoint so a crash never leaves a torn file."""
+        if not path:
+            return
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(asdict(self), fh)
+        os.replace(tmp_path, path)
+
+
+def _embed_batch(rows: List[dict], config: Dict[str, Any], target_model: str) -> List[dict]:
+    embeddings = embed_texts([row.get("text") or "" for row in rows], config)
+    if len(embeddings) != len(rows):
+        raise RuntimeError(f"Provider returned {len(embeddings)} embeddings for {len(rows)} texts")
+    return [
+        {"id": row["id"], "embedding": embedding, "embedding_model": target_model}
+        for row, embedding in zip(rows, embeddings)
+    ]
+
+
+def run_backfill(
+    batch_size: int = 64,
+    concurrency: int = 4,
+    checkpoint_path: Optional[str] = "backfill_checkpoint.json",
+    embeddings_config: Optional[Dict[str, Any]] = None,
+    target_model: Optional[str] = None,
+    force: bool = False,
+    limit: Optional[int] = None,
+) -> BackfillCheckpoint:
+    """
+    Re-embed every document not already embedded with the target model.
+
+    Batches are embedded concurrently (at most `concurrency` in flight) but written
+    back and checkpointed strictly in keyset order, so the saved resume token never
+    skips past an unwritten row.
+
+    Args:
+        batch_size: Documents per embedding request and per bulk write
+        concurrency: Maximum number of embedding requests in flight
+        checkpoint_path: JSON file used to resume after a crash (None to disable)
+        embeddings_config: Provider config (defaults to llm_config.get_embeddings_config())
+        target_model: Version tag to write (defaults to llm_config.get_embedding_model_version())
+        force: Re-embed rows that already carry the target model tag
+        limit: Stop after this many documents have been re-embedded
+
+    Returns:
+        The final checkpoint with progress counters
+    """
+    if embeddings_config is None or target_model is None:
+        from llm_provider import llm_config
+        embeddings_config = embeddings_config or llm_config.get_embeddings_config()
+        target_model = target_model or llm_config.get_embedding_model_version()
+
+    checkpoint = BackfillCheckpoint.load(checkpoint_path, target_model)
+    run_start = time.time()
+    base_elapsed = checkpoint.elapsed_seconds
+    logger.info(f"Re-embedding documents with {target_model} (resuming after {checkpoint.processed} documents)")
+
+    def flush(window: List[tuple], executor: ThreadPoolExecutor) -> None:
+        futures = [(executor.submit(_embed_batch, rows, embeddings_config, target_model), last_row, skipped)
+                   for rows, last_row, skipped in window]
+        for future, last_row, skipped in futures:
+            updates = future.result()
+            update_document_embeddings(updates)
+            checkpoint.processed += len(updates)
+            checkpoint.skipped += skipped
+            checkpoint.resume_token = document_resume_token(last_row)
+            checkpoint.elapsed_seconds = base_elapsed + (time.time() - run_start)
+            checkpoint.save(checkpoint_path)
+        rate = checkpoint.processed / checkpoint.elapsed_seconds if checkpoint.elapsed_seconds else 0.0
+        logger.info(f"Backfill progress: {checkpoint.processed} re-embedded, {checkpoint.skipped} skipped, {rate:.1f} docs/s")
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        window: List[tuple] = []
+        batch: List[dict] = []
+        skipped = 0
+        budget = limit
+
+        for row in stream_documents(
+            columns=["text", "embedding_model"],
+            page_size=batch_size * concurrency,
+            resume_token=checkpoint.resume_token,
+        ):
+            if not force and row.get("embedding_model") == target_model:
+                skipped += 1
+                continue
+            batch.append(row)
+            if budget is not None:
+                budget -= 1
+            if len(batch) >= batch_size or budget == 0:
+                window.append((batch, batch[-1], skipped))
+                batch, skipped = [], 0
+                if len(window) >= concurrency:
+                    flush(window, executor)
+                    window = []
+            if budget == 0:
+                break
+
+        if batch:
+            window.append((batch, batch[-1], skipped))
+        if window:
+            flush(window, executor)
+
+    logger.info(f"Backfill finished: {checkpoint.processed} re-embedded in {checkpoint.elapsed_seconds:.1f}s")
+    return checkpoint
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-embed documents with the configured embedding model")
+    parser.add_argument('--batch-size', type=int, default=64, help='Documents per embedding request')
+    parser.add_argument('--concurrency', type=int, default=4, help='Embedding requests in flight')
+    parser.add_argument('--checkpoint', default='backfill_checkpoint.json', help='Checkpoint file path')
+    parser.add_argument('--force', action='store_true', help='Re-embed rows already tagged with the target model')
+    parser.add_argument('--limit', type=int, default=None, help='Stop after this many documents')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    checkpoint = run_backfill(
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        checkpoint_path=args.checkpoint,
+        force=args.force,
+        limit=args.limit,
+    )
+    print(json.dumps(asdict(checkpoint), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+-- PostgreSQL migration for Supabase
+-- Add compact (quantized) ANN indexes for document embeddings
+-- The full-precision vector(1536) column stays in the heap for rescoring; only the
+-- ANN index is built over a quantized expression, so the index that must fit in RAM
+-- shrinks to 1/2 (halfvec) or 1/32 (binary) of the float32 size.
+-- Only the index of the configured storage mode is kept: the float32 ivfflat index
+-- (documents_embedding_idx) and the other compact index are dropped, since rescoring
+-- reads the base column and does not need them.
+-- The mode comes from the app.embedding_storage_mode database setting and must match
+-- SUPABASE_EMBEDDING_STORAGE; set it before applying, or switch later with
+--   ALTER DATABASE postgres SET app.embedding_storage_mode = 'halfvec';
+--   SELECT public.apply_embedding_storage_mode('halfvec');
+-- Requires pgvector >= 0.7.0 and documents.embedding of type vector(1536)
+-- (see setup_supabase.sql).
+
+CREATE EXTENSION IF NOT EXISTS vector;
+
+CREATE OR REPLACE FUNCTION public.apply_embedding_storage_mode(storage_mode text)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+BEGIN
+	IF storage_mode NOT IN ('full', 'halfvec', 'binary') THEN
+		RAISE EXCEPTION 'Unknown embedding storage mode: %', storage_mode;
+	END IF;
+
+	IF NOT EXISTS (
+		SELECT 1 FROM information_schema.columns
+		WHERE table_schema = 'public' AND table_name = 'documents'
+		  AND column_name = 'embedding' AND udt_name = 'vector'
+	) THEN
+		RETURN;
+	END IF;
+
+	IF storage_mode = 'full' THEN
+		-- Float32 ivfflat index, as created by setup_supabase.sql
+		IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'documents_embedding_idx') THEN
+			CREATE INDEX documents_embedding_idx ON public.documents
+				USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+		END IF;
+	ELSE
+		DROP INDEX IF EXISTS public.documents_embedding_idx;
+	END IF;
+
+	IF storage_mode = 'halfvec' THEN
+		-- Half-precision index: 2 bytes per dimension
+		IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'idx_documents_embedding_halfvec') THEN
+			CREATE INDEX idx_documents_embedding_halfvec ON public.documents
+				USING hnsw ((embedding::halfvec(1536)) halfvec_cosine_ops);
+		END IF;
+	ELSE
+		DROP INDEX IF EXISTS public.idx_documents_embedding_halfvec;
+	END IF;
+
+	IF storage_mode = 'binary' THEN
+		-- Binary-quantized index: 1 bit per dimension, hamming distance
+		IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'idx_documents_embedding_binary') THEN
+			CREATE INDEX idx_documents_embedding_binary ON public.documents
+				USING hnsw ((binary_quantize(embedding)::bit(1536)) bit_hamming_ops);
+		END IF;
+	ELSE
+		DROP INDEX IF EXISTS public.idx_documents_embedding_binary;
+	END IF;
+END;
+$$;
+
+-- Defaults to 'full' (the SUPABASE_EMBEDDING_STORAGE default), which leaves the indexes unchanged
+SELECT public.apply_embedding_storage_mode(
+	COALESCE(NULLIF(current_setting('app.embedding_storage_mode', true), ''), 'full')
+);
+
+COMMENT ON FUNCTION public.apply_embedding_storage_mode IS 'Keep only the ANN index used by an embedding storage mode (full, halfvec or binary)';
+
+-- Search RPC over the compact indexes.
+-- Over-fetches candidate_count rows from the quantized index, then rescores them
+-- with the full-precision embedding and returns the best match_count.
+CREATE OR REPLACE FUNCTION public.match_documents_compact(
+	query_embedding vector(1536),
+	match_threshold float DEFAULT 0.0,
+	match_count int DEFAULT 10,
+	candidate_count int DEFAULT 40,
+	storage_mode text DEFAULT 'halfvec'
+)
+RETURNS TABLE (
+	id bigint,
+	text text,
+	metadata jsonb,
+	embedding vector,
+	similarity float
+)
+LANGUAGE plpgsql STABLE
+AS $$
+#variable_conflict use_column
+BEGIN
+	IF storage_mode = 'binary' THEN
+		RETURN QUERY
+		WITH candidates AS (
+			SELECT d.id
+			FROM public.documents d
+			ORDER BY binary_quantize(d.embedding)::bit(1536) <~> binary_quantize(query_embedding)
+			LIMIT candidate_count
+		)
+		SELECT d.id, d.text, d.metadata, d.embedding,
+			1 - (d.embedding <=> query_embedding) AS similarity
+		FROM public.documents d
+		JOIN candidates c ON c.id = d.id
+		WHERE 1 - (d.embedding <=> query_embedding) > match_threshold
+		ORDER BY d.embedding <=> query_embedding
+		LIMIT match_count;
+	ELSE
+		RETURN QUERY
+		WITH candidates AS (
+			SELECT d.id
+			FROM public.documents d
+			ORDER BY d.embedding::halfvec(1536) <=> query_embedding::halfvec(1536)
+			LIMIT candidate_count
+		)
+		SELECT d.id, d.text, d.metadata, d.embedding,
+			1 - (d.embedding <=> query_embedding) AS similarity
+		FROM public.documents d
+		JOIN candidates c ON c.id = d.id
+		WHERE 1 - (d.embedding <=> query_embedding) > match_threshold
+		ORDER BY d.embedding <=> query_embedding
+		LIMIT match_count;
+	END IF;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.match_documents_compact TO service_role;
+GRANT EXECUTE ON FUNCTION public.match_documents_compact TO authenticated;
+
+COMMENT ON FUNCTION public.match_documents_compact IS 'Vector search over a quantized ANN index (halfvec or binary) with full-precision rescoring';
@@ -0,0 +1,130 @@
+-- PostgreSQL migration for Supabase
+-- Track which embedding model produced documents.embedding
+-- Lets old and new vectors coexist while reembed_backfill.py migrates rows to a new
+-- embedding model, and lets searches restrict themselves to comparable vectors.
+
+ALTER TABLE public.documents ADD COLUMN IF NOT EXISTS embedding_model TEXT NULL;
+
+DO $$
+BEGIN
+	IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'idx_documents_embedding_model') THEN
+		CREATE INDEX idx_documents_embedding_model ON public.documents(embedding_model);
+	END IF;
+END$$;
+
+COMMENT ON COLUMN public.documents.embedding_model IS 'Embedding model version ("provider:model") that produced the embedding';
+
+-- Bulk write-back for re-embedded rows.
+-- updates: JSON array of {"id": bigint, "embedding": [floats], "embedding_model": text}
+CREATE OR REPLACE FUNCTION public.update_document_embeddings(updates jsonb)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+	updated_count integer;
+BEGIN
+	UPDATE public.documents d
+	SET embedding = u.embedding::vector,
+		embedding_model = u.embedding_model
+	FROM jsonb_to_recordset(updates) AS u(id bigint, embedding text, embedding_model text)
+	WHERE d.id = u.id;
+
+	GET DIAGNOSTICS updated_count = ROW_COUNT;
+	RETURN updated_count;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.update_document_embeddings TO service_role;
+
+-- Model-filtered variant of match_documents (PostgREST picks the overload by argument names)
+CREATE OR REPLACE FUNCTION public.match_documents(
+	query_embedding vector(1536),
+	match_threshold float,
+	match_count int,
+	filter_embedding_model text
+)
+RETURNS TABLE (
+	id bigint,
+	text text,
+	metadata jsonb,
+	embedding vector,
+	similarity float
+)
+LANGUAGE SQL STABLE
+AS $$
+	SELECT
+		id,
+		text,
+		metadata,
+		embedding,
+		1 - (embedding <=> query_embedding) AS similarity
+	FROM public.documents
+	WHERE embedding_model = filter_embedding_model
+	  AND 1 - (embedding <=> query_embedding) > match_threshold
+	ORDER BY embedding <=> query_embedding
+	LIMIT match_count;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.match_documents(vector, float, int, text) TO service_role;
+GRANT EXECUTE ON FUNCTION public.match_documents(vector, float, int, text) TO authenticated;
+
+-- Recreate the compact search RPC with an optional model filter
+DROP FUNCTION IF EXISTS public.match_documents_compact(vector, float, int, int, text);
+
+CREATE OR REPLACE FUNCTION public.match_documents_compact(
+	query_embedding vector(1536),
+	match_threshold float DEFAULT 0.0,
+	match_count int DEFAULT 10,
+	candidate_count int DEFAULT 40,
+	storage_mode text DEFAULT 'halfvec',
+	filter_embedding_model text DEFAULT NULL
+)
+RETURNS TABLE (
+	id bigint,
+	text text,
+	metadata jsonb,
+	embedding vector,
+	similarity float
+)
+LANGUAGE plpgsql STABLE
+AS $$
+#variable_conflict use_column
+BEGIN
+	IF storage_mode = 'binary' THEN
+		RETURN QUERY
+		WITH candidates AS (
+			SELECT d.id
+			FROM public.documents d
+			WHERE filter_embedding_model IS NULL OR d.embedding_model = filter_embedding_model
+			ORDER BY binary_quantize(d.embedding)::bit(1536) <~> binary_quantize(query_embedding)
+			LIMIT candidate_count
+		)
+		SELECT d.id, d.text, d.metadata, d.embedding,
+			1 - (d.embedding <=> query_embedding) AS similarity
+		FROM public.documents d
+		JOIN candidates c ON c.id = d.id
+		WHERE 1 - (d.embedding <=> query_embedding) > match_threshold
+		ORDER BY d.embedding <=> query_embedding
+		LIMIT match_count;
+	ELSE
+		RETURN QUERY
+		WITH candidates AS (
+			SELECT d.id
+			FROM public.documents d
+			WHERE filter_embedding_model IS NULL OR d.embedding_model = filter_embedding_model
+			ORDER BY d.embedding::halfvec(1536) <=> query_embedding::halfvec(1536)
+			LIMIT candidate_count
+		)
+		SELECT d.id, d.text, d.metadata, d.embedding,
+			1 - (d.embedding <=> query_embedding) AS similarity
+		FROM public.documents d
+		JOIN candidates c ON c.id = d.id
+		WHERE 1 - (d.embedding <=> query_embedding) > match_threshold
+		ORDER BY d.embedding <=> query_embedding
+		LIMIT match_count;
+	END IF;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.match_documents_compact TO service_role;
+GRANT EXECUTE ON FUNCTION public.match_documents_compact TO authenticated;
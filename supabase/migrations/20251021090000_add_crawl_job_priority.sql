@@ -0,0 +1,19 @@
+-- PostgreSQL migration for Supabase
+-- Persist the crawl scheduler queue on crawl_jobs
+-- priority orders queued jobs (higher first); queued_at marks pending jobs that were
+-- started and are waiting for a worker, so the queue can be rebuilt after a restart.
+
+ALTER TABLE public.crawl_jobs ADD COLUMN IF NOT EXISTS priority INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE public.crawl_jobs ADD COLUMN IF NOT EXISTS queued_at TIMESTAMP WITH TIME ZONE NULL;
+
+DO $$
+BEGIN
+	-- Queue rebuild scans only queued/running jobs in scheduling order
+	IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'idx_crawl_jobs_queue') THEN
+		CREATE INDEX idx_crawl_jobs_queue ON public.crawl_jobs(priority DESC, queued_at)
+			WHERE status IN ('pending', 'running');
+	END IF;
+END$$;
+
+COMMENT ON COLUMN public.crawl_jobs.priority IS 'Scheduling priority; higher values are crawled first';
+COMMENT ON COLUMN public.crawl_jobs.queued_at IS 'When the job entered the scheduler queue (NULL if never started)';
@@ -0,0 +1,36 @@
+-- PostgreSQL migration for Supabase
+-- Create the recrawl cache used for conditional requests
+-- One row per canonical URL with the HTTP validators (ETag/Last-Modified) and the
+-- content hash of its last crawl, plus title and links so unchanged pages can still
+-- be expanded during multi-page crawls.
+
+DO $$
+BEGIN
+	IF NOT EXISTS (SELECT 1 FROM pg_tables WHERE schemaname = 'public' AND tablename = 'crawl_cache') THEN
+		CREATE TABLE public.crawl_cache (
+			url TEXT PRIMARY KEY,
+			etag TEXT NULL,
+			last_modified TEXT NULL,
+			content_hash VARCHAR(64) NOT NULL,
+			title VARCHAR(500) NULL,
+			links JSONB NOT NULL DEFAULT '[]'::jsonb,
+			checked_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL
+		);
+	END IF;
+END$$;
+
+ALTER TABLE public.crawl_cache ENABLE ROW LEVEL SECURITY;
+
+DO $$
+BEGIN
+	IF NOT EXISTS (
+		SELECT 1 FROM pg_policies WHERE schemaname = 'public' AND tablename = 'crawl_cache' AND policyname = 'Allow all operations for service role'
+	) THEN
+		CREATE POLICY "Allow all operations for service role" ON public.crawl_cache
+			FOR ALL
+			USING (true)
+			WITH CHECK (true);
+	END IF;
+END$$;
+
+COMMENT ON TABLE public.crawl_cache IS 'HTTP validators and content hash of the last crawl of each canonical URL';
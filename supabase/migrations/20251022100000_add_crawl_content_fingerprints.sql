@@ -0,0 +1,44 @@
+-- PostgreSQL migration for Supabase
+-- Store deduplication fingerprints on crawl_content
+-- url_hash/title_hash back the exact-match checks in ContentDeduplicator; simhash is the
+-- 64-bit SimHash of the page (stored signed) and simhash_band_0..3 are its four 16-bit
+-- LSH bands. Pages within 3 bits of each other share at least one band, so a
+-- near-duplicate lookup is four indexed equality probes instead of a table scan.
+
+ALTER TABLE public.crawl_content ADD COLUMN IF NOT EXISTS url_hash VARCHAR(64) NULL;
+ALTER TABLE public.crawl_content ADD COLUMN IF NOT EXISTS title_hash VARCHAR(64) NULL;
+ALTER TABLE public.crawl_content ADD COLUMN IF NOT EXISTS simhash BIGINT NULL;
+ALTER TABLE public.crawl_content ADD COLUMN IF NOT EXISTS simhash_band_0 INTEGER NULL;
+ALTER TABLE public.crawl_content ADD COLUMN IF NOT EXISTS simhash_band_1 INTEGER NULL;
+ALTER TABLE public.crawl_content ADD COLUMN IF NOT EXISTS simhash_band_2 INTEGER NULL;
+ALTER TABLE public.crawl_content ADD COLUMN IF NOT EXISTS simhash_band_3 INTEGER NULL;
+
+DO $$
+BEGIN
+	IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'idx_crawl_content_url_hash') THEN
+		CREATE INDEX idx_crawl_content_url_hash ON public.crawl_content(url_hash);
+	END IF;
+
+	IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'idx_crawl_content_title_hash') THEN
+		CREATE INDEX idx_crawl_content_title_hash ON public.crawl_content(title_hash) WHERE title_hash IS NOT NULL;
+	END IF;
+
+	-- One index per LSH band; lookups OR the four band equalities
+	IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'idx_crawl_content_simhash_band_0') THEN
+		CREATE INDEX idx_crawl_content_simhash_band_0 ON public.crawl_content(simhash_band_0) WHERE simhash_band_0 IS NOT NULL;
+	END IF;
+
+	IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'idx_crawl_content_simhash_band_1') THEN
+		CREATE INDEX idx_crawl_content_simhash_band_1 ON public.crawl_content(simhash_band_1) WHERE simhash_band_1 IS NOT NULL;
+	END IF;
+
+	IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'idx_crawl_content_simhash_band_2') THEN
+		CREATE INDEX idx_crawl_content_simhash_band_2 ON public.crawl_content(simhash_band_2) WHERE simhash_band_2 IS NOT NULL;
+	END IF;
+
+	IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'idx_crawl_content_simhash_band_3') THEN
+		CREATE INDEX idx_crawl_content_simhash_band_3 ON public.crawl_content(simhash_band_3) WHERE simhash_band_3 IS NOT NULL;
+	END IF;
+END$$;
+
+COMMENT ON COLUMN public.crawl_content.simhash IS '64-bit SimHash of the content (two''s complement)';
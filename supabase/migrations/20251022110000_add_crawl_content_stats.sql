@@ -0,0 +1,136 @@
+-- PostgreSQL migration for Supabase
+-- Trigger-maintained duplicate statistics for crawl_content
+-- ContentDeduplicator.get_duplicate_stats used to pull every content_hash and url_hash
+-- into Python. Per-hash reference counts and a single counter row are now kept up to
+-- date on insert/update/delete, so get_crawl_content_stats() reads one row regardless
+-- of table size.
+
+DO $$
+BEGIN
+	IF NOT EXISTS (SELECT 1 FROM pg_tables WHERE schemaname = 'public' AND tablename = 'crawl_content_stats') THEN
+		CREATE TABLE public.crawl_content_stats (
+			id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+			total_content BIGINT NOT NULL DEFAULT 0,
+			unique_content BIGINT NOT NULL DEFAULT 0,
+			unique_urls BIGINT NOT NULL DEFAULT 0
+		);
+	END IF;
+
+	IF NOT EXISTS (SELECT 1 FROM pg_tables WHERE schemaname = 'public' AND tablename = 'crawl_content_hash_refs') THEN
+		CREATE TABLE public.crawl_content_hash_refs (
+			kind CHAR(1) NOT NULL,  -- 'c' content_hash, 'u' url_hash
+			hash VARCHAR(64) NOT NULL,
+			refs BIGINT NOT NULL,
+			PRIMARY KEY (kind, hash)
+		);
+	END IF;
+END$$;
+
+ALTER TABLE public.crawl_content_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.crawl_content_hash_refs ENABLE ROW LEVEL SECURITY;
+
+-- Add (delta = 1) or remove (delta = -1) one reference to a hash; returns the change
+-- in the number of distinct hashes of that kind (1, -1 or 0)
+CREATE OR REPLACE FUNCTION public.crawl_content_ref_hash(ref_kind char, ref_hash text, delta integer)
+RETURNS integer
+LANGUAGE plpgsql
+AS $$
+DECLARE
+	new_refs bigint;
+BEGIN
+	IF ref_hash IS NULL THEN
+		RETURN 0;
+	END IF;
+
+	INSERT INTO public.crawl_content_hash_refs AS r (kind, hash, refs)
+	VALUES (ref_kind, ref_hash, delta)
+	ON CONFLICT (kind, hash) DO UPDATE SET refs = r.refs + delta
+	RETURNING refs INTO new_refs;
+
+	IF new_refs <= 0 THEN
+		DELETE FROM public.crawl_content_hash_refs WHERE kind = ref_kind AND hash = ref_hash;
+		RETURN -1;
+	END IF;
+	RETURN CASE WHEN delta > 0 AND new_refs = 1 THEN 1 ELSE 0 END;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.crawl_content_stats_trigger()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+	d_total bigint := 0;
+	d_content bigint := 0;
+	d_urls bigint := 0;
+BEGIN
+	IF TG_OP IN ('UPDATE', 'DELETE') THEN
+		d_total := d_total - 1;
+		d_content := d_content + public.crawl_content_ref_hash('c', OLD.content_hash, -1);
+		d_urls := d_urls + public.crawl_content_ref_hash('u', OLD.url_hash, -1);
+	END IF;
+	IF TG_OP IN ('INSERT', 'UPDATE') THEN
+		d_total := d_total + 1;
+		d_content := d_content + public.crawl_content_ref_hash('c', NEW.content_hash, 1);
+		d_urls := d_urls + public.crawl_content_ref_hash('u', NEW.url_hash, 1);
+	END IF;
+
+	IF d_total <> 0 OR d_content <> 0 OR d_urls <> 0 THEN
+		UPDATE public.crawl_content_stats
+		SET total_content = total_content + d_total,
+			unique_content = unique_content + d_content,
+			unique_urls = unique_urls + d_urls
+		WHERE id = 1;
+	END IF;
+	RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_crawl_content_stats ON public.crawl_content;
+
+-- Backfill counters from existing rows, then keep them current
+TRUNCATE public.crawl_content_hash_refs;
+INSERT INTO public.crawl_content_hash_refs (kind, hash, refs)
+	SELECT 'c', content_hash, count(*) FROM public.crawl_content GROUP BY content_hash
+	UNION ALL
+	SELECT 'u', url_hash, count(*) FROM public.crawl_content WHERE url_hash IS NOT NULL GROUP BY url_hash;
+
+INSERT INTO public.crawl_content_stats (id, total_content, unique_content, unique_urls)
+	SELECT 1,
+		(SELECT count(*) FROM public.crawl_content),
+		(SELECT count(*) FROM public.crawl_content_hash_refs WHERE kind = 'c'),
+		(SELECT count(*) FROM public.crawl_content_hash_refs WHERE kind = 'u')
+ON CONFLICT (id) DO UPDATE SET
+	total_content = EXCLUDED.total_content,
+	unique_content = EXCLUDED.unique_content,
+	unique_urls = EXCLUDED.unique_urls;
+
+CREATE TRIGGER trg_crawl_content_stats
+	AFTER INSERT OR DELETE OR UPDATE OF content_hash, url_hash ON public.crawl_content
+	FOR EACH ROW EXECUTE FUNCTION public.crawl_content_stats_trigger();
+
+-- Constant-time duplicate statistics (same keys as ContentDeduplicator.get_duplicate_stats)
+CREATE OR REPLACE FUNCTION public.get_crawl_content_stats()
+RETURNS TABLE (
+	total_content bigint,
+	unique_content bigint,
+	unique_urls bigint,
+	duplicate_content bigint,
+	duplicate_urls bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+	SELECT s.total_content,
+		s.unique_content,
+		s.unique_urls,
+		s.total_content - s.unique_content,
+		s.total_content - s.unique_urls
+	FROM public.crawl_content_stats s
+	WHERE s.id = 1;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.get_crawl_content_stats() TO service_role;
+
+COMMENT ON TABLE public.crawl_content_stats IS 'Trigger-maintained crawl_content totals and distinct hash counts';
+COMMENT ON TABLE public.crawl_content_hash_refs IS 'Reference counts per content/url hash backing crawl_content_stats';
@@ -0,0 +1,24 @@
+-- PostgreSQL migration for Supabase
+-- Index crawl job listings for keyset pagination
+-- GET /crawl lists job summaries newest first, filtered by status, and pages with a
+-- (created_at, id) cursor. These indexes serve each page as an ordered index range scan.
+
+DO $$
+BEGIN
+	-- Status-filtered listing; id breaks ties between jobs created in the same instant
+	IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'idx_crawl_jobs_status_created_at') THEN
+		CREATE INDEX idx_crawl_jobs_status_created_at ON public.crawl_jobs(status, created_at DESC, id DESC);
+	END IF;
+
+	-- Unfiltered listing in the same (created_at, id) order
+	IF NOT EXISTS (SELECT 1 FROM pg_indexes WHERE schemaname = 'public' AND indexname = 'idx_crawl_jobs_created_at_id') THEN
+		CREATE INDEX idx_crawl_jobs_created_at_id ON public.crawl_jobs(created_at DESC, id DESC);
+	END IF;
+END$$;
+
+-- Covered by the leading columns of the indexes above
+DROP INDEX IF EXISTS public.idx_crawl_jobs_status;
+DROP INDEX IF EXISTS public.idx_crawl_jobs_created_at;
+
+COMMENT ON INDEX public.idx_crawl_jobs_status_created_at IS 'Keyset pagination of crawl job listings filtered by status';
+COMMENT ON INDEX public.idx_crawl_jobs_created_at_id IS 'Keyset pagination of unfiltered crawl job listings';
@@ -0,0 +1,56 @@
+-- PostgreSQL migration for Supabase
+-- Create the content-addressed store of crawled page bodies
+-- One row per distinct content hash holding the compressed (zstd, or zlib as a
+-- fallback) markdown as bytea. Job results reference bodies by content_hash
+-- instead of embedding them, so a page fetched by many jobs is stored once.
+
+DO $$
+BEGIN
+	IF NOT EXISTS (SELECT 1 FROM pg_tables WHERE schemaname = 'public' AND tablename = 'crawl_content_blobs') THEN
+		CREATE TABLE public.crawl_content_blobs (
+			content_hash VARCHAR(64) PRIMARY KEY,
+			codec VARCHAR(16) NOT NULL,
+			size INTEGER NOT NULL,
+			compressed_size INTEGER NOT NULL,
+			body BYTEA NOT NULL,
+			created_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL
+		);
+	END IF;
+END$$;
+
+-- Bodies are already compressed; skip TOAST's own pglz pass (this also lets
+-- substring() read a slice without detoasting the whole value)
+ALTER TABLE public.crawl_content_blobs ALTER COLUMN body SET STORAGE EXTERNAL;
+
+-- Chunked read of a body, so clients can stream large pages.
+-- p_offset is 1-based; returns NULL if the hash is not stored.
+CREATE OR REPLACE FUNCTION public.read_crawl_content_blob(p_content_hash text, p_offset int, p_length int)
+RETURNS bytea
+LANGUAGE sql STABLE
+AS $$
+	SELECT substring(body FROM p_offset FOR p_length)
+	FROM public.crawl_content_blobs
+	WHERE content_hash = p_content_hash;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.read_crawl_content_blob TO service_role;
+
+ALTER TABLE public.crawl_content_blobs ENABLE ROW LEVEL SECURITY;
+
+DO $$
+BEGIN
+	IF NOT EXISTS (
+		SELECT 1 FROM pg_policies WHERE schemaname = 'public' AND tablename = 'crawl_content_blobs' AND policyname = 'Allow all operations for service role'
+	) THEN
+		CREATE POLICY "Allow all operations for service role" ON public.crawl_content_blobs
+			FOR ALL
+			USING (true)
+			WITH CHECK (true);
+	END IF;
+END$$;
+
+COMMENT ON TABLE public.crawl_content_blobs IS 'Compressed crawled page bodies, stored once per content hash';
+COMMENT ON COLUMN public.crawl_content_blobs.codec IS 'Compression codec of body: zstd or zlib';
+COMMENT ON COLUMN public.crawl_content_blobs.size IS 'Uncompressed body size in bytes';
+COMMENT ON COLUMN public.crawl_content_blobs.body IS 'Compressed body';
+COMMENT ON FUNCTION public.read_crawl_content_blob IS 'Slice of a compressed crawled page body, for chunked reads';
@@ -0,0 +1,8 @@
+-- PostgreSQL migration for Supabase
+-- Remember the content size of each cached page
+-- A 304 Not Modified recrawl rebuilds the page result from crawl_cache; with the size
+-- and hash the job can load the unchanged body from the content store.
+
+ALTER TABLE public.crawl_cache ADD COLUMN IF NOT EXISTS content_size INTEGER NOT NULL DEFAULT 0;
+
+COMMENT ON COLUMN public.crawl_cache.content_size IS 'Size in bytes of the page content at the last crawl';
@@ -0,0 +1,98 @@
+-- PostgreSQL migration for Supabase
+-- Keep untagged documents searchable while the re-embedding backfill runs
+-- Rows written before embedding_model existed (and rows stored with the hash fallback
+-- vector) have a NULL tag. A model-filtered search used to drop them, so until the
+-- backfill had tagged every row /retrieval fell back to "latest documents". Untagged
+-- rows are now matched alongside rows of the requested model; reembed_backfill.py
+-- re-embeds and tags them.
+
+CREATE OR REPLACE FUNCTION public.match_documents(
+	query_embedding vector(1536),
+	match_threshold float,
+	match_count int,
+	filter_embedding_model text
+)
+RETURNS TABLE (
+	id bigint,
+	text text,
+	metadata jsonb,
+	embedding vector,
+	similarity float
+)
+LANGUAGE SQL STABLE
+AS $$
+	SELECT
+		id,
+		text,
+		metadata,
+		embedding,
+		1 - (embedding <=> query_embedding) AS similarity
+	FROM public.documents
+	WHERE (embedding_model = filter_embedding_model OR embedding_model IS NULL)
+	  AND 1 - (embedding <=> query_embedding) > match_threshold
+	ORDER BY embedding <=> query_embedding
+	LIMIT match_count;
+$$;
+
+COMMENT ON FUNCTION public.match_documents(vector, float, int, text) IS 'Vector search over documents embedded with filter_embedding_model, plus untagged (legacy) documents';
+
+CREATE OR REPLACE FUNCTION public.match_documents_compact(
+	query_embedding vector(1536),
+	match_threshold float DEFAULT 0.0,
+	match_count int DEFAULT 10,
+	candidate_count int DEFAULT 40,
+	storage_mode text DEFAULT 'halfvec',
+	filter_embedding_model text DEFAULT NULL
+)
+RETURNS TABLE (
+	id bigint,
+	text text,
+	metadata jsonb,
+	embedding vector,
+	similarity float
+)
+LANGUAGE plpgsql STABLE
+AS $$
+#variable_conflict use_column
+BEGIN
+	IF storage_mode = 'binary' THEN
+		RETURN QUERY
+		WITH candidates AS (
+			SELECT d.id
+			FROM public.documents d
+			WHERE filter_embedding_model IS NULL
+				OR d.embedding_model = filter_embedding_model
+				OR d.embedding_model IS NULL
+			ORDER BY binary_quantize(d.embedding)::bit(1536) <~> binary_quantize(query_embedding)
+			LIMIT candidate_count
+		)
+		SELECT d.id, d.text, d.metadata, d.embedding,
+			1 - (d.embedding <=> query_embedding) AS similarity
+		FROM public.documents d
+		JOIN candidates c ON c.id = d.id
+		WHERE 1 - (d.embedding <=> query_embedding) > match_threshold
+		ORDER BY d.embedding <=> query_embedding
+		LIMIT match_count;
+	ELSE
+		RETURN QUERY
+		WITH candidates AS (
+			SELECT d.id
+			FROM public.documents d
+			WHERE filter_embedding_model IS NULL
+				OR d.embedding_model = filter_embedding_model
+				OR d.embedding_model IS NULL
+			ORDER BY d.embedding::halfvec(1536) <=> query_embedding::halfvec(1536)
+			LIMIT candidate_count
+		)
+		SELECT d.id, d.text, d.metadata, d.embedding,
+			1 - (d.embedding <=> query_embedding) AS similarity
+		FROM public.documents d
+		JOIN candidates c ON c.id = d.id
+		WHERE 1 - (d.embedding <=> query_embedding) > match_threshold
+		ORDER BY d.embedding <=> query_embedding
+		LIMIT match_count;
+	END IF;
+END;
+$$;
+
+COMMENT ON FUNCTION public.match_documents_compact IS 'Vector search over a quantized ANN index (halfvec or binary) with full-precision rescoring; a model filter also matches untagged (legacy) documents';
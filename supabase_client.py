@@ -1,12 +1,21 @@
 # Supabase integration for Ragflow Slim
 # Contributor-safe, modular connection and document storage
 import os
-from typing import Optional
+import base64
+import json
+from typing import Iterator, Optional, Sequence
 from supabase import create_client, Client
 
 SUPABASE_URL = os.getenv("SUPABASE_URL", "<your-supabase-url>")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "<your-supabase-key>")
 
+# Embedding index mode used for search: "full" (float32 index via match_documents),
+# "halfvec" or "binary" (quantized index via match_documents_compact, rescored at full precision)
+EMBEDDING_STORAGE_MODES = ("full", "halfvec", "binary")
+EMBEDDING_STORAGE_MODE = os.getenv("SUPABASE_EMBEDDING_STORAGE", "full").lower()
+# Candidates fetched from the compact index per requested result before rescoring
+RESCORE_OVERFETCH = int(os.getenv("SUPABASE_RESCORE_OVERFETCH", "4"))
+
 # Only create client if valid credentials are provided
 supabase: Optional[Client] = None
 if SUPABASE_URL != "<your-supabase-url>" and SUPABASE_KEY != "<your-supabase-key>":
@@ -15,7 +24,7 @@ if SUPABASE_URL != "<your-supabase-url>" and SUPABASE_KEY != "<your-supabase-key
     except Exception:
         supabase = None
 
-def add_document_to_supabase(text, metadata=None, embedding=None):
+def add_document_to_supabase(text, metadata=None, embedding=None, embedding_model=None):
     if supabase is None:
         raise RuntimeError("Supabase client not initialized. Check SUPABASE_URL and SUPABASE_KEY environment variables.")
     data = {
@@ -23,19 +32,103 @@ def add_document_to_supabase(text, metadata=None, embedding=None):
         "metadata": metadata or {},
         "embedding": embedding or {},
     }
+    if embedding_model:
+        data["embedding_model"] = embedding_model
     response = supabase.table("documents").insert(data).execute()
     return response
 
-def search_documents_supabase(query_embedding, top_k=3):
+def update_document_embeddings(updates):
+    """
+    Write re-computed embeddings back in a single round-trip.
+
+    Args:
+        updates: List of {"id", "embedding", "embedding_model"} dicts
+
+    Returns:
+        Number of rows updated
+    """
+    if supabase is None:
+        raise RuntimeError("Supabase client not initialized. Check SUPABASE_URL and SUPABASE_KEY environment variables.")
+    if not updates:
+        return 0
+    response = supabase.rpc('update_document_embeddings', {'updates': updates}).execute()
+    return response.data or 0
+
+def document_resume_token(row):
+    """Build an opaque resume token pointing just past the given streamed row."""
+    payload = json.dumps({"last_id": row["id"]}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def _decode_resume_token(token):
+    try:
+        return json.loads(base64.urlsafe_b64decode(token.encode("ascii")))["last_id"]
+    except Exception:
+        raise ValueError(f"Invalid resume token: {token!r}")
+
+
+def stream_documents(
+    columns: Optional[Sequence[str]] = None,
+    page_size: int = 500,
+    resume_token: Optional[str] = None,
+) -> Iterator[dict]:
+    """
+    Stream rows of the documents table in keyset (id) order.
+
+    Each page is fetched with ``id > last_id ORDER BY id LIMIT page_size`` so
+    the cost per page stays constant regardless of how far into the table the
+    walk is, unlike OFFSET pagination. Only one page is held in memory.
+
+    Args:
+        columns: Columns to project (defaults to all). ``id`` is always included.
+        page_size: Number of rows fetched per round-trip
+        resume_token: Token from document_resume_token() to continue after a crash
+
+    Yields:
+        Document rows as dicts
+    """
+    if supabase is None:
+        raise RuntimeError("Supabase client not initialized. Check SUPABASE_URL and SUPABASE_KEY environment variables.")
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+
+    if columns:
+        projection = ",".join(["id"] + [c for c in columns if c != "id"])
+    else:
+        projection = "*"
+    last_id = _decode_resume_token(resume_token) if resume_token else None
+
+    while True:
+        query = supabase.table("documents").select(projection)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        response = query.order("id").limit(page_size).execute()
+        rows = response.data or []
+
+        for row in rows:
+            yield row
+
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+def search_documents_supabase(query_embedding, top_k=3, storage_mode=None, embedding_model=None):
     """
     Search documents using vector similarity with Supabase pgvector.
 
     Requires pgvector extension and a match_documents RPC function in Supabase.
-    Falls back to latest documents if vector search fails.
+    In a compact storage mode ("halfvec" or "binary") the match_documents_compact
+    RPC over-fetches candidates from the quantized index and rescores them with
+    the full-precision vectors. Falls back to match_documents, then to latest
+    documents, if vector search fails.
 
     Args:
         query_embedding: The query embedding vector (list of floats)
         top_k: Number of results to return
+        storage_mode: Override for SUPABASE_EMBEDDING_STORAGE
+        embedding_model: Only match rows embedded with this model version, plus
+            untagged legacy rows (needed while a re-embedding backfill is in progress)
 
     Returns:
         List of matching documents with similarity scores
@@ -43,7 +136,32 @@ def search_documents_supabase(query_embedding, top_k=3):
     if supabase is None:
         raise RuntimeError("Supabase client not initialized. Check SUPABASE_URL and SUPABASE_KEY environment variables.")
 
+    import logging
+    mode = (storage_mode or EMBEDDING_STORAGE_MODE).lower()
+    if mode not in EMBEDDING_STORAGE_MODES:
+        logging.warning(f"Unknown embedding storage mode '{mode}', using full precision")
+        mode = "full"
+
     try:
+        if mode != "full":
+            try:
+                # Compact index search with full-precision rescoring
+                # (see supabase/migrations/*_add_compact_embedding_indexes.sql)
+                params = {
+                    'query_embedding': query_embedding,
+                    'match_threshold': 0.0,
+                    'match_count': top_k,
+                    'candidate_count': top_k * max(RESCORE_OVERFETCH, 1),
+                    'storage_mode': mode,
+                }
+                if embedding_model:
+                    params['filter_embedding_model'] = embedding_model
+                response = supabase.rpc('match_documents_compact', params).execute()
+                if response.data:
+                    return response.data
+            except Exception as e:
+                logging.warning(f"Compact vector search ({mode}) failed, falling back to full precision: {e}")
+
         # Try vector similarity search using pgvector RPC function
         # This requires a match_documents function in Supabase:
         # CREATE OR REPLACE FUNCTION match_documents(
@@ -61,14 +179,14 @@ def search_documents_supabase(query_embedding, top_k=3):
         #   LIMIT match_count;
         # $$ LANGUAGE SQL STABLE;
 
-        response = supabase.rpc(
-            'match_documents',
-            {
-                'query_embedding': query_embedding,
-                'match_threshold': 0.0,  # Include all results
-                'match_count': top_k
-            }
-        ).execute()
+        params = {
+            'query_embedding': query_embedding,
+            'match_threshold': 0.0,  # Include all results
+            'match_count': top_k
+        }
+        if embedding_model:
+            params['filter_embedding_model'] = embedding_model
+        response = supabase.rpc('match_documents', params).execute()
 
         if response.data:
             return response.data
@@ -79,7 +197,6 @@ def search_documents_supabase(query_embedding, top_k=3):
 
     except Exception as e:
         # Fallback to latest documents if vector search not available
-        import logging
         logging.warning(f"Vector search failed, falling back to latest documents: {e}")
         response = supabase.table("documents").select("*").order("created_at", desc=True).limit(top_k).execute()
         return response.data
@@ -1,5 +1,7 @@
 import unittest
-from app import app
+from unittest.mock import patch
+
+from app import app, embed_text
 
 class RagflowSlimTestCase(unittest.TestCase):
     def setUp(self):
@@ -23,5 +25,41 @@ class RagflowSlimTestCase(unittest.TestCase):
         resp = self.client.post("/retrieval", json={}, headers={"X-API-KEY": self.api_key})
         self.assertEqual(resp.status_code, 400)
 
+    def test_embed_text_tags_vector_with_the_model_that_produced_it(self):
+        config = {"provider": "openai", "api_key": "k", "model": "text-embedding-3-small"}
+        with patch("llm_provider.llm_config.get_embeddings_config", return_value=config), \
+             patch("llm_provider.embed_texts", return_value=[[0.5, 0.25]]) as embed:
+            self.assertEqual(embed_text("hello"), ([0.5, 0.25], "openai:text-embedding-3-small"))
+        embed.assert_called_once_with(["hello"], config)
+
+        # The hash fallback is not a real embedding space, so it stays untagged
+        with patch("llm_provider.embed_texts", side_effect=RuntimeError("provider down")):
+            embedding, model = embed_text("hello world")
+        self.assertIsNone(model)
+        self.assertEqual(len(embedding), 2)
+    def test_graph_temporal_rejects_bad_page_size_and_cursor(self):
+        headers = {"X-API-KEY": self.api_key}
+        with patch("app.GRAPHITI_AVAILABLE", True), patch("app.get_temporal_context") as temporal:
+            for page_size in ("ten", None, True, 0, 101):
+                resp = self.client.post("/graph/temporal", json={"entity_name": "Alice", "page_size": page_size}, headers=headers)
+                self.assertEqual(resp.status_code, 400, page_size)
+            resp = self.client.post("/graph/temporal", json={"entity_name": "Alice", "cursor": "not-a-cursor"}, headers=headers)
+            self.assertEqual(resp.status_code, 400)
+            self.assertIn("Invalid cursor.", resp.get_json()["error"])
+        temporal.assert_not_called()
+
+    def test_graph_temporal_passes_valid_page_size_and_cursor(self):
+        cursor = "eyJ0IjogIjIwMjUtMDEtMDFUMDA6MDA6MDArMDA6MDAiLCAidXVpZCI6ICJlMSJ9"
+        with patch("app.GRAPHITI_AVAILABLE", True), patch("app.log_output"), \
+             patch("app.get_temporal_context", return_value={"facts": [], "next_cursor": None}) as temporal:
+            resp = self.client.post(
+                "/graph/temporal", json={"entity_name": "Alice", "page_size": "5", "cursor": cursor},
+                headers={"X-API-KEY": self.api_key}
+            )
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(temporal.call_args.kwargs["page_size"], 5)
+        self.assertEqual(temporal.call_args.kwargs["cursor"], cursor)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,135 @@
+import random
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from crawl4ai_source.deduplicator import ContentDeduplicator
+from crawl4ai_source.simhash import SimHashIndex, from_signed64, hamming_distance, simhash, to_signed64
+
+ARTICLE = " ".join(
+    f"Paragraph {i} explains how the crawler schedules pages and stores their content for search."
+    for i in range(40)
+)
+
+
+def test_simhash_is_close_for_near_duplicates_and_far_otherwise():
+    edited = ARTICLE.replace("Paragraph 7 explains", "Paragraph 7 describes").upper()
+    unrelated = " ".join(f"Recipe step {i}: whisk {i} eggs with sugar until fluffy." for i in range(40))
+
+    assert hamming_distance(simhash(ARTICLE), simhash(edited)) <= 3
+    assert hamming_distance(simhash(ARTICLE), simhash(unrelated)) > 10
+    assert simhash("   ") is None
+
+
+def test_index_finds_signatures_within_distance():
+    index = SimHashIndex(num_bands=4, max_distance=3)
+    base = simhash(ARTICLE)
+    index.add("near", base ^ 0b101)
+    index.add("far", base ^ (1 << 3 | 1 << 20 | 1 << 40 | 1 << 60))
+
+    assert index.query(base) == [("near", 2)]
+    index.remove("near")
+    assert index.query(base) == []
+    with pytest.raises(ValueError):
+        SimHashIndex(num_bands=3, max_distance=3)
+
+
+def test_index_lookup_is_fast_at_scale():
+    rng = random.Random(7)
+    index = SimHashIndex()
+    index.add_many((f"page-{i}", rng.getrandbits(64)) for i in range(100_000))
+    target = rng.getrandbits(64)
+    index.add("dup", target ^ (1 << 33))
+
+    started = time.perf_counter()
+    for _ in range(100):
+        matches = index.query(target)
+    per_query = (time.perf_counter() - started) / 100
+
+    assert matches[0] == ("dup", 1)
+    assert per_query < 0.001
+
+
+def test_fingerprint_columns_store_signed_simhash_and_bands():
+    dedup = ContentDeduplicator(MagicMock())
+    fingerprint = dedup.create_fingerprint("https://example.com/a", ARTICLE, "Title", signature=(1 << 63) | 0xABCD)
+
+    columns = dedup.fingerprint_columns(fingerprint)
+
+    assert columns["simhash"] < 0 and from_signed64(columns["simhash"]) == fingerprint.simhash
+    assert [columns[f"simhash_band_{i}"] for i in range(4)] == [0xABCD, 0, 0, 1 << 15]
+    assert columns["url_hash"] == dedup.generate_url_hash("https://example.com/a")
+
+
+@pytest.mark.asyncio
+async def test_similarity_check_uses_band_columns_then_loaded_index():
+    supabase = MagicMock()
+    dedup = ContentDeduplicator(supabase)
+    fingerprint = dedup.create_fingerprint("https://example.com/a", ARTICLE)
+    near = to_signed64(fingerprint.simhash ^ 1)
+    query = supabase.table.return_value.select.return_value
+    query.or_.return_value.limit.return_value.execute.return_value.data = [{"id": "c1", "simhash": near}]
+
+    assert await dedup._check_similarity(fingerprint)
+    band_filter = query.or_.call_args[0][0]
+    assert band_filter.count("simhash_band_") == 4
+
+    query.order.return_value.limit.return_value.execute.return_value.data = [{"id": "c2", "simhash": near}]
+    assert dedup.warm_up() == 1
+    assert dedup.find_near_duplicates(fingerprint) == [{"id": "c2", "distance": 1, "similarity": 1 - 1 / 64}]
+
+
+def test_scalable_bloom_filter_grows_and_keeps_error_rate():
+    from crawl4ai_source.bloom import ScalableBloomFilter
+
+    bloom = ScalableBloomFilter(initial_capacity=100, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"hash-{i}")
+
+    assert len(bloom._filters) > 1
+    assert all(f"hash-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives / 10_000 < 2 * 0.01 * 1.5
+
+
+@pytest.mark.asyncio
+async def test_front_tier_skips_database_for_negatives_and_repeat_hits():
+    supabase = MagicMock()
+    dedup = ContentDeduplicator(supabase)
+    query = supabase.table.return_value.select.return_value
+    query.order.return_value.limit.return_value.execute.return_value.data = [
+        {"id": "c1", "content_hash": "aaa", "url_hash": "uuu", "title_hash": None, "simhash": None}
+    ]
+    dedup.warm_up()
+    query.or_.return_value.limit.return_value.execute.return_value.data = [
+        {"content_hash": "aaa", "url_hash": "uuu", "title_hash": None}
+    ]
+    new_page = dedup.create_fingerprint("https://example.com/new", "brand new words here")
+    new_page.simhash = None
+    known = dedup.create_fingerprint("https://example.com/new", "brand new words here")
+    known.content_hash, known.simhash = "aaa", None
+
+    assert not await dedup.is_duplicate(new_page)
+    assert query.or_.call_count == 0
+    assert await dedup.is_duplicate(known)
+    assert query.or_.call_args[0][0] == "content_hash.eq.aaa"
+    assert await dedup.is_duplicate(known)
+    assert query.or_.call_count == 1
+    assert dedup.cache_stats()["bloom_negatives"] == 1
+    assert dedup.cache_stats()["lru_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_duplicate_stats_come_from_rpc_counters():
+    supabase = MagicMock()
+    supabase.rpc.return_value.execute.return_value.data = [{
+        "total_content": 10, "unique_content": 8, "unique_urls": 6, "duplicate_content": 2, "duplicate_urls": 4,
+    }]
+
+    stats = await ContentDeduplicator(supabase).get_duplicate_stats()
+
+    supabase.rpc.assert_called_once_with("get_crawl_content_stats")
+    supabase.table.assert_not_called()
+    assert stats == {"total_content": 10, "unique_content": 8, "unique_urls": 6,
+                     "duplicate_content": 2, "duplicate_urls": 4}
@@ -140,6 +140,7 @@ class TestAuthentication:
             mock_job.completed_at = None
             mock_job.result = None
             mock_job.error_message = None
+            mock_job.priority = 0
             mock_job.config.to_dict.return_value = {'max_depth': 2}
             mock_create.return_value = mock_job
 
@@ -193,6 +194,36 @@ class TestCrawlJobCreation:
         data = json.loads(response.data)
         assert 'error' in data
 
+    @patch.object(crawl_manager, 'create_jobs_bulk', new_callable=AsyncMock)
+    def test_create_crawl_jobs_batch_from_urls(self, mock_bulk, client, valid_headers, sample_job):
+        """Test bulk job creation from a URL list."""
+        mock_bulk.return_value = ([sample_job], 1, 0)
+
+        request_data = {
+            'urls': ['https://example.com', 'https://example.com/'],
+            'priority': 5
+        }
+
+        response = client.post('/crawl/batch', json=request_data, headers=valid_headers)
+        assert response.status_code == 201
+
+        data = response.get_json()
+        assert data['jobs_created'] == 1
+        assert data['duplicates_skipped'] == 1
+        assert data['rejected'] == 0
+        assert data['job_ids'] == [sample_job.id]
+        args, kwargs = mock_bulk.call_args
+        assert args[0] == request_data['urls']
+        assert isinstance(args[1], CrawlConfig)
+        assert kwargs['priority'] == 5 and kwargs['start'] is True
+
+    def test_create_crawl_jobs_batch_invalid(self, client, valid_headers):
+        """Test bulk job creation needs exactly one of urls or sitemap, with valid URLs."""
+        for body in ({}, {'urls': ['https://example.com'], 'sitemap': 'https://example.com/sitemap.xml'},
+                     {'urls': ['not-a-url']}, {'sitemap': 'https://example.com/sitemap.xml', 'max_urls': 0}):
+            response = client.post('/crawl/batch', json=body, headers=valid_headers)
+            assert response.status_code == 400
+
     @patch.object(crawl_manager, 'create_job', new_callable=AsyncMock)
     def test_create_crawl_job_with_config(self, mock_create, client, valid_headers, sample_job):
         """Test crawl job creation with custom configuration."""
@@ -279,6 +310,27 @@ class TestCrawlJobRetrieval:
         assert kwargs['status'] == CrawlStatus.PENDING
         assert kwargs['limit'] == 10
 
+    @patch.object(crawl_manager, 'list_jobs', new_callable=AsyncMock)
+    def test_list_crawl_jobs_cursor_pagination(self, mock_list, client, valid_headers, sample_job):
+        """Test that a full page returns a cursor that is passed back for the next page."""
+        sample_job.id = '5b6c1f0e-2f5d-4d0a-9a51-3f7c2e8d9b10'  # cursor ids must be UUIDs
+        mock_list.return_value = [sample_job]
+
+        response = client.get('/crawl?limit=1', headers=valid_headers)
+        next_cursor = response.get_json()['next_cursor']
+        assert next_cursor is not None
+
+        mock_list.return_value = []
+        response = client.get(f'/crawl?limit=1&cursor={next_cursor}', headers=valid_headers)
+        assert response.status_code == 200
+        assert mock_list.call_args.kwargs['cursor'] == next_cursor
+        assert response.get_json()['next_cursor'] is None
+
+    def test_list_crawl_jobs_invalid_cursor(self, client, valid_headers):
+        """Test job listing with a malformed cursor."""
+        response = client.get('/crawl?cursor=not-a-cursor', headers=valid_headers)
+        assert response.status_code == 400
+
     def test_list_crawl_jobs_invalid_limit(self, client, valid_headers):
         """Test job listing with invalid limit parameter."""
         response = client.get('/crawl?limit=200', headers=valid_headers)
@@ -355,6 +407,12 @@ class TestRateLimiting:
         # For now, just verify the rate limit function exists and is called
         pass
 
+    @patch('app.rate_limit', return_value=False)
+    def test_metrics_rate_limited(self, mock_rate_limit, client, valid_headers):
+        """Test the metrics endpoint is rate limited like the others."""
+        response = client.get('/crawl/metrics', headers=valid_headers)
+        assert response.status_code == 429
+
 
 class TestErrorHandling:
     """Test error handling across endpoints."""
@@ -369,4 +427,36 @@ class TestErrorHandling:
 
         data = json.loads(response.data)
         assert 'error' in data
-        assert data['error'] == 'Internal server error.'
\ No newline at end of file
+        assert data['error'] == 'Internal server error.'
+
+
+def test_create_app_starts_crawl_manager_once():
+    """The app factory starts the crawl manager (resuming queued jobs) and the schema bootstrap exactly once."""
+    import app as app_module
+
+    with patch.object(app_module, "_services_started", False), \
+         patch.object(app_module, "GRAPHITI_AVAILABLE", True), \
+         patch.object(app_module, "GRAPHITI_EAGER_SCHEMA_INIT", True), \
+         patch.object(app_module.threading, "Thread") as thread, \
+         patch.object(crawl_manager, "start", new_callable=AsyncMock) as start:
+        assert app_module.create_app() is app
+        assert app_module.create_app() is app
+
+    start.assert_awaited_once()
+    thread.assert_called_once_with(target=app_module.ensure_graphiti_schema, name="graphiti-schema-init", daemon=True)
+    thread.return_value.start.assert_called_once_with()
+
+
+def test_importing_app_starts_no_background_services():
+    """Importing the module (pytest, CI, tools) must not connect to Neo4j or start the crawl manager."""
+    import subprocess
+    import sys
+
+    probe = (
+        "import threading, app; "
+        "print(sorted(t.name for t in threading.enumerate() if t.name == 'graphiti-schema-init')); "
+        "print(app._services_started)"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.split("\n")[-3:-1] == ["[]", "False"]
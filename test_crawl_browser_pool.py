@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from crawl4ai_source.browser_pool import BrowserPool
+from crawl4ai_source.models import CrawlConfig
+from crawl4ai_source.service import CrawlService
+
+
+class FakeCrawler:
+    def __init__(self, fail_start=False):
+        self.started = False
+        self.closed = False
+        self.fail_start = fail_start
+        self.fetched = []
+
+    async def start(self):
+        if self.fail_start:
+            raise RuntimeError("no browser installed")
+        self.started = True
+
+    async def close(self):
+        self.closed = True
+
+    async def arun(self, url, config):
+        self.fetched.append(url)
+        return SimpleNamespace(url=url, success="bad" not in url, error_message="boom",
+                               markdown=f"content of {url}", html="", metadata={"title": url}, links={})
+
+
+@pytest.mark.asyncio
+async def test_pool_warms_up_and_tolerates_failed_warm_up():
+    crawlers = [FakeCrawler(), FakeCrawler(fail_start=True)]
+    pool = BrowserPool(lambda: crawlers.pop(0), size=2)
+
+    await pool.start()
+    started = [c.started for c in pool.crawlers]
+    await pool.close()
+
+    assert started == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_lease_goes_to_least_busy_crawler():
+    pool = BrowserPool(FakeCrawler, size=2)
+    await pool.start(warm_up=False)
+
+    async with pool.lease() as first:
+        async with pool.lease() as second:
+            assert first is not second
+        async with pool.lease() as third:
+            assert third is second
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_browser_is_recycled_after_max_pages():
+    created = []
+
+    def factory():
+        created.append(FakeCrawler())
+        return created[-1]
+
+    pool = BrowserPool(factory, size=1, max_pages_per_browser=3, max_memory_growth_mb=None)
+    await pool.start(warm_up=False)
+
+    async with pool.lease(pages=3) as crawler:
+        assert pool.crawlers == [crawler]
+    await asyncio.sleep(0)
+
+    assert len(created) == 2
+    assert pool.crawlers == [created[1]]
+    assert created[0].closed
+    assert pool.stats()["recycled"] == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_crawl_urls_batches_across_pool():
+    service = CrawlService(pool_size=2, warm_up=False)
+    service._pool = BrowserPool(FakeCrawler, size=2)
+    await service._pool.start(warm_up=False)
+    service._crawler = service._pool.crawlers[0]
+    urls = [f"https://example.com/{i}" for i in range(4)] + ["https://example.com/bad"]
+
+    results = await service.crawl_urls(urls, CrawlConfig())
+
+    assert [r.url for r in results] == urls[:4]
+    assert sorted(len(c.fetched) for c in service._pool.crawlers) == [2, 3]
+    assert results[0].content == "content of https://example.com/0"
+    await service.stop()
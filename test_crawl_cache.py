@@ -0,0 +1,147 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from crawl4ai_source.crawl_cache import CacheEntry, CrawlCache
+from crawl4ai_source.manager import CrawlJobManager
+from crawl4ai_source.models import CrawlConfig, CrawlJob, CrawlResult
+from crawl4ai_source.service import CrawlService
+from crawl4ai_source.static_fetcher import StaticFetcher
+
+
+def _service(pages, headers=None):
+    calls = []
+
+    async def arun(url, config):
+        calls.append(url)
+        return SimpleNamespace(url=url, markdown=pages[url], html="", metadata={"title": "Page"},
+                               links={"internal": [{"href": "/next"}]}, response_headers=headers or {})
+
+    service = CrawlService(cache=CrawlCache())
+    service._crawler = MagicMock()
+    service._crawler.arun = arun
+    service._crawler.close = AsyncMock()
+    return service, calls
+
+
+def test_cache_canonicalizes_urls_and_bounds_memory():
+    cache = CrawlCache(max_entries=2)
+    cache.put(CacheEntry(url="https://Example.com/a/?utm_source=x", etag='"v1"'))
+    cache.put(CacheEntry(url="https://example.com/b"))
+    cache.put(CacheEntry(url="https://example.com/c"))
+
+    assert len(cache) == 2
+    assert cache.get("https://example.com/a") is None
+    assert cache.get("https://example.com/c").conditional_headers() == {}
+
+
+@pytest.mark.asyncio
+async def test_batched_lookup_remembers_misses_and_stays_off_the_loop():
+    supabase = MagicMock()
+    select = supabase.table.return_value.select.return_value
+    select.in_.return_value.execute.return_value.data = [
+        CacheEntry(url="https://example.com/a", etag='"v1"').to_dict()
+    ]
+    cache = CrawlCache(supabase)
+    urls = ["https://Example.com/a", "https://example.com/b", "https://example.com/c"]
+
+    found = await cache.get_many_async(urls)
+    assert found["https://Example.com/a"].etag == '"v1"'
+    assert found["https://example.com/b"] is None and found["https://example.com/c"] is None
+    select.in_.assert_called_once_with("url", ["https://example.com/a", "https://example.com/b", "https://example.com/c"])
+
+    # Hits and known misses are answered from memory
+    assert await cache.get_async("https://example.com/b") is None
+    assert cache.get("https://example.com/a").etag == '"v1"'
+    assert select.in_.call_count == 1
+
+    await cache.put_many_async([CacheEntry(url="https://example.com/b", etag='"v2"'),
+                                CacheEntry(url="https://example.com/c")])
+    supabase.table.return_value.upsert.assert_called_once()
+    assert len(supabase.table.return_value.upsert.call_args.args[0]) == 2
+    assert cache.get("https://example.com/b").etag == '"v2"'
+
+
+@pytest.mark.asyncio
+async def test_not_modified_page_skips_browser_and_reuses_cached_links():
+    service, calls = _service({"https://example.com/": "hello"},
+                              headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers)
+        return httpx.Response(304)
+
+    service._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    first = await service.crawl_url("https://example.com/", CrawlConfig())
+    second = await service.crawl_url("https://example.com/", CrawlConfig())
+    await service.stop()
+
+    assert not first.unchanged
+    assert second.unchanged and second.metadata["not_modified"]
+    assert calls == ["https://example.com/"]
+    assert seen_headers[0]["if-none-match"] == '"v1"'
+    assert seen_headers[0]["if-modified-since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert second.content_hash == first.content_hash
+    assert second.links == first.links == ["/next"]
+    # Hash and size let the manager load the unchanged body from the content store
+    assert second.content_size == first.content_size > 0
+    assert second.title == first.title
+
+
+@pytest.mark.asyncio
+async def test_changed_page_reuses_conditional_get_body():
+    service, calls = _service({"https://example.com/": "hello"}, headers={"ETag": '"v1"'})
+    html = "<html><head><title>New</title></head><body><p>" + "Fresh static text. " * 30 + "</p></body></html>"
+    requests = []
+
+    def handler(request):
+        requests.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match"):
+            return httpx.Response(200, headers={"content-type": "text/html", "etag": '"v2"'}, text=html)
+        return httpx.Response(404)
+
+    service._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service._static = StaticFetcher()
+    await service.crawl_url("https://example.com/", CrawlConfig())
+    requests.clear()
+    second = await service.crawl_url("https://example.com/", CrawlConfig())
+    await service.stop()
+
+    assert requests == ['"v1"']  # one conditional GET, no second download
+    assert calls == ["https://example.com/"]  # browser used for the first crawl only
+    assert second.metadata["fetch_mode"] == "http" and "Fresh static text" in second.content
+    assert service.cache.get("https://example.com/").etag == '"v2"'
+
+
+@pytest.mark.asyncio
+async def test_same_content_hash_marks_page_unchanged_without_validators():
+    pages = {"https://example.com/": "hello"}
+    service, calls = _service(pages)
+
+    first = await service.crawl_url("https://example.com/", CrawlConfig())
+    second = await service.crawl_url("https://example.com/", CrawlConfig())
+    pages["https://example.com/"] = "changed"
+    third = await service.crawl_url("https://example.com/", CrawlConfig())
+
+    assert len(calls) == 3
+    assert [first.unchanged, second.unchanged, third.unchanged] == [False, True, False]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_page_skips_downstream_pipeline():
+    manager = CrawlJobManager(MagicMock())
+    manager._integrate_with_supabase = AsyncMock()
+    manager._integrate_with_graphiti = AsyncMock()
+    job = CrawlJob(url="https://example.com/")
+
+    await manager._integrate_with_downstream(job, CrawlResult(url=job.url, unchanged=True))
+    manager._integrate_with_supabase.assert_not_awaited()
+    manager._integrate_with_graphiti.assert_not_awaited()
+
+    await manager._integrate_with_downstream(job, CrawlResult(url=job.url, content="new"))
+    await manager._pipeline.join()
+    manager._integrate_with_supabase.assert_awaited_once()
+    manager._integrate_with_graphiti.assert_awaited_once()
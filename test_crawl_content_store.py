@@ -0,0 +1,98 @@
+import hashlib
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from crawl4ai_source.content_store import ContentStore, FilesystemBackend, S3Backend, SupabaseBackend, ZSTD_AVAILABLE
+from crawl4ai_source.job_store import job_to_row
+from crawl4ai_source.models import CrawlJob, CrawlResult
+
+
+def _hash(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def test_filesystem_store_compresses_once_per_hash(tmp_path):
+    store = ContentStore(FilesystemBackend(str(tmp_path)))
+    content = "# Heading\n\n" + "Crawled paragraph with text. " * 2000
+    key = _hash(content)
+
+    store.put(key, content)
+    # Another store (e.g. after a restart) finds the existing blob instead of rewriting it
+    again = ContentStore(FilesystemBackend(str(tmp_path)))
+    again.put(key, content)
+
+    assert store.get(key) == content
+    assert store.stats()["blobs_written"] == 1 and again.stats()["duplicates_skipped"] == 1
+    assert store.stats()["bytes_stored"] < len(content) / 10
+    assert store.stats()["codec"] == ("zstd" if ZSTD_AVAILABLE else "zlib")
+    assert store.get(_hash("missing")) is None
+
+
+def test_streaming_read_handles_split_multibyte_characters(tmp_path):
+    store = ContentStore(FilesystemBackend(str(tmp_path)), codec="zlib")
+    content = "Überschrift – 日本語のテキスト 🚀 " * 5000
+    key = _hash(content)
+    store.put(key, content)
+
+    chunks = list(store.iter_text(key, chunk_size=7))
+    assert len(chunks) > 1 and "".join(chunks) == content
+
+
+def test_s3_backend_round_trip_with_compatible_client():
+    objects = {}
+    client = MagicMock()
+    client.put_object.side_effect = lambda Bucket, Key, Body, Metadata: objects.__setitem__(Key, Body)
+    client.head_object.side_effect = lambda Bucket, Key: objects[Key]
+
+    def get_object(Bucket, Key):
+        body = MagicMock()
+        data = objects[Key]
+        body.iter_chunks.side_effect = lambda size: (data[i:i + size] for i in range(0, len(data), size))
+        return {"Body": body}
+
+    client.get_object.side_effect = get_object
+    store = ContentStore(S3Backend("crawl", client=client), codec="zlib")
+    content = "stored in a bucket " * 100
+    store.put(_hash(content), content)
+
+    assert list(objects) == [f"crawl-content/{_hash(content)}"]
+    assert store.get(_hash(content)) == content
+
+
+def test_supabase_backend_stores_bytea_and_reads_in_chunks():
+    rows = {}
+    supabase = MagicMock()
+    supabase.table.return_value.upsert.side_effect = lambda row, ignore_duplicates: rows.__setitem__(row["content_hash"], row) or MagicMock()
+
+    def read_slice(name, params):
+        # Emulates read_crawl_content_blob: substring of the bytea, hex-encoded by PostgREST
+        row = rows.get(params["p_content_hash"])
+        start = params["p_offset"] - 1
+        response = MagicMock()
+        response.data = None if row is None else "\\x" + bytes.fromhex(row["body"][2:])[start:start + params["p_length"]].hex()
+        return MagicMock(execute=MagicMock(return_value=response))
+
+    supabase.rpc.side_effect = read_slice
+    supabase.table.return_value.select.return_value.eq.return_value.limit.return_value.execute.return_value.data = []
+    store = ContentStore(SupabaseBackend(supabase), codec="zlib")
+    content = "stored in postgres " * 2000
+    store.put(_hash(content), content)
+
+    assert rows[_hash(content)]["body"].startswith("\\x")
+    assert "".join(store.iter_text(_hash(content), chunk_size=64)) == content
+    assert supabase.rpc.call_count > 1
+    assert store.get(_hash("missing")) is None
+
+
+def test_job_rows_reference_stored_content_by_hash(tmp_path):
+    store = ContentStore(FilesystemBackend(str(tmp_path)))
+    content = "page body " * 50
+    job = CrawlJob(url="https://example.com")
+    job.mark_completed(CrawlResult(url=job.url, content=content, content_hash=_hash(content), content_size=len(content)))
+
+    assert json.loads(job_to_row(job, store)["result"])["content"] == content
+    store.put(_hash(content), content)
+    result = json.loads(job_to_row(job, store)["result"])
+    assert "content" not in result and result["content_hash"] == _hash(content)
@@ -0,0 +1,99 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from crawl4ai_source.bloom import BloomFilter
+from crawl4ai_source.models import CrawlConfig
+from crawl4ai_source.service import CrawlService
+
+SITE = {
+    "https://example.com": ["/a", "/b?utm_source=x", "https://other.com/x", "mailto:me@example.com"],
+    "https://example.com/a": ["/a/1", "/b", "#top"],
+    "https://example.com/b": ["/b/1", "https://example.com/a/"],
+    "https://example.com/a/1": ["/deeper"],
+    "https://example.com/b/1": [],
+}
+
+
+class FakePage:
+    def __init__(self, url):
+        self.url = url
+        self.html = f"<html><title>{url}</title><body>{url}</body></html>"
+        self.metadata = {"title": url}
+        self.links = {"internal": [{"href": href} for href in SITE.get(url, [])], "external": []}
+        self.markdown = None
+
+
+def _service(fetched, active=None, peak=None):
+    async def arun(url, config):
+        fetched.append(url)
+        if active is not None:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+        if url.rstrip("/").split("?")[0] not in SITE:
+            raise RuntimeError("404")
+        return FakePage(url.split("?")[0].rstrip("/"))
+
+    service = CrawlService()
+    service._crawler = MagicMock()
+    service._crawler.arun = arun
+    return service
+
+
+def test_bloom_filter_membership():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+
+    assert bloom.add("https://example.com/a")
+    assert not bloom.add("https://example.com/a")
+    assert "https://example.com/a" in bloom
+    assert len(bloom) == 1
+    false_positives = sum(f"https://example.com/{i}" in bloom for i in range(1000))
+    assert false_positives < 30
+
+
+@pytest.mark.asyncio
+async def test_crawl_site_expands_same_domain_links_breadth_first():
+    fetched = []
+    service = _service(fetched)
+
+    pages = [page async for page in service.crawl_site("https://example.com", CrawlConfig(max_depth=3))]
+
+    assert fetched[0] == "https://example.com"
+    assert sorted(fetched) == sorted(set(fetched))  # canonical URLs fetched once
+    depths = {page.url: page.metadata["depth"] for page in pages}
+    assert depths == {
+        "https://example.com": 0,
+        "https://example.com/a": 1,
+        "https://example.com/b": 1,
+        "https://example.com/a/1": 2,
+        "https://example.com/b/1": 2,
+    }
+    assert not any("other.com" in url or "deeper" in url for url in fetched)
+
+
+@pytest.mark.asyncio
+async def test_crawl_site_default_depth_fetches_single_page():
+    fetched = []
+    service = _service(fetched)
+
+    pages = [page async for page in service.crawl_site("https://example.com", CrawlConfig())]
+
+    assert [page.url for page in pages] == ["https://example.com"]
+    assert fetched == ["https://example.com"]
+
+
+@pytest.mark.asyncio
+async def test_crawl_site_bounds_concurrency_and_page_count():
+    fetched, active, peak = [], [0], [0]
+    service = _service(fetched, active, peak)
+
+    pages = [page async for page in service.crawl_site(
+        "https://example.com", CrawlConfig(max_depth=5, max_pages=3, concurrency=2)
+    )]
+
+    assert peak[0] <= 2
+    assert len(fetched) == 3
+    assert len(pages) == 3
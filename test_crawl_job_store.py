@@ -0,0 +1,173 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from crawl4ai_source.job_store import JobStateStore
+from crawl4ai_source.models import CrawlJob, CrawlResult, CrawlStatus
+
+
+def _upserted_batches(supabase):
+    return [call.args[0] for call in supabase.table.return_value.upsert.call_args_list]
+
+
+@pytest.mark.asyncio
+async def test_transitions_coalesce_into_one_batched_upsert():
+    supabase = MagicMock()
+    store = JobStateStore(supabase, flush_interval=0.05)
+    jobs = [CrawlJob(url=f"https://example.com/{i}") for i in range(3)]
+
+    for job in jobs:
+        job.mark_queued()
+        await store.write(job)
+        job.mark_running()
+        await store.write(job)
+    assert store.pending_row(jobs[0].id)["status"] == "running"
+    assert supabase.table.return_value.upsert.call_count == 0
+
+    await asyncio.sleep(0.1)
+    await store.close()
+
+    batches = _upserted_batches(supabase)
+    assert len(batches) == 1
+    assert sorted(row["id"] for row in batches[0]) == sorted(job.id for job in jobs)
+    assert store.stats()["coalesced"] == 3
+
+
+@pytest.mark.asyncio
+async def test_write_now_flushes_buffered_rows_with_terminal_state():
+    supabase = MagicMock()
+    store = JobStateStore(supabase, flush_interval=60)
+    running, finished = CrawlJob(url="https://example.com/a"), CrawlJob(url="https://example.com/b")
+    running.mark_running()
+    await store.write(running)
+
+    finished.mark_completed(CrawlResult(url=finished.url, content="done", content_size=4, crawl_time=0.1))
+    await store.write_now(finished)
+
+    batches = _upserted_batches(supabase)
+    assert len(batches) == 1 and {row["status"] for row in batches[0]} == {"running", "completed"}
+    assert store.pending_row(running.id) is None
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_size_trigger_and_failed_flush_retry():
+    supabase = MagicMock()
+    supabase.table.return_value.upsert.return_value.execute.side_effect = [Exception("timeout"), MagicMock()]
+    store = JobStateStore(supabase, flush_interval=60, max_batch=2)
+    first, second = CrawlJob(url="https://example.com/a"), CrawlJob(url="https://example.com/b")
+
+    await store.write(first)
+    await store.write(second)
+    await asyncio.sleep(0.01)
+    # The failed batch is kept, but a newer state written meanwhile wins
+    assert store.stats()["pending"] == 2
+    first.mark_cancelled()
+    await store.write(first)
+    assert store.pending_row(first.id)["status"] == CrawlStatus.CANCELLED.value
+
+    await store.close()
+    assert len(_upserted_batches(supabase)) == 2 and store.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_projects_summary_columns_and_continues_after_cursor():
+    from crawl4ai_source.manager import JOB_SUMMARY_COLUMNS, CrawlJobManager, encode_job_cursor
+
+    last = CrawlJob(url="https://example.com")
+    supabase = MagicMock()
+    query = supabase.table.return_value.select.return_value
+    query.order.return_value = query
+    query.limit.return_value = query
+    query.eq.return_value = query
+    query.or_.return_value = query
+    query.execute.return_value.data = []
+    manager = CrawlJobManager(supabase)
+
+    await manager.list_jobs(status=CrawlStatus.COMPLETED, limit=20, cursor=encode_job_cursor(last))
+
+    supabase.table.return_value.select.assert_called_once_with(JOB_SUMMARY_COLUMNS)
+    assert "result" not in JOB_SUMMARY_COLUMNS.split(",")
+    keyset = query.or_.call_args.args[0]
+    assert last.created_at.isoformat() in keyset and f'id.lt."{last.id}"' in keyset
+    with pytest.raises(ValueError):
+        await manager.list_jobs(cursor="garbage")
+    # The id lands in the filter string, so anything but a UUID is rejected
+    with pytest.raises(ValueError):
+        await manager.list_jobs(cursor=encode_job_cursor(CrawlJob(id='x"),status.neq.(', url="https://example.com")))
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_merges_buffered_rows_without_flushing():
+    from crawl4ai_source.job_store import job_to_row
+    from crawl4ai_source.manager import JOB_SUMMARY_COLUMNS, CrawlJobManager
+
+    finished = CrawlJob(url="https://example.com/done")
+    finished.mark_running()
+    stale_row = {column: job_to_row(finished)[column] for column in JOB_SUMMARY_COLUMNS.split(",")}
+    supabase = MagicMock()
+    query = supabase.table.return_value.select.return_value
+    query.order.return_value = query
+    query.limit.return_value = query
+    query.eq.return_value = query
+    manager = CrawlJobManager(supabase)
+
+    finished.mark_completed(CrawlResult(url=finished.url, content="body"))
+    await manager._job_store.write(finished)
+
+    query.execute.return_value.data = []  # stored row is still "running"
+    completed = await manager.list_jobs(status=CrawlStatus.COMPLETED, limit=20)
+    query.execute.return_value.data = [stale_row]
+    running = await manager.list_jobs(status=CrawlStatus.RUNNING, limit=20)
+
+    assert [job.id for job in completed] == [finished.id] and completed[0].result is None
+    assert running == []
+    query.limit.assert_called_with(21)  # over-fetched by the one buffered row
+    assert supabase.table.return_value.upsert.call_count == 0
+    await manager._job_store.close()
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_inserts_in_batches_and_queues_jobs():
+    from crawl4ai_source.manager import CrawlJobManager
+    from crawl4ai_source.models import CrawlConfig
+
+    async def urls():
+        for url in ["https://example.com/a", "https://example.com/b", "https://EXAMPLE.com/a",
+                    "https://example.com/c", "https://example.com/d"]:
+            yield url
+
+    supabase = MagicMock()
+    manager = CrawlJobManager(supabase)
+    manager._scheduler.start = AsyncMock()
+    manager._scheduler.submit = AsyncMock()
+
+    jobs, duplicates, rejected = await manager.create_jobs_bulk(urls(), CrawlConfig(), priority=3, batch_size=2)
+
+    inserted = [call.args[0] for call in supabase.table.return_value.insert.call_args_list]
+    assert [len(rows) for rows in inserted] == [2, 2]
+    assert duplicates == 1 and rejected == 0
+    assert all(row["queued_at"] and row["priority"] == 3 for rows in inserted for row in rows)
+    assert [call.args[0] for call in manager._scheduler.submit.call_args_list] == [job.id for job in jobs]
+    assert manager._job_store.stats()["rows_inserted"] == 4
+
+
+@pytest.mark.asyncio
+async def test_sitemap_jobs_reject_non_http_and_foreign_host_locs():
+    from crawl4ai_source.manager import CrawlJobManager
+    from crawl4ai_source.models import CrawlConfig
+
+    async def locs(*args):
+        for url in ["https://example.com/a", "file:///etc/passwd", "https://evil.test/a",
+                    "javascript:alert(1)", "https:///no-host", "https://EXAMPLE.com/b", "https://example.com/a"]:
+            yield url
+
+    manager = CrawlJobManager(MagicMock())
+    with patch("crawl4ai_source.manager.stream_sitemap_urls", side_effect=locs):
+        jobs, duplicates, rejected = await manager.create_jobs_from_sitemap(
+            "https://example.com/sitemap.xml", CrawlConfig(), max_urls=100, start=False
+        )
+
+    assert [job.url for job in jobs] == ["https://example.com/a", "https://EXAMPLE.com/b"]
+    assert duplicates == 1 and rejected == 4
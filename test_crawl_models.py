@@ -7,6 +7,7 @@ Tests cover serialization, deserialization, and business logic methods.
 
 import pytest
 from datetime import datetime
+from werkzeug.exceptions import BadRequest
 from crawl4ai_source.models import (
     CrawlStatus,
     CrawlConfig,
@@ -80,6 +81,9 @@ class TestCrawlConfig:
             "user_agent": "RAGFlow-Crawler/1.0",
             "follow_redirects": True,
             "extract_metadata": True,
+            "group_id": None,
+            "max_pages": None,
+            "concurrency": None,
         }
         assert data == expected
 
@@ -405,6 +409,19 @@ class TestCrawlJobRequest:
         assert config.user_agent == "RAGFlow-Crawler/1.0"
         assert config.follow_redirects is True
         assert config.extract_metadata is True
+        assert config.max_pages is None
+        assert config.concurrency is None
+
+    def test_site_crawl_bounds_are_carried_into_config(self):
+        """Test per-job max_pages and concurrency are validated and reach CrawlConfig."""
+        request = CrawlJobRequest.from_dict({"url": "https://example.com", "max_pages": 50, "concurrency": 2})
+        config = CrawlConfig.from_dict(request.to_config().to_dict())
+        assert config.max_pages == 50
+        assert config.concurrency == 2
+
+        for bad in ({"max_pages": 0}, {"concurrency": "4"}, {"max_pages": True}):
+            with pytest.raises(BadRequest):
+                CrawlJobRequest.from_dict({"url": "https://example.com", **bad})
 
 
 class TestCrawlJobResponse:
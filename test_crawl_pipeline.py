@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from crawl4ai_source.models import CrawlJob, CrawlResult
+from crawl4ai_source.pipeline import IngestPipeline, PipelineStage
+
+
+def _page(i):
+    return CrawlJob(url=f"https://example.com/{i}"), CrawlResult(url=f"https://example.com/{i}", content=f"page {i}")
+
+
+@pytest.mark.asyncio
+async def test_slow_graph_branch_does_not_hold_up_vector_writes():
+    stored, graphed = [], []
+    release_graph = asyncio.Event()
+
+    async def embed(item):
+        item.data["embedding"] = [len(item.result.content)]
+        return item
+
+    async def store(item):
+        stored.append((item.result.url, item.data["embedding"]))
+
+    async def graph(item):
+        await release_graph.wait()
+        graphed.append(item.result.url)
+
+    pipeline = IngestPipeline(
+        [PipelineStage("embed", embed, downstream=("vector_store",)),
+         PipelineStage("vector_store", store),
+         PipelineStage("graph", graph, max_queue=10)],
+        entry=("embed", "graph"),
+    )
+    for i in range(5):
+        await pipeline.submit(*_page(i))
+    await pipeline.stages["vector_store"].queue.join()
+    await pipeline.stages["embed"].queue.join()
+    await asyncio.sleep(0.01)
+
+    assert len(stored) == 5 and stored[0][1] == [len("page 0")]
+    assert graphed == [] and pipeline.metrics()["graph"]["in_flight"] == 1
+
+    release_graph.set()
+    await pipeline.stop()
+    assert len(graphed) == 5
+    assert pipeline.metrics()["graph"]["processed"] == 5
+
+
+@pytest.mark.asyncio
+async def test_full_queue_applies_backpressure_and_failures_are_counted():
+    release = asyncio.Event()
+
+    async def slow(item):
+        await release.wait()
+        if item.result.url.endswith("/1"):
+            raise RuntimeError("LLM timeout")
+
+    pipeline = IngestPipeline([PipelineStage("graph", slow, workers=1, max_queue=1)], entry=("graph",))
+    await pipeline.submit(*_page(0))
+    await asyncio.sleep(0.01)  # worker takes page 0
+    await pipeline.submit(*_page(1))  # fills the queue
+
+    blocked = asyncio.create_task(pipeline.submit(*_page(2)))
+    await asyncio.sleep(0.05)
+    assert not blocked.done() and pipeline.metrics()["graph"]["blocked_puts"] == 1
+
+    release.set()
+    await blocked
+    await pipeline.join()
+    metrics = pipeline.metrics()["graph"]
+    assert metrics["processed"] == 2 and metrics["failed"] == 1 and metrics["queue_depth"] == 0
+    await pipeline.stop()
+
+
+def test_unknown_downstream_stage_is_rejected():
+    async def noop(item):
+        return item
+
+    with pytest.raises(ValueError):
+        IngestPipeline([PipelineStage("embed", noop, downstream=("missing",))], entry=("embed",))
+
+
+@pytest.mark.asyncio
+async def test_drop_when_full_stage_never_blocks_submit():
+    release = asyncio.Event()
+    stored = []
+
+    async def store(item):
+        stored.append(item.result.url)
+
+    async def graph(item):
+        await release.wait()
+
+    pipeline = IngestPipeline(
+        [PipelineStage("vector_store", store),
+         PipelineStage("graph", graph, workers=1, max_queue=1, drop_when_full=True)],
+        entry=("vector_store", "graph"),
+    )
+    await pipeline.submit(*_page(0))
+    await asyncio.sleep(0.01)  # graph worker takes page 0
+    await pipeline.submit(*_page(1))  # fills the graph queue
+    await asyncio.wait_for(pipeline.submit(*_page(2)), timeout=1)
+
+    await pipeline.stages["vector_store"].queue.join()
+    metrics = pipeline.metrics()["graph"]
+    assert len(stored) == 3
+    assert metrics["dropped"] == 1 and metrics["blocked_puts"] == 0
+
+    release.set()
+    await pipeline.stop()
+    assert pipeline.metrics()["graph"]["processed"] == 2
@@ -0,0 +1,238 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from crawl4ai_source.models import CrawlConfig
+from crawl4ai_source.rate_limiter import RateLimiter, RateLimitRule
+from crawl4ai_source.service import CrawlService
+
+
+def _limiter(requests_per_minute=600, burst_limit=3):
+    limiter = RateLimiter()
+    limiter.set_domain_rule("example.com", RateLimitRule(requests_per_minute=requests_per_minute, burst_limit=burst_limit))
+    return limiter
+
+
+@pytest.mark.asyncio
+async def test_concurrent_waiters_cannot_exceed_burst():
+    limiter = _limiter()
+    started = time.monotonic()
+    released = []
+
+    async def request(i):
+        await limiter.wait_if_needed(f"https://example.com/{i}")
+        released.append((i, time.monotonic() - started))
+
+    await asyncio.gather(*(request(i) for i in range(6)))
+
+    times = [t for _, t in released]
+    # Burst of 3 at once, then one slot per 0.1s emission interval
+    assert sum(t < 0.05 for t in times) == 3
+    assert times[-1] >= 0.25
+    # Queued waiters are released in arrival order
+    assert [i for i, _ in released] == list(range(6))
+
+
+@pytest.mark.asyncio
+async def test_retry_after_delays_queued_waiters():
+    limiter = _limiter(burst_limit=1)
+    await limiter.wait_if_needed("https://example.com/a")
+    started = time.monotonic()
+
+    waiter = asyncio.create_task(limiter.wait_if_needed("https://example.com/b"))
+    await asyncio.sleep(0)
+    limiter.handle_rate_limit_response("https://example.com/a", 429, retry_after="0.3")
+    await waiter
+
+    assert time.monotonic() - started >= 0.29
+    stats = limiter.get_stats()["example.com"]
+    assert stats["queued"] == 0 and stats["requests_this_window"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    limiter = _limiter(requests_per_minute=60, burst_limit=1)
+    await limiter.wait_if_needed("https://example.com/a")
+
+    waiter = asyncio.create_task(limiter.wait_if_needed("https://example.com/b"))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    assert limiter.get_stats()["example.com"]["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_service_backs_off_and_retries_after_429():
+    statuses = [429, 200]
+    calls = []
+
+    async def arun(url, config):
+        calls.append(time.monotonic())
+        status = statuses.pop(0)
+        return SimpleNamespace(url=url, status_code=status, response_headers={"Retry-After": "0.2"},
+                               markdown="page body", html="", metadata={"title": "Page"}, links={})
+
+    limiter = _limiter(burst_limit=5)
+    service = CrawlService(rate_limiter=limiter)
+    service._crawler = MagicMock()
+    service._crawler.arun = arun
+
+    result = await service.crawl_url("https://example.com/page", CrawlConfig())
+
+    assert result.content == "page body"
+    assert len(calls) == 2 and calls[1] - calls[0] >= 0.19
+    assert limiter.get_stats()["example.com"]["cooldown_until"] > 0
+
+
+@pytest.mark.asyncio
+async def test_each_request_of_a_page_fetch_takes_its_own_slot():
+    import httpx
+    from crawl4ai_source.crawl_cache import CacheEntry, CrawlCache
+    from crawl4ai_source.static_fetcher import StaticFetcher
+
+    async def arun(url, config):
+        return SimpleNamespace(url=url, status_code=200, response_headers={}, markdown="page body",
+                               html="", metadata={"title": "Page"}, links={})
+
+    requests = []
+    service = CrawlService(rate_limiter=MagicMock(), cache=CrawlCache())
+    service.rate_limiter.wait_if_needed = AsyncMock()
+    service._crawler = MagicMock()
+    service._crawler.arun = arun
+    service._static = StaticFetcher()
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("if-none-match"):
+            raise httpx.ConnectError("reset", request=request)
+        return httpx.Response(404)
+
+    service._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    service.cache.put(CacheEntry(url="https://example.com/page", etag='"v1"'))
+
+    # Conditional GET fails, static fetch answers 404, then the browser: three requests
+    await service.crawl_url("https://example.com/page", CrawlConfig())
+    await service._http.aclose()
+
+    assert len(requests) == 2  # plus one browser fetch
+    assert service.rate_limiter.wait_if_needed.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_pages_wait_for_their_slot_right_before_dispatch():
+    events = []
+
+    async def throttle(url):
+        events.append(("slot", url))
+        await asyncio.sleep(0)
+
+    async def arun(url, config):
+        events.append(("fetch", url))
+        return SimpleNamespace(url=url, status_code=200, response_headers={}, markdown="page body",
+                               html="", metadata={"title": "Page"}, links={})
+
+    service = CrawlService(rate_limiter=MagicMock())
+    service._crawler = MagicMock()
+    service._crawler.arun = arun
+    service._throttle = throttle
+    urls = [f"https://example.com/{i}" for i in range(3)]
+
+    with patch("crawl4ai_source.service.BATCH_PAGES_PER_BROWSER", 1):
+        results = await service.crawl_urls(urls, CrawlConfig())
+
+    assert [r.url for r in results] == urls
+    # No slot is reserved ahead of time: each one is followed by its own fetch
+    assert events == [(kind, url) for url in urls for kind in ("slot", "fetch")]
+
+
+def test_adaptive_rate_increases_additively_and_backs_off_multiplicatively():
+    limiter = _limiter(requests_per_minute=40)
+    url = "https://example.com/page"
+
+    # Healthy responses never take a domain past its configured rate by default
+    for _ in range(5):
+        limiter.record_response(url, 200, 0.1)
+    assert limiter.get_stats()["example.com"]["current_requests_per_minute"] == 40
+
+    limiter.record_response(url, 503, 0.1)
+    assert limiter.get_stats()["example.com"]["current_requests_per_minute"] == 20
+    # A second error inside the hold-off is part of the same congestion event
+    limiter.record_response(url, 500, 0.1)
+    assert limiter.get_stats()["example.com"]["current_requests_per_minute"] == 20
+
+    for _ in range(5):
+        limiter.record_response(url, 200, 0.1)
+    assert limiter.get_stats()["example.com"]["current_requests_per_minute"] == 25
+
+
+def test_adaptive_rate_stays_within_rule_bounds_and_reacts_to_latency():
+    limiter = RateLimiter()
+    # Going above requests_per_minute is opt-in per domain through max_requests_per_minute
+    limiter.set_domain_rule("example.com", RateLimitRule(
+        requests_per_minute=10, min_requests_per_minute=8, max_requests_per_minute=12))
+    limiter.decrease_holdoff = 0
+    url = "https://example.com/page"
+
+    for _ in range(10):
+        limiter.record_response(url, 200, 0.1)
+    assert limiter.get_stats()["example.com"]["current_requests_per_minute"] == 12
+
+    # Latency jumping well above the baseline counts as congestion
+    for _ in range(3):
+        limiter.record_response(url, 200, 2.0)
+    assert limiter.get_stats()["example.com"]["current_requests_per_minute"] == 8
+
+    limiter.handle_rate_limit_response(url, 429, retry_after="0")
+    assert limiter.get_stats()["example.com"]["current_requests_per_minute"] == 8
+
+
+def test_learned_rates_survive_restart(tmp_path):
+    state_path = str(tmp_path / "rates" / "crawl_rates.json")
+    limiter = RateLimiter(state_path=state_path)
+    limiter.record_response("https://www.wikipedia.org/wiki/A", 503, 0.1)
+    for _ in range(6):
+        limiter.record_response("https://www.wikipedia.org/wiki/A", 200, 0.1)
+    limiter.save_state()
+
+    restarted = RateLimiter(state_path=state_path)
+    restarted._get_domain_stats("wikipedia.org")
+    assert restarted.get_stats()["wikipedia.org"]["current_requests_per_minute"] == 36
+
+    assert RateLimiter(adaptive=False, state_path=state_path)._learned_rates == {}
+
+
+@pytest.mark.asyncio
+async def test_domain_state_is_capped_without_dropping_pending_slots():
+    limiter = RateLimiter(max_domains=3, idle_seconds=3600)
+    limiter.set_domain_rule("busy.com", RateLimitRule(requests_per_minute=1, burst_limit=1))
+    # busy.com's next slot is a minute away, so its state must survive the cap
+    await limiter.wait_if_needed("https://busy.com/")
+    for i in range(5):
+        limiter.record_response(f"https://site{i}.com/", 200, 0.1)
+
+    domains = set(limiter.get_stats())
+    assert len(domains) <= 3 and "busy.com" in domains and "site4.com" in domains
+    summary = limiter.get_summary()
+    assert summary["tracked_domains"] == len(domains) and summary["evicted_domains"] >= 3
+
+
+def test_idle_domains_are_evicted_and_top_n_stats():
+    limiter = RateLimiter(idle_seconds=60)
+    for i, count in enumerate([3, 1, 5]):
+        for _ in range(count):
+            stats = limiter._get_domain_stats(f"site{i}.com")
+            limiter._update_stats(stats, limiter.get_domain_rule(f"site{i}.com"), time.time() - 120)
+
+    assert list(limiter.get_stats(top_n=2)) == ["site2.com", "site0.com"]
+    with pytest.raises(ValueError):
+        limiter.get_stats(top_n=1, sort_by="url")
+
+    # Their slots and last requests are two minutes old, so the next new domain sweeps them out
+    for domain in ("site0.com", "site1.com", "site2.com"):
+        limiter._domain_stats[domain].window_start -= 120
+    limiter._get_domain_stats("fresh.com")
+    assert list(limiter.get_stats()) == ["fresh.com"]
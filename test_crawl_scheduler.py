@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from crawl4ai_source.scheduler import CrawlScheduler
+
+
+async def _drain(scheduler, expected):
+    await scheduler.start()
+    for _ in range(200):
+        if scheduler.metrics()["service_time"]["count"] >= expected:
+            break
+        await asyncio.sleep(0.01)
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_runs_first_and_domains_round_robin():
+    order = []
+
+    async def runner(job_id):
+        order.append(job_id)
+
+    scheduler = CrawlScheduler(runner, num_workers=1)
+    for i in range(3):
+        await scheduler.submit(f"big-{i}", f"https://big.example.com/{i}")
+    await scheduler.submit("small-0", "https://small.example.org/")
+    await scheduler.submit("urgent", "https://other.example.net/", priority=10)
+
+    await _drain(scheduler, 5)
+
+    assert order == ["urgent", "big-0", "small-0", "big-1", "big-2"]
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_bounds_concurrency_and_caps_domain():
+    running, peak, peak_by_domain = set(), [0], {}
+
+    async def runner(job_id):
+        running.add(job_id)
+        peak[0] = max(peak[0], len(running))
+        domain = job_id.split("-")[0]
+        peak_by_domain[domain] = max(peak_by_domain.get(domain, 0), sum(j.startswith(domain) for j in running))
+        await asyncio.sleep(0.02)
+        running.discard(job_id)
+
+    scheduler = CrawlScheduler(runner, num_workers=4, max_in_flight_per_domain=2)
+    for i in range(6):
+        await scheduler.submit(f"a-{i}", f"https://a.example.com/{i}")
+        await scheduler.submit(f"b-{i}", f"https://b.example.com/{i}")
+
+    await _drain(scheduler, 12)
+
+    assert peak[0] == 4
+    assert peak_by_domain == {"a": 2, "b": 2}
+    metrics = scheduler.metrics()
+    assert metrics["queue_depth"] == 0
+    assert metrics["service_time"]["count"] == 12
+    assert metrics["wait_time"]["max_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_removes_queued_job_and_duplicates_are_ignored():
+    ran = []
+
+    async def runner(job_id):
+        ran.append(job_id)
+
+    scheduler = CrawlScheduler(runner, num_workers=1)
+    assert await scheduler.submit("job-1", "https://example.com/1")
+    assert not await scheduler.submit("job-1", "https://example.com/1")
+    await scheduler.submit("job-2", "https://example.com/2")
+
+    assert scheduler.cancel("job-1")
+    assert not scheduler.cancel("job-1")
+    assert scheduler.metrics()["queue_depth"] == 1
+
+    await _drain(scheduler, 1)
+
+    assert ran == ["job-2"]
+
+
+@pytest.mark.asyncio
+async def test_manager_queues_jobs_beyond_worker_capacity():
+    from unittest.mock import AsyncMock, patch
+
+    from crawl4ai_source.manager import CrawlJobManager
+    from crawl4ai_source.models import CrawlJob
+
+    jobs = {f"job-{i}": CrawlJob(id=f"job-{i}", url=f"https://site{i}.example.com", priority=i) for i in range(3)}
+    executed = []
+
+    async def execute(job):
+        executed.append(job.id)
+
+    manager = CrawlJobManager(supabase_client=None, max_concurrent_jobs=1)
+    manager._crawl_service = object()
+    with patch.object(manager, "get_job", AsyncMock(side_effect=lambda job_id, **kwargs: jobs[job_id])), \
+         patch.object(manager, "_persist_job", AsyncMock()), \
+         patch.object(manager, "_execute_job", side_effect=execute):
+        results = [await manager.start_job(job_id) for job_id in jobs]
+        await _drain(manager._scheduler, 3)
+
+    assert results == [True, True, True]
+    assert all(job.queued_at is not None for job in jobs.values())
+    assert executed == ["job-2", "job-1", "job-0"]
+
+
+@pytest.mark.asyncio
+async def test_manager_start_resumes_jobs_queued_before_restart():
+    from unittest.mock import AsyncMock, MagicMock, patch
+
+    from crawl4ai_source.manager import CrawlJobManager
+    from crawl4ai_source.models import CrawlJob, CrawlStatus
+
+    queued = CrawlJob(url="https://a.example.com", priority=2)
+    queued.mark_queued()
+    running = CrawlJob(url="https://b.example.com", status=CrawlStatus.RUNNING)
+    running.mark_queued()
+    never_started = CrawlJob(url="https://c.example.com")
+    rows = [{k: v for k, v in job.to_dict().items() if k not in ("config", "result")}
+            for job in (queued, running, never_started)]
+
+    supabase = MagicMock()
+    query = supabase.table.return_value.select.return_value.in_.return_value
+    query.order.return_value.order.return_value.execute.return_value.data = rows
+    manager = CrawlJobManager(supabase, max_concurrent_jobs=1)
+
+    with patch("crawl4ai_source.manager.CrawlService") as service_cls, \
+         patch.object(manager._deduplicator, "warm_up", return_value=0), \
+         patch.object(manager._scheduler, "submit", AsyncMock()) as submit, \
+         patch.object(manager, "_persist_job", AsyncMock()) as persist:
+        service_cls.return_value.start = AsyncMock()
+        await manager.start()
+
+    assert [call.args[0] for call in submit.call_args_list] == [queued.id, running.id]
+    # The interrupted job goes back to pending before it runs again
+    assert persist.await_args.args[0].status == CrawlStatus.PENDING
+    await manager._scheduler.stop()
+    await manager._pipeline.stop()
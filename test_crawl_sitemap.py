@@ -0,0 +1,69 @@
+import gzip
+
+import httpx
+import pytest
+
+from crawl4ai_source.sitemap import SitemapError, iter_sitemap_urls
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+%s
+</urlset>"""
+
+
+def _urlset(urls):
+    return URLSET % b"".join(b"<url><loc>%s</loc><lastmod>2025-01-01</lastmod></url>" % url.encode() for url in urls)
+
+
+def _client(routes):
+    def handler(request):
+        body = routes.get(str(request.url))
+        if body is None:
+            return httpx.Response(404)
+        return httpx.Response(200, stream=httpx.ByteStream(body))
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def _collect(client, url, max_urls=1000):
+    return [loc async for loc in iter_sitemap_urls(client, url, max_urls)]
+
+
+@pytest.mark.asyncio
+async def test_urlset_yields_locs_in_order():
+    urls = [f"https://example.com/page/{i}" for i in range(5)]
+    async with _client({"https://example.com/sitemap.xml": _urlset(urls)}) as client:
+        assert await _collect(client, "https://example.com/sitemap.xml") == urls
+
+
+@pytest.mark.asyncio
+async def test_gzipped_index_is_followed_and_broken_children_skipped():
+    index = b"""<?xml version="1.0"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/a.xml.gz</loc></sitemap>
+  <sitemap><loc>https://example.com/missing.xml</loc></sitemap>
+  <sitemap><loc>https://example.com/b.xml</loc></sitemap>
+</sitemapindex>"""
+    routes = {
+        "https://example.com/index.xml.gz": gzip.compress(index),
+        "https://example.com/a.xml.gz": gzip.compress(_urlset(["https://example.com/a1", "https://example.com/a2"])),
+        "https://example.com/b.xml": _urlset(["https://example.com/b1"]),
+    }
+    async with _client(routes) as client:
+        assert await _collect(client, "https://example.com/index.xml.gz") == [
+            "https://example.com/a1", "https://example.com/a2", "https://example.com/b1",
+        ]
+
+
+@pytest.mark.asyncio
+async def test_max_urls_stops_early_and_bad_documents_raise():
+    urls = [f"https://example.com/page/{i}" for i in range(100)]
+    routes = {
+        "https://example.com/sitemap.xml": _urlset(urls),
+        "https://example.com/page.html": b"<html><body>not a sitemap</body></html>",
+    }
+    async with _client(routes) as client:
+        assert await _collect(client, "https://example.com/sitemap.xml", max_urls=10) == urls[:10]
+        with pytest.raises(SitemapError):
+            await _collect(client, "https://example.com/page.html")
+        with pytest.raises(SitemapError):
+            await _collect(client, "https://example.com/nope.xml")
@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from crawl4ai_source.models import CrawlConfig
+from crawl4ai_source.service import CrawlService
+from crawl4ai_source.static_fetcher import StaticFetcher
+
+ARTICLE = (
+    "<html lang='en'><head><title>Docs Page</title><meta name='description' content='About docs'></head>"
+    "<body><h1>Install</h1><p>" + "Static documentation text. " * 20 + "</p>"
+    "<a href='/guide#intro'>Guide</a><a href='https://other.com/x'>Other</a><a href='mailto:a@b.c'>Mail</a>"
+    "</body></html>"
+)
+SPA_SHELL = "<html><head><title>App</title><script src='/app.js'></script></head><body><div id='root'></div></body></html>"
+
+
+def _client(pages, requests):
+    def handler(request):
+        requests.append(str(request.url))
+        return httpx.Response(200, headers={"Content-Type": "text/html; charset=utf-8"}, text=pages[str(request.url)])
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _service(pages, requests, browser_calls):
+    async def arun(url, config):
+        browser_calls.append(url)
+        return SimpleNamespace(url=url, markdown="rendered " * 50, html="", metadata={"title": "Rendered"}, links={})
+
+    service = CrawlService(static_fast_path=True)
+    service._crawler = MagicMock()
+    service._crawler.arun = arun
+    service._static = StaticFetcher()
+    service._http = _client(pages, requests)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_static_fetch_extracts_markdown_metadata_and_links():
+    requests = []
+    client = _client({"https://docs.example.com/install": ARTICLE}, requests)
+
+    page = await StaticFetcher().fetch(client, "https://docs.example.com/install", CrawlConfig())
+    await client.aclose()
+
+    assert page.metadata["title"] == "Docs Page"
+    assert page.metadata["description"] == "About docs"
+    assert page.metadata["language"] == "en"
+    assert "# Install" in page.markdown and "Static documentation text." in page.markdown
+    assert page.links == {"internal": [{"href": "https://docs.example.com/guide"}],
+                          "external": [{"href": "https://other.com/x"}]}
+
+
+@pytest.mark.asyncio
+async def test_static_page_skips_browser_and_keeps_result_shape():
+    requests, browser_calls = [], []
+    service = _service({"https://docs.example.com/install": ARTICLE}, requests, browser_calls)
+
+    result = await service.crawl_url("https://docs.example.com/install", CrawlConfig())
+    await service._http.aclose()
+
+    assert browser_calls == []
+    assert result.metadata["fetch_mode"] == "http"
+    assert result.title == "Docs Page"
+    assert sorted(result.links) == ["https://docs.example.com/guide", "https://other.com/x"]
+    assert result.content_hash and result.content_size == len(result.content.encode("utf-8"))
+
+
+@pytest.mark.asyncio
+async def test_js_pages_fall_back_and_domain_is_learned():
+    requests, browser_calls = [], []
+    pages = {f"https://app.example.com/{i}": SPA_SHELL for i in range(5)}
+    service = _service(pages, requests, browser_calls)
+
+    results = [await service.crawl_url(url, CrawlConfig()) for url in pages]
+    await service._http.aclose()
+
+    assert [r.metadata["fetch_mode"] for r in results] == ["browser"] * 5
+    assert len(browser_calls) == 5
+    # After three fallbacks the domain goes straight to the browser
+    assert len(requests) == 3
+    assert service.fetch_stats()["static_fast_path"]["browser_domains"] == ["app.example.com"]
@@ -0,0 +1,284 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import graphiti_client
+from graphiti_core.driver.driver import GraphProvider
+
+
+class FakeDriver:
+    provider = GraphProvider.NEO4J
+
+    def __init__(self, database="neo4j", existing_indexes=()):
+        self._database = database
+        self.existing_indexes = list(existing_indexes)
+        self.queries = []
+        self.history = []
+        self.history_params = []
+        self.stats_params = []
+
+    async def execute_query(self, query, **kwargs):
+        self.queries.append(query)
+        if "SHOW INDEXES" in query:
+            return [{"names": self.existing_indexes}], None, None
+        if query == graphiti_client.GROUP_STATS_QUERY:
+            self.stats_params.append(kwargs)
+            return [{"episodes": 3, "entities": 7, "facts": 11, "last_episode_at": None}], None, None
+        if query == graphiti_client.ENTITY_HISTORY_QUERY:
+            self.history_params.append(kwargs)
+            rows = [r for r in self.history if kwargs["cursor_time"] is None
+                    or (r["sort_time"], r["uuid"]) > (kwargs["cursor_time"], kwargs["cursor_uuid"])]
+            return rows[:kwargs["limit"]], None, None
+        return [], None, None
+
+
+class FakeGraphiti:
+    """Records which event loop each coroutine ran on."""
+
+    def __init__(self, driver=None):
+        self.loops = []
+        self.closed = False
+        self.schema_builds = 0
+        self.driver = driver or FakeDriver()
+        self.writes = []
+        self.episode_calls = []
+        self.search_calls = []
+
+    async def build_indices_and_constraints(self):
+        self.loops.append(asyncio.get_running_loop())
+        self.schema_builds += 1
+
+    async def add_episode(self, **kwargs):
+        self.loops.append(asyncio.get_running_loop())
+        self.writes.append(("single", kwargs["group_id"], [kwargs["name"]]))
+        self.episode_calls.append(kwargs)
+        return SimpleNamespace(episode=SimpleNamespace(uuid=f"uuid-{len(self.episode_calls)}"))
+
+    async def add_episode_bulk(self, bulk_episodes, group_id=None):
+        self.loops.append(asyncio.get_running_loop())
+        self.writes.append(("bulk", group_id, [episode.name for episode in bulk_episodes]))
+
+    async def search(self, **kwargs):
+        self.loops.append(asyncio.get_running_loop())
+        self.search_calls.append(kwargs)
+        return []
+
+    async def close(self):
+        self.loops.append(asyncio.get_running_loop())
+        self.closed = True
+
+
+@pytest.fixture
+def fake_graphiti():
+    fake = FakeGraphiti()
+    with patch.object(graphiti_client, "_graphiti_instance", fake), \
+         patch.object(graphiti_client, "get_graphiti_client", return_value=fake), \
+         patch.object(graphiti_client, "_schema_ready", set()), \
+         patch.object(graphiti_client, "_episode_queue", None):
+        yield fake
+        # Each test gets its own queue; stop its group workers before the next one
+        if graphiti_client._episode_queue is not None:
+            graphiti_client._run_on_graphiti_loop(graphiti_client._episode_queue.close())
+    graphiti_client.close_graphiti_client()
+
+
+def test_sync_wrappers_share_one_long_lived_loop(fake_graphiti):
+    graphiti_client.add_episode("ep-1", "body", "test")
+    graphiti_client.search_graph("query")
+    graphiti_client.get_temporal_context("entity")
+
+    loops = set(fake_graphiti.loops)
+    assert len(loops) == 1
+    loop = loops.pop()
+    assert loop is graphiti_client._graphiti_loop
+    assert not loop.is_closed()
+
+
+@pytest.mark.asyncio
+async def test_async_api_runs_on_graphiti_loop_from_foreign_loop(fake_graphiti):
+    result = await graphiti_client.add_episode_async("ep-2", "body", "test")
+
+    assert result["status"] == "success"
+    assert fake_graphiti.loops[-1] is graphiti_client._graphiti_loop
+    assert fake_graphiti.loops[-1] is not asyncio.get_running_loop()
+
+
+def test_close_awaits_graphiti_close_and_stops_loop(fake_graphiti):
+    graphiti_client.search_graph("query")
+    loop = graphiti_client._graphiti_loop
+
+    graphiti_client.close_graphiti_client()
+
+    assert fake_graphiti.closed
+    assert fake_graphiti.loops[-1] is loop
+    assert loop.is_closed()
+    assert graphiti_client._graphiti_loop is None
+
+
+def test_schema_is_built_once_per_database(fake_graphiti):
+    graphiti_client.add_episode("ep-1", "body", "test")
+    graphiti_client.add_episode("ep-2", "body", "test")
+    graphiti_client.add_episode("ep-3", "body", "test")
+
+    assert fake_graphiti.schema_builds == 1
+    show_queries = [q for q in fake_graphiti.driver.queries if "SHOW INDEXES" in q]
+    assert len(show_queries) == 1
+    assert fake_graphiti.driver.queries[1:] == graphiti_client.TEMPORAL_INDEX_QUERIES
+
+
+def test_schema_build_skipped_when_indexes_exist(fake_graphiti):
+    fake_graphiti.driver.existing_indexes = sorted(graphiti_client._expected_index_names(fake_graphiti))
+
+    assert graphiti_client.ensure_graphiti_schema() is True
+    graphiti_client.add_episode("ep-1", "body", "test")
+
+    assert fake_graphiti.schema_builds == 0
+    assert len(fake_graphiti.driver.queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_episode_burst_is_coalesced_into_bulk_write_per_group(fake_graphiti):
+    with patch.object(graphiti_client, "EPISODE_BULK_GROUPS", frozenset({"alpha"})):
+        results = await asyncio.gather(
+            *[graphiti_client.add_episode_async(f"a-{i}", "body", "test", group_id="alpha") for i in range(3)],
+            graphiti_client.add_episode_async("b-0", "body", "test", group_id="beta"),
+        )
+
+    assert all(result["status"] == "success" for result in results)
+    assert [r["group_id"] for r in results] == ["alpha", "alpha", "alpha", "beta"]
+    assert ("bulk", "alpha", ["a-0", "a-1", "a-2"]) in fake_graphiti.writes
+    assert ("single", "beta", ["b-0"]) in fake_graphiti.writes
+
+
+def test_episode_queue_respects_batch_size(fake_graphiti):
+    async def burst():
+        queue = graphiti_client._get_episode_queue()
+        queue.batch_size = 2
+        queue.bulk_groups = frozenset({"*"})
+        return await asyncio.gather(*[
+            graphiti_client._add_episode(f"ep-{i}", "body", "test", group_id="alpha") for i in range(5)
+        ])
+
+    results = graphiti_client._run_on_graphiti_loop(burst())
+
+    assert [r["batch_size"] for r in results] == [2, 2, 2, 2, 1]
+    assert [names for _, _, names in fake_graphiti.writes] == [["ep-0", "ep-1"], ["ep-2", "ep-3"], ["ep-4"]]
+
+
+def test_episodes_use_add_episode_unless_group_opts_in_to_bulk(fake_graphiti):
+    async def ingest():
+        queue = graphiti_client._get_episode_queue()
+        queue.batch_window = 5.0  # a lone episode must not wait this out
+        burst = await asyncio.gather(*[
+            graphiti_client._add_episode(f"ep-{i}", "body", "test", group_id="alpha") for i in range(3)
+        ])
+        queue.bulk_groups = frozenset({"alpha"})
+        lone = await graphiti_client._add_episode("lone", "body", "test", group_id="alpha")
+        return [*burst, lone]
+
+    started = time.monotonic()
+    results = graphiti_client._run_on_graphiti_loop(ingest())
+
+    assert time.monotonic() - started < 5.0
+    assert all(result["batch_size"] == 1 for result in results)
+    assert fake_graphiti.writes == [("single", "alpha", [name]) for name in ["ep-0", "ep-1", "ep-2", "lone"]]
+
+
+def test_split_episode_body_packs_sentences_within_limit():
+    text = "First sentence here. Second one follows! Third? " + "x" * 25
+
+    segments = graphiti_client.split_episode_body(text, max_chars=30)
+
+    assert segments == ["First sentence here.", "Second one follows! Third?", "x" * 25]
+    assert graphiti_client.split_episode_body("short", max_chars=30) == ["short"]
+
+
+def test_long_body_is_written_as_chained_segments(fake_graphiti):
+    body = " ".join(f"Sentence number {i} is here." for i in range(12))
+
+    with patch.object(graphiti_client, "EPISODE_MAX_CHARS", 100):
+        result = graphiti_client.add_episode("doc", body, "test", group_id="alpha")
+
+    calls = fake_graphiti.episode_calls
+    assert result["status"] == "success"
+    assert result["segments"] == len(calls) > 1
+    assert result["episode_uuids"] == [f"uuid-{i + 1}" for i in range(len(calls))]
+    assert " ".join(call["episode_body"] for call in calls) == body
+    assert all(call["source"] == graphiti_client.EpisodeType.text for call in calls)
+    assert calls[0]["previous_episode_uuids"] is None
+    assert [call["previous_episode_uuids"] for call in calls[1:]] == [[f"uuid-{i + 1}"] for i in range(len(calls) - 1)]
+    assert [call["reference_time"] for call in calls] == sorted(call["reference_time"] for call in calls)
+
+
+def test_time_window_filter_selects_overlapping_facts():
+    start = datetime(2024, 1, 1)
+    end = datetime(2024, 6, 30, tzinfo=timezone.utc)
+
+    filters = graphiti_client.build_time_window_filter(start, end)
+
+    assert graphiti_client.build_time_window_filter() is None
+    [[valid_until]] = filters.valid_at
+    assert valid_until.comparison_operator.value == "<=" and valid_until.date == end
+    [[still_valid], [invalidated_after]] = filters.invalid_at
+    assert still_valid.comparison_operator.value == "IS NULL"
+    assert invalidated_after.comparison_operator.value == ">="
+    assert invalidated_after.date == start.replace(tzinfo=timezone.utc)
+
+
+def test_temporal_context_pushes_window_down_and_pages_history(fake_graphiti):
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    fake_graphiti.driver.history = [
+        {"uuid": f"e{i}", "name": "WORKS_AT", "fact": f"fact {i}", "group_id": None, "source": "Alice",
+         "target": "Acme", "valid_at": base + timedelta(days=i), "invalid_at": None,
+         "created_at": base, "sort_time": base + timedelta(days=i)}
+        for i in range(5)
+    ]
+    start, end = base, base + timedelta(days=30)
+
+    first = graphiti_client.get_temporal_context("Alice", start, end, page_size=2)
+    second = graphiti_client.get_temporal_context("Alice", start, end, page_size=2, cursor=first["next_cursor"])
+    last = graphiti_client.get_temporal_context("Alice", start, end, page_size=2, cursor=second["next_cursor"])
+
+    assert fake_graphiti.search_calls[0]["search_filter"] is not None
+    params = fake_graphiti.driver.history_params[0]
+    assert params["start_time"] == start and params["end_time"] == end
+    assert [h["uuid"] for h in first["history"]] == ["e0", "e1"]
+    assert [h["uuid"] for h in second["history"]] == ["e2", "e3"]
+    assert [h["uuid"] for h in last["history"]] == ["e4"]
+    assert last["next_cursor"] is None
+    assert first["history"][0]["valid_at"] == base.isoformat()
+
+
+def test_resolve_group_id_validates_app_context():
+    assert graphiti_client.resolve_group_id(None) is None
+    assert graphiti_client.resolve_group_id("  ") is None
+    assert graphiti_client.resolve_group_id("tenant-a_1") == "tenant-a_1"
+    with pytest.raises(graphiti_client.GroupIdValidationError):
+        graphiti_client.resolve_group_id("tenant a; MATCH (n)")
+
+
+def test_group_id_scopes_ingest_search_and_temporal(fake_graphiti):
+    graphiti_client.add_episode("ep-1", "body", "test", group_id="tenant-a")
+    graphiti_client.search_graph("query", group_id="tenant-a")
+    graphiti_client.get_temporal_context("Alice", group_id="tenant-a")
+    graphiti_client.search_graph("query")
+    graphiti_client.get_temporal_context("Alice")
+
+    assert fake_graphiti.episode_calls[0]["group_id"] == "tenant-a"
+    # Without a group, reads stay in the default partition writes go to, never all partitions
+    assert [call["group_ids"] for call in fake_graphiti.search_calls] == [["tenant-a"], ["tenant-a"], [""], [""]]
+    assert [p["group_ids"] for p in fake_graphiti.driver.history_params] == [["tenant-a"], [""]]
+
+
+def test_group_stats_counts_one_partition(fake_graphiti):
+    stats = graphiti_client.get_group_stats("tenant-a")
+    default_stats = graphiti_client.get_group_stats()
+
+    assert stats == {"group_id": "tenant-a", "episodes": 3, "entities": 7, "facts": 11,
+                     "last_episode_at": None, "queued_episodes": 0}
+    assert default_stats["group_id"] is None
+    assert [p["group_id"] for p in fake_graphiti.driver.stats_params] == ["tenant-a", ""]
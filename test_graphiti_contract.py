@@ -15,7 +15,7 @@ async def test_integrate_with_graphiti_calls_add_episode():
     manager = CrawlJobManager(supabase_client=supabase)
 
     # Create a job and a crawl result
-    job = CrawlJob(url="https://example.com/test")
+    job = CrawlJob(url="https://example.com/test", config=CrawlConfig(group_id="tenant-a"))
     result = CrawlResult(
         url="https://example.com/test",
         title="Test Page",
@@ -43,3 +43,5 @@ async def test_integrate_with_graphiti_calls_add_episode():
     assert called_kwargs.get("episode_body", "").startswith("<html>")
     assert called_kwargs.get("source_description", "").startswith("Crawled content from")
     assert called_kwargs.get("reference_time") == result.extracted_at
+    # Entities land in the partition of the app that created the job
+    assert called_kwargs.get("group_id") == "tenant-a"
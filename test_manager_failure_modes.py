@@ -1,5 +1,5 @@
 import asyncio
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -7,34 +7,59 @@ from crawl4ai_source.manager import CrawlJobManager
 from crawl4ai_source.models import CrawlJob, CrawlResult, CrawlStatus
 
 
+def _manager_crawling(result):
+    async def crawl_site(url, config):
+        yield result
+
+    manager = CrawlJobManager(supabase_client=MagicMock())
+    manager._crawl_service = MagicMock()
+    manager._crawl_service.crawl_site = crawl_site
+    manager._crawl_service.fetch_stats.return_value = {}
+    manager._persist_job = AsyncMock()
+    manager._persist_crawl_result = AsyncMock()
+    return manager
+
+
 @pytest.mark.asyncio
 async def test_graphiti_failure_does_not_fail_job():
-    manager = CrawlJobManager.__new__(CrawlJobManager)
-    manager.supabase = None
-
     job = CrawlJob(id='job-1', url='https://example.com')
     result = CrawlResult(url='https://example.com', content='hello world')
+    manager = _manager_crawling(result)
 
-    with patch('crawl4ai_source.manager.add_episode', new_callable=AsyncMock) as mock_add:
+    with patch('crawl4ai_source.manager.add_episode', new_callable=AsyncMock) as mock_add, \
+         patch('crawl4ai_source.manager.GRAPHITI_AVAILABLE', True), \
+         patch('crawl4ai_source.manager.SUPABASE_AVAILABLE', False):
         mock_add.side_effect = Exception('Graphiti error')
-        with patch('crawl4ai_source.manager.GRAPHITI_AVAILABLE', True):
-            # Should not raise
-            await manager._integrate_with_graphiti(job, result)
+        await manager._execute_job(job)
+        await manager._pipeline.join()
+
+    assert job.status == CrawlStatus.COMPLETED
+    mock_add.assert_awaited_once()
+    # The graph stage worker counts the failure, and the metrics report it
+    graph = manager.get_metrics()['pipeline']['graph']
+    assert graph['failed'] == 1 and graph['processed'] == 0
+    await manager._pipeline.stop()
 
 
 @pytest.mark.asyncio
 async def test_supabase_failure_does_not_fail_job():
-    manager = CrawlJobManager.__new__(CrawlJobManager)
-    manager.supabase = None
-
     job = CrawlJob(id='job-2', url='https://example.com')
     result = CrawlResult(url='https://example.com', content='hello world')
+    manager = _manager_crawling(result)
 
     with patch('crawl4ai_source.manager.SUPABASE_AVAILABLE', True), \
          patch('crawl4ai_source.manager.EMBEDDING_AVAILABLE', True), \
-         patch('crawl4ai_source.manager.get_embedding_ollama') as mock_emb, \
+         patch('crawl4ai_source.manager.GRAPHITI_AVAILABLE', False), \
+         patch('crawl4ai_source.manager.embed_text') as mock_emb, \
          patch('crawl4ai_source.manager.add_document_to_supabase') as mock_add:
-        mock_emb.return_value = [0.1, 0.2]
+        mock_emb.return_value = ([0.1, 0.2], 'ollama:nomic-embed-text')
         mock_add.side_effect = Exception('Supabase error')
-        # Should not raise
-        await manager._integrate_with_supabase(job, result)
+        await manager._execute_job(job)
+        await manager._pipeline.join()
+
+    assert job.status == CrawlStatus.COMPLETED
+    assert mock_add.called
+    # The vector_store stage worker counts the failure, and the metrics report it
+    vector_store = manager.get_metrics()['pipeline']['vector_store']
+    assert vector_store['failed'] == 1 and vector_store['processed'] == 0
+    await manager._pipeline.stop()
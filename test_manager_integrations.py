@@ -36,10 +36,10 @@ async def test_store_result_in_supabase_calls_client():
     with (
         patch('crawl4ai_source.manager.SUPABASE_AVAILABLE', True),
         patch('crawl4ai_source.manager.EMBEDDING_AVAILABLE', True),
-        patch('crawl4ai_source.manager.get_embedding_ollama') as mock_emb,
+        patch('crawl4ai_source.manager.embed_text') as mock_emb,
         patch('crawl4ai_source.manager.add_document_to_supabase') as mock_add,
     ):
-        mock_emb.return_value = [0.1, 0.2, 0.3]
+        mock_emb.return_value = ([0.1, 0.2, 0.3], 'ollama:nomic-embed-text')
         mock_add.return_value = {'id': 'doc-1'}
         # Call the supabase integration method
         await manager._integrate_with_supabase(job, result)
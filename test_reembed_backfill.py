@@ -0,0 +1,62 @@
+import json
+from unittest.mock import patch
+
+import reembed_backfill
+from supabase_client import _decode_resume_token, document_resume_token
+
+CONFIG = {"provider": "ollama", "base_url": "http://ollama", "model": "new-embed"}
+
+
+def _rows(n, model="old:embed"):
+    return [{"id": i, "text": f"doc {i}", "embedding_model": model} for i in range(1, n + 1)]
+
+
+def _fake_stream(rows):
+    def stream(columns=None, page_size=500, resume_token=None):
+        start = 0
+        if resume_token:
+            last_id = _decode_resume_token(resume_token)
+            start = next(i for i, r in enumerate(rows) if r["id"] == last_id) + 1
+        yield from rows[start:]
+    return stream
+
+
+def test_backfill_embeds_in_batches_and_writes_in_order(tmp_path):
+    writes = []
+    checkpoint_path = str(tmp_path / "ckpt.json")
+
+    with patch.object(reembed_backfill, "stream_documents", _fake_stream(_rows(5))), \
+         patch.object(reembed_backfill, "embed_texts", lambda texts, cfg: [[float(len(t))] for t in texts]), \
+         patch.object(reembed_backfill, "update_document_embeddings", lambda updates: writes.append(updates)):
+        checkpoint = reembed_backfill.run_backfill(
+            batch_size=2, concurrency=2, checkpoint_path=checkpoint_path,
+            embeddings_config=CONFIG, target_model="ollama:new-embed",
+        )
+
+    assert [[u["id"] for u in batch] for batch in writes] == [[1, 2], [3, 4], [5]]
+    assert all(u["embedding_model"] == "ollama:new-embed" for batch in writes for u in batch)
+    assert checkpoint.processed == 5
+    saved = json.load(open(checkpoint_path))
+    assert saved["resume_token"] == document_resume_token({"id": 5})
+
+
+def test_backfill_skips_current_model_and_resumes(tmp_path):
+    rows = _rows(4)
+    rows[1]["embedding_model"] = "ollama:new-embed"
+    checkpoint_path = str(tmp_path / "ckpt.json")
+    reembed_backfill.BackfillCheckpoint(
+        target_model="ollama:new-embed", resume_token=document_resume_token({"id": 1}), processed=1,
+    ).save(checkpoint_path)
+    writes = []
+
+    with patch.object(reembed_backfill, "stream_documents", _fake_stream(rows)), \
+         patch.object(reembed_backfill, "embed_texts", lambda texts, cfg: [[0.0] for _ in texts]), \
+         patch.object(reembed_backfill, "update_document_embeddings", lambda updates: writes.append(updates)):
+        checkpoint = reembed_backfill.run_backfill(
+            batch_size=10, concurrency=1, checkpoint_path=checkpoint_path,
+            embeddings_config=CONFIG, target_model="ollama:new-embed",
+        )
+
+    assert [u["id"] for batch in writes for u in batch] == [3, 4]
+    assert checkpoint.processed == 3
+    assert checkpoint.skipped == 1
@@ -27,7 +27,7 @@ async def test_supabase_duplicate_hash_ignored():
     with patch("crawl4ai_source.manager.SUPABASE_AVAILABLE", True), \
          patch("crawl4ai_source.manager.add_document_to_supabase", side_effect=raise_dup) as mock_add, \
          patch("crawl4ai_source.manager.EMBEDDING_AVAILABLE", True), \
-         patch("crawl4ai_source.manager.get_embedding_ollama", MagicMock(return_value=[0.1])):
+         patch("crawl4ai_source.manager.embed_text", MagicMock(return_value=([0.1], None))):
 
         # Should not raise
         await manager._persist_crawl_result(job.id, result)
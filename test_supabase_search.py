@@ -0,0 +1,55 @@
+from unittest.mock import MagicMock, patch
+
+import supabase_client
+
+
+def _rpc_client(data_by_name):
+    """Build a fake Supabase client whose rpc(name).execute().data is looked up by name."""
+    client = MagicMock()
+
+    def rpc(name, params):
+        call = MagicMock()
+        value = data_by_name.get(name)
+        if isinstance(value, Exception):
+            call.execute.side_effect = value
+        else:
+            call.execute.return_value = MagicMock(data=value)
+        return call
+
+    client.rpc.side_effect = rpc
+    return client
+
+
+def test_full_mode_uses_match_documents():
+    client = _rpc_client({"match_documents": [{"id": 1, "similarity": 0.9}]})
+    with patch.object(supabase_client, "supabase", client):
+        docs = supabase_client.search_documents_supabase([0.1, 0.2], top_k=2, storage_mode="full")
+
+    assert docs == [{"id": 1, "similarity": 0.9}]
+    assert [c.args[0] for c in client.rpc.call_args_list] == ["match_documents"]
+
+
+def test_compact_mode_overfetches_and_rescores_server_side():
+    client = _rpc_client({"match_documents_compact": [{"id": 7, "similarity": 0.8}]})
+    with patch.object(supabase_client, "supabase", client), \
+         patch.object(supabase_client, "RESCORE_OVERFETCH", 5):
+        docs = supabase_client.search_documents_supabase([0.1, 0.2], top_k=3, storage_mode="halfvec")
+
+    assert docs == [{"id": 7, "similarity": 0.8}]
+    name, params = client.rpc.call_args.args
+    assert name == "match_documents_compact"
+    assert params["match_count"] == 3
+    assert params["candidate_count"] == 15
+    assert params["storage_mode"] == "halfvec"
+
+
+def test_compact_mode_falls_back_to_full_precision():
+    client = _rpc_client({
+        "match_documents_compact": Exception("function does not exist"),
+        "match_documents": [{"id": 2, "similarity": 0.5}],
+    })
+    with patch.object(supabase_client, "supabase", client):
+        docs = supabase_client.search_documents_supabase([0.1], top_k=1, storage_mode="binary")
+
+    assert docs == [{"id": 2, "similarity": 0.5}]
+    assert [c.args[0] for c in client.rpc.call_args_list] == ["match_documents_compact", "match_documents"]
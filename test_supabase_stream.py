@@ -0,0 +1,80 @@
+from unittest.mock import patch
+
+import pytest
+
+import supabase_client
+
+
+class FakeQuery:
+    """Minimal PostgREST query builder over an in-memory documents table."""
+
+    def __init__(self, table, log):
+        self._rows = table
+        self._log = log
+        self._columns = "*"
+        self._gt = None
+        self._limit = None
+
+    def select(self, columns):
+        self._columns = columns
+        return self
+
+    def gt(self, column, value):
+        self._gt = value
+        return self
+
+    def order(self, column, desc=False):
+        return self
+
+    def limit(self, n):
+        self._limit = n
+        return self
+
+    def execute(self):
+        self._log.append({"columns": self._columns, "gt": self._gt, "limit": self._limit})
+        rows = [r for r in self._rows if self._gt is None or r["id"] > self._gt]
+        rows = sorted(rows, key=lambda r: r["id"])[: self._limit]
+        if self._columns != "*":
+            keep = self._columns.split(",")
+            rows = [{k: r[k] for k in keep} for r in rows]
+        return type("Response", (), {"data": rows})()
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.rows = rows
+        self.log = []
+
+    def table(self, name):
+        return FakeQuery(self.rows, self.log)
+
+
+@pytest.fixture
+def fake_client():
+    rows = [{"id": i, "text": f"doc {i}", "metadata": {}} for i in range(1, 8)]
+    client = FakeClient(rows)
+    with patch.object(supabase_client, "supabase", client):
+        yield client
+
+
+def test_stream_documents_walks_table_in_keyset_pages(fake_client):
+    rows = list(supabase_client.stream_documents(columns=["text"], page_size=3))
+
+    assert [r["id"] for r in rows] == list(range(1, 8))
+    assert set(rows[0]) == {"id", "text"}
+    assert [q["gt"] for q in fake_client.log] == [None, 3, 6]
+    assert all(q["columns"] == "id,text" for q in fake_client.log)
+
+
+def test_stream_documents_resumes_from_token(fake_client):
+    first = list(supabase_client.stream_documents(page_size=2))
+    token = supabase_client.document_resume_token(first[3])
+
+    resumed = list(supabase_client.stream_documents(page_size=2, resume_token=token))
+
+    assert [r["id"] for r in resumed] == [5, 6, 7]
+
+
+def test_stream_documents_rejects_bad_token(fake_client):
+    with pytest.raises(ValueError):
+        list(supabase_client.stream_documents(resume_token="not-a-token"))
@@ -24,12 +24,12 @@ async def test_integrate_with_supabase_calls_add_document():
 
     # Prepare mocks
     embedding = [0.1, 0.2, 0.3]
-    mock_get_embedding = MagicMock(return_value=embedding)
+    mock_get_embedding = MagicMock(return_value=(embedding, "ollama:nomic-embed-text"))
     mock_add_doc = MagicMock(return_value={"id": "vh123"})
 
     with patch("crawl4ai_source.manager.SUPABASE_AVAILABLE", True), \
          patch("crawl4ai_source.manager.EMBEDDING_AVAILABLE", True), \
-         patch("crawl4ai_source.manager.get_embedding_ollama", mock_get_embedding), \
+         patch("crawl4ai_source.manager.embed_text", mock_get_embedding), \
          patch("crawl4ai_source.manager.add_document_to_supabase", mock_add_doc):
 
         # Act
@@ -45,6 +45,8 @@ async def test_integrate_with_supabase_calls_add_document():
         assert metadata["source_url"] == result.url
         assert metadata["crawl_job_id"] == job.id
         assert metadata["content_hash"] == result.content_hash
+        # Rows are tagged with the model that produced the vector so searches never mix vector spaces
+        assert called_kwargs["embedding_model"] == "ollama:nomic-embed-text"
 
 
 @pytest.mark.asyncio
@@ -61,18 +63,23 @@ async def test_integrate_with_supabase_handles_exception():
         extracted_at=datetime.now(timezone.utc),
     )
 
-    mock_get_embedding = MagicMock(return_value=[0.0])
+    mock_get_embedding = MagicMock(return_value=([0.0], None))
 
     def raise_on_add(*args, **kwargs):
         raise RuntimeError("Supabase write failure")
 
     with patch("crawl4ai_source.manager.SUPABASE_AVAILABLE", True), \
          patch("crawl4ai_source.manager.EMBEDDING_AVAILABLE", True), \
-         patch("crawl4ai_source.manager.get_embedding_ollama", mock_get_embedding), \
+         patch("crawl4ai_source.manager.embed_text", mock_get_embedding), \
          patch("crawl4ai_source.manager.add_document_to_supabase", side_effect=raise_on_add) as mock_add:
 
-        # Should not raise despite underlying client error
-        await manager._integrate_with_supabase(job, result)
+        # The pipeline stage absorbs the error and counts it; the job is unaffected
+        await manager._integrate_with_downstream(job, result)
+        await manager._pipeline.join()
 
         mock_get_embedding.assert_called_once()
         assert mock_add.called
+        metrics = manager._pipeline.metrics()
+        assert metrics["vector_store"]["failed"] == 1
+        assert metrics["vector_store"]["processed"] == 0
+        await manager._pipeline.stop()